@@ -2,21 +2,82 @@
 Kaggle API client for S&P 500 data
 """
 
+import json
 import logging
 import os
+import time
+import numpy as np
 import pandas as pd
 import zipfile
+from datetime import datetime
 from pathlib import Path
 
+from api.parse_cache import ParseCache, file_sha256
+from utils.columnar import PYARROW_AVAILABLE
+from utils.schema import apply_compact_dtypes, concat_frames
+from utils.tracing import span, traced
+
+# Last-seen dataset version and file checksums, kept in downloads_dir
+DATASET_STATE_FILE = ".dataset_state.json"
+
+# Seconds a looked-up dataset version is reused within one client
+REMOTE_VERSION_TTL = 60
+
+# Bump whenever _clean_dataframe changes its output, invalidating parse cache entries
+CLEANING_VERSION = "2"
+
+# Working-set multiple of a raw chunk while it is being cleaned (type
+# conversion, sort, groupby and dropna each hold a copy for a while)
+CLEANING_OVERHEAD = 4
+
+# Date layout of the Kaggle files, parsed without per-row format inference
+DATE_FORMAT = "%Y-%m-%d"
+
+# Declared read dtypes of the fast parse path by standard column name. Volume
+# is read as float so missing values survive; compaction narrows it afterwards.
+CSV_READ_DTYPES = {
+    'Open': 'float64',
+    'High': 'float64',
+    'Low': 'float64',
+    'Close': 'float64',
+    'Volume': 'float64',
+    'Ticker': 'str'
+}
+
+# Common column name variations mapped to the standard names
+COLUMN_MAPPING = {
+    'date': 'Date',
+    'Date': 'Date',
+    'open': 'Open',
+    'Open': 'Open',
+    'high': 'High',
+    'High': 'High',
+    'low': 'Low',
+    'Low': 'Low',
+    'close': 'Close',
+    'Close': 'Close',
+    'volume': 'Volume',
+    'Volume': 'Volume',
+    'name': 'Ticker',
+    'Name': 'Ticker',
+    'symbol': 'Ticker',
+    'Symbol': 'Ticker',
+    'ticker': 'Ticker',
+    'Ticker': 'Ticker'
+}
+
 class KaggleApiClient:
     """Client for interacting with Kaggle API to fetch S&P 500 stock data."""
 
-    def __init__(self, config):
+    def __init__(self, config, api=None):
         """
         Initialize the Kaggle API Client with configuration.
 
         Args:
             config (dict): Configuration parameters
+            api (optional): Object implementing the Kaggle API methods used
+                here (datasets_view, dataset_download_files), used instead of
+                an authenticated KaggleApi, e.g. a local stand-in
         """
         self.logger = logging.getLogger(__name__)
 
@@ -29,12 +90,44 @@ class KaggleApiClient:
         self.download_dir = config['paths']['downloads_dir']
         self.data_dir = config['paths']['data_dir']
 
+        # Chunked ingestion settings (a memory budget of 0 reads the file at once)
+        etl_config = config.get('etl', {})
+        self.chunk_rows = int(etl_config.get('chunk_rows', 100000))
+        self.memory_budget_mb = float(etl_config.get('memory_budget_mb', 0))
+
         # Ensure directories exist
         Path(self.download_dir).mkdir(parents=True, exist_ok=True)
         Path(self.data_dir).mkdir(parents=True, exist_ok=True)
 
+        # Typed columnar cache of cleaned datasets under data_dir
+        self.parse_cache = None
+        if etl_config.get('parse_cache', True):
+            self.parse_cache = ParseCache(
+                Path(self.data_dir) / "parse_cache", CLEANING_VERSION,
+                max_bytes=int(etl_config.get('parse_cache_max_mb', 1024)) * 1024 * 1024
+            )
+
+        # Skip the download when the dataset version has not changed
+        self.skip_unchanged = etl_config.get('skip_unchanged_dataset', True)
+        self.state_path = Path(self.download_dir) / DATASET_STATE_FILE
+        self.download_skipped = False
+        self._remote_version_lookup = None
+
+        # Read with the header-detected schema, falling back to the tolerant path
+        self.fast_parse = etl_config.get('fast_parse', True)
+
+        # Frame memory before and after compact dtypes, and parse throughput, for the last load
+        self.memory_report = {'uncompacted_bytes': 0, 'compact_bytes': 0}
+        self.parse_report = {}
+
+        # Time and size of the last download_dataset call
+        self.download_report = {}
+
         # Initialize Kaggle API
-        self._initialize_kaggle_api()
+        if api is not None:
+            self.api = api
+        else:
+            self._initialize_kaggle_api()
 
     def _initialize_kaggle_api(self):
         """Initialize the Kaggle API with credentials."""
@@ -55,27 +148,176 @@ class KaggleApiClient:
             self.logger.error(f"Failed to initialize Kaggle API: {str(e)}")
             raise
 
+    def _load_state(self):
+        """Read the dataset state file, returning an empty state if there is none."""
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state):
+        """Write the dataset state file atomically."""
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _remote_version(self):
+        """
+        Look up the current version of the dataset on Kaggle.
+
+        Returns:
+            str: Version identifier, or None if it could not be determined
+        """
+        if self._remote_version_lookup is not None:
+            looked_up_at, version = self._remote_version_lookup
+            if time.monotonic() - looked_up_at < REMOTE_VERSION_TTL:
+                return version
+
+        try:
+            owner, slug = self.dataset_name.split('/', 1)
+            info = self.api.datasets_view(owner, slug)
+            if not isinstance(info, dict):
+                info = getattr(info, '__dict__', {})
+
+            version = info.get('currentVersionNumber') or info.get('lastUpdated')
+            version = str(version) if version is not None else None
+            if version is None:
+                self.logger.warning(f"No version found for dataset {self.dataset_name} - "
+                                    f"unchanged datasets will not be skipped")
+            self._remote_version_lookup = (time.monotonic(), version)
+            return version
+
+        except Exception as e:
+            self.logger.warning(f"Could not determine dataset version: {str(e)}")
+            return None
+
+    def _local_files(self):
+        """Return the CSV files in the download directory, sorted by name."""
+        return sorted(Path(self.download_dir).glob("*.csv"))
+
+    def _file_checksums(self, previous=None):
+        """
+        Compute checksums of the downloaded CSV files.
+
+        Files whose size and mtime match the previous state keep their stored
+        checksum instead of being re-read.
+
+        Args:
+            previous (dict, optional): 'files' entry of an earlier state
+
+        Returns:
+            dict: file name -> {'size', 'mtime_ns', 'sha256'}
+        """
+        previous = previous or {}
+        checksums = {}
+
+        for path in self._local_files():
+            stat = path.stat()
+            known = previous.get(path.name)
+            if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+                checksums[path.name] = known
+            else:
+                checksums[path.name] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sha256': file_sha256(path)
+                }
+
+        return checksums
+
+    def _local_copy_is_current(self, state, remote_version):
+        """Check that the stored state matches the remote version and the files on disk."""
+        if not remote_version or state.get('dataset') != self.dataset_name:
+            return False
+        if state.get('version') != remote_version or not state.get('files'):
+            return False
+
+        current = self._file_checksums(state['files'])
+        return {name: entry['sha256'] for name, entry in current.items()} == \
+            {name: entry['sha256'] for name, entry in state['files'].items()}
+
+    def is_dataset_loaded(self, target):
+        """
+        Check whether the current dataset version was already loaded successfully into a target.
+
+        Args:
+            target (str): Load target, e.g. "SCHEMA.TABLE"; a load into one
+                target does not count for any other
+
+        Returns:
+            bool: True if neither the Kaggle version nor the local files changed
+                since the last mark_dataset_loaded() for this target
+        """
+        if not self.skip_unchanged:
+            return False
+
+        state = self._load_state()
+        remote_version = self._remote_version()
+
+        if not self._local_copy_is_current(state, remote_version):
+            return False
+
+        return state.get('loaded', {}).get(target, {}).get('version') == remote_version
+
+    def mark_dataset_loaded(self, target):
+        """
+        Record that the current dataset version was loaded successfully into a target.
+
+        Args:
+            target (str): Load target, as passed to is_dataset_loaded()
+        """
+        state = self._load_state()
+        if state.get('version'):
+            state.setdefault('loaded', {})[target] = {
+                'version': state['version'],
+                'loaded_at': datetime.now().isoformat()
+            }
+            self._save_state(state)
+
+    @traced('kaggle.download_dataset', category='kaggle')
     def download_dataset(self):
         """
         Download the S&P 500 dataset from Kaggle.
 
+        The download and unzip are skipped when the Kaggle dataset version and
+        the checksums of the local files match the state stored at the last
+        download.
+
         Returns:
             str: Path to the downloaded dataset
         """
         try:
-            self.logger.info(f"Downloading dataset: {self.dataset_name}")
-
-            # Download the dataset
-            self.api.dataset_download_files(
-                self.dataset_name,
-                path=self.download_dir,
-                unzip=True
-            )
-
-            self.logger.info(f"Successfully downloaded dataset to {self.download_dir}")
+            started = time.perf_counter()
+            state = self._load_state()
+            remote_version = self._remote_version() if self.skip_unchanged else None
+            self.download_skipped = self.skip_unchanged and self._local_copy_is_current(state, remote_version)
+
+            if self.download_skipped:
+                self.logger.info(f"Dataset {self.dataset_name} unchanged (version {remote_version}) - "
+                                 f"skipping download")
+            else:
+                self.logger.info(f"Downloading dataset: {self.dataset_name}")
+
+                # Download the dataset
+                self.api.dataset_download_files(
+                    self.dataset_name,
+                    path=self.download_dir,
+                    unzip=True
+                )
+
+                self.logger.info(f"Successfully downloaded dataset to {self.download_dir}")
+
+                self._save_state({
+                    'dataset': self.dataset_name,
+                    'version': remote_version,
+                    'downloaded_at': datetime.now().isoformat(),
+                    'files': self._file_checksums()
+                })
 
             # Find the downloaded CSV file
-            csv_files = list(Path(self.download_dir).glob("*.csv"))
+            csv_files = self._local_files()
 
             if not csv_files:
                 self.logger.error("No CSV files found in download directory")
@@ -85,16 +327,26 @@ class KaggleApiClient:
             dataset_path = str(csv_files[0])
             self.logger.info(f"Found dataset file: {dataset_path}")
 
+            self.download_report = {
+                'seconds': round(time.perf_counter() - started, 3),
+                'bytes': 0 if self.download_skipped else sum(path.stat().st_size for path in csv_files),
+                'skipped': self.download_skipped
+            }
+
             return dataset_path
 
         except Exception as e:
             self.logger.error(f"Error downloading dataset: {str(e)}")
             raise
 
+    @traced('kaggle.load_and_clean_data', category='kaggle')
     def load_and_clean_data(self, dataset_path=None):
         """
         Load and clean the S&P 500 data.
 
+        Cleaned results are cached in a typed columnar form under data_dir,
+        keyed by the file's content hash and the cleaning code version.
+
         Args:
             dataset_path (str, optional): Path to the dataset file
 
@@ -102,6 +354,8 @@ class KaggleApiClient:
             DataFrame: Cleaned pandas DataFrame with stock data
         """
         try:
+            self._reset_memory_report()
+
             # If no path provided, download the dataset
             if dataset_path is None:
                 dataset_path = self.download_dataset()
@@ -110,10 +364,20 @@ class KaggleApiClient:
                 self.logger.error("No dataset path available")
                 return None
 
+            if self.parse_cache:
+                cached = self.parse_cache.iter_chunks(dataset_path)
+                if cached is not None:
+                    df = self._concat_chunks(list(cached))
+                    self.logger.info(f"Loaded {len(df)} cleaned rows from the parse cache")
+                    return df
+
+            if self.memory_budget_mb:
+                return self._load_chunked(dataset_path)
+
             self.logger.info(f"Loading data from: {dataset_path}")
 
             # Load the CSV file
-            df = pd.read_csv(dataset_path)
+            df = self._read_csv(dataset_path)
 
             self.logger.info(f"Loaded {len(df)} rows with columns: {df.columns.tolist()}")
 
@@ -122,50 +386,219 @@ class KaggleApiClient:
 
             self.logger.info(f"After cleaning: {len(df)} rows")
 
+            self._store_in_cache(dataset_path, df)
+
             return df
 
         except Exception as e:
             self.logger.error(f"Error loading and cleaning data: {str(e)}")
             raise
 
-    def _clean_dataframe(self, df):
+    def _detect_columns(self, dataset_path):
+        """
+        Map the file's header onto the standard column names.
+
+        Args:
+            dataset_path (str): Path to the dataset file
+
+        Returns:
+            dict: raw column -> standard column for the columns the pipeline
+                uses, or None when the header does not have exactly one
+                column for each of them
+        """
+        header = pd.read_csv(dataset_path, nrows=0).columns
+        mapping = {col: COLUMN_MAPPING[col] for col in header if col in COLUMN_MAPPING}
+
+        standard = list(mapping.values())
+        if len(set(standard)) != len(standard):
+            self.logger.warning(f"Ambiguous columns in header {header.tolist()}, using the tolerant parser")
+            return None
+
+        missing = {'Date', 'Open', 'High', 'Low', 'Close', 'Volume'} - set(standard)
+        if missing:
+            return None
+
+        return mapping
+
+    def _read_csv(self, dataset_path):
+        """
+        Read the whole dataset, through the fast path when its header allows.
+
+        The fast path reads only the mapped columns with declared dtypes and
+        the fixed DATE_FORMAT, using the pyarrow engine when it is installed.
+        Any value that does not fit the declared schema sends the whole file
+        through the tolerant path (plain read, coercion in _clean_dataframe).
+
+        Args:
+            dataset_path (str): Path to the dataset file
+
+        Returns:
+            DataFrame: Raw frame for _clean_dataframe
+        """
+        megabytes = os.path.getsize(dataset_path) / (1024 * 1024)
+        start = time.perf_counter()
+
+        mapping = self._detect_columns(dataset_path) if self.fast_parse else None
+        if mapping is not None:
+            engine = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+            try:
+                df = self._read_csv_fast(dataset_path, mapping, engine)
+                self._report_parse('fast', engine, megabytes, time.perf_counter() - start)
+                return df
+            except (ValueError, TypeError) as e:
+                self.logger.warning(f"Fast CSV parse failed ({str(e)}), falling back to the tolerant parser")
+
+        df = pd.read_csv(dataset_path)
+        self._report_parse('tolerant', 'c', megabytes, time.perf_counter() - start)
+        return df
+
+    def _read_csv_fast(self, dataset_path, mapping, engine):
+        """
+        Read the mapped columns with the declared dtypes and date format.
+
+        Args:
+            dataset_path (str): Path to the dataset file
+            mapping (dict): raw column -> standard column from _detect_columns
+            engine (str): pandas CSV parser engine
+
+        Returns:
+            DataFrame: Frame with standard column names and parsed types
+
+        Raises:
+            ValueError: A value does not match the declared schema
+        """
+        dtypes = {raw: CSV_READ_DTYPES[col] for raw, col in mapping.items() if col in CSV_READ_DTYPES}
+        date_column = next(raw for raw, col in mapping.items() if col == 'Date')
+        dtypes[date_column] = 'str'
+
+        df = pd.read_csv(dataset_path, usecols=list(mapping), dtype=dtypes, engine=engine)
+        df = df.rename(columns=mapping)
+        df['Date'] = pd.to_datetime(df['Date'], format=DATE_FORMAT)
+        return df
+
+    def _report_parse(self, path, engine, megabytes, seconds):
+        """Record and log the parse throughput of a read"""
+        self.parse_report = {
+            'path': path,
+            'engine': engine,
+            'megabytes': round(megabytes, 2),
+            'seconds': round(seconds, 3),
+            'mb_per_s': round(megabytes / seconds, 1) if seconds > 0 else None
+        }
+        self.logger.info(f"Parsed {megabytes:.1f} MB in {seconds:.2f}s "
+                         f"({self.parse_report['mb_per_s']} MB/s, {path} path, {engine} engine)")
+
+    def _load_chunked(self, dataset_path):
+        """
+        Load and clean the dataset chunk by chunk within the memory budget.
+
+        The budget only bounds parsing here: one raw chunk is held and cleaned
+        at a time, but the cleaned chunks are then combined into one frame, so
+        the peak is the whole cleaned dataset plus the combined copy. Runs
+        that must stay within the budget stream the chunks instead (see
+        iter_stock_data and ETLPipeline.run_streaming), which ETLPipeline.run
+        does for merge loads.
+
+        Args:
+            dataset_path (str): Path to the dataset file
+
+        Returns:
+            DataFrame: Cleaned pandas DataFrame with stock data
+        """
+        df = self._concat_chunks(list(self.iter_stock_data(dataset_path=dataset_path)))
+        self.logger.info(f"After cleaning: {len(df)} rows")
+        return df
+
+    def _concat_chunks(self, chunks):
+        """
+        Combine cleaned chunks into one frame in (Ticker, Date) order.
+
+        Args:
+            chunks (list): Cleaned DataFrame chunks, consumed by this call
+
+        Returns:
+            DataFrame: Combined frame
+        """
+        if not chunks:
+            self.logger.warning("No rows left after cleaning")
+            return pd.DataFrame()
+
+        df = concat_frames(chunks)
+        chunks.clear()
+
+        # Chunks are sorted individually, restore the global order if the file was not
+        if not pd.MultiIndex.from_frame(df[['Ticker', 'Date']]).is_monotonic_increasing:
+            df = df.sort_values(by=['Ticker', 'Date'], ignore_index=True)
+
+        return df
+
+    def _reset_memory_report(self):
+        """Start new load reports; cached loads are already compact and parse nothing."""
+        self.memory_report = {'uncompacted_bytes': 0, 'compact_bytes': 0}
+        self.parse_report = {}
+
+    def _store_in_cache(self, dataset_path, df):
+        """
+        Store a cleaned frame in the parse cache in parts of chunk_rows rows.
+
+        Args:
+            dataset_path (str): Path to the raw dataset file
+            df (DataFrame): Cleaned frame
+        """
+        if not self.parse_cache or df.empty:
+            return
+
+        try:
+            writer = self.parse_cache.writer(dataset_path)
+            try:
+                for start in range(0, len(df), self.chunk_rows):
+                    writer.append(df.iloc[start:start + self.chunk_rows])
+                writer.commit()
+            except Exception:
+                writer.abort()
+                raise
+        except Exception as e:
+            self.logger.warning(f"Could not store parse cache entry: {str(e)}")
+
+    def _chunk_rows_for_budget(self, dataset_path):
+        """
+        Derive the number of CSV rows per chunk from the memory budget.
+
+        Args:
+            dataset_path (str): Path to the dataset file
+
+        Returns:
+            int: Rows per chunk
+        """
+        if not self.memory_budget_mb:
+            return self.chunk_rows
+
+        sample = pd.read_csv(dataset_path, nrows=1000)
+        bytes_per_row = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+        budget_bytes = self.memory_budget_mb * 1024 * 1024
+        chunk_rows = max(1000, int(budget_bytes / (bytes_per_row * CLEANING_OVERHEAD)))
+
+        self.logger.info(f"Memory budget {self.memory_budget_mb:.0f} MB at ~{bytes_per_row:.0f} bytes/row "
+                         f"-> {chunk_rows} rows per chunk")
+        return chunk_rows
+
+    def _clean_dataframe(self, df, last_close=None):
         """
         Clean and transform the DataFrame.
 
         Args:
             df (DataFrame): Raw DataFrame
+            last_close (dict, optional): Carry-over state for chunked reads,
+                ticker -> (date, close) of the last row seen in earlier chunks.
+                Used as the previous close for each ticker's first row and
+                updated in place with this chunk's last rows.
 
         Returns:
             DataFrame: Cleaned DataFrame
         """
         try:
             # Standardize column names (handle different dataset formats)
-            # Common column name variations
-            column_mapping = {
-                'date': 'Date',
-                'Date': 'Date',
-                'open': 'Open',
-                'Open': 'Open',
-                'high': 'High',
-                'High': 'High',
-                'low': 'Low',
-                'Low': 'Low',
-                'close': 'Close',
-                'Close': 'Close',
-                'volume': 'Volume',
-                'Volume': 'Volume',
-                'name': 'Ticker',
-                'Name': 'Ticker',
-                'symbol': 'Ticker',
-                'Symbol': 'Ticker',
-                'ticker': 'Ticker',
-                'Ticker': 'Ticker'
-            }
-
-            # Rename columns based on mapping
-            for old_col, new_col in column_mapping.items():
-                if old_col in df.columns:
-                    df.rename(columns={old_col: new_col}, inplace=True)
+            df = df.rename(columns={col: COLUMN_MAPPING[col] for col in df.columns if col in COLUMN_MAPPING})
 
             # Ensure required columns exist
             required_columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
@@ -206,7 +639,10 @@ class KaggleApiClient:
             # Calculate additional metrics
             if all(col in df.columns for col in ['High', 'Low', 'Close']):
                 df['Daily_Range'] = df['High'] - df['Low']
-                df['Daily_Return'] = df.groupby('Ticker')['Close'].pct_change()
+                if last_close is None:
+                    df['Daily_Return'] = df.groupby('Ticker', observed=True)['Close'].pct_change()
+                else:
+                    df['Daily_Return'] = self._carried_returns(df, last_close)
 
                 # Remove rows with NaN in Daily_Return (first row per ticker)
                 df = df.dropna(subset=['Daily_Return'])
@@ -214,6 +650,11 @@ class KaggleApiClient:
             # Reset index
             df = df.reset_index(drop=True)
 
+            # Categorical ticker and narrow integer volume from here to the DB boundary
+            df, before_bytes, after_bytes = apply_compact_dtypes(df)
+            self.memory_report['uncompacted_bytes'] += before_bytes
+            self.memory_report['compact_bytes'] += after_bytes
+
             self.logger.info("Data cleaning completed successfully")
 
             return df
@@ -222,6 +663,41 @@ class KaggleApiClient:
             self.logger.error(f"Error cleaning DataFrame: {str(e)}")
             raise
 
+    def _carried_returns(self, df, last_close):
+        """
+        Compute Daily_Return for a sorted chunk using closes carried from earlier chunks.
+
+        Args:
+            df (DataFrame): Chunk sorted by Ticker and Date
+            last_close (dict): ticker -> (date, close), updated in place
+
+        Returns:
+            Series: Daily returns aligned with df
+        """
+        previous = df.groupby('Ticker', observed=True)['Close'].shift(1)
+        first_rows = ~df['Ticker'].duplicated(keep='first')
+
+        if last_close:
+            first_tickers = df.loc[first_rows, 'Ticker'].astype(str).to_numpy()
+            carried = pd.DataFrame.from_dict(last_close, orient='index', columns=['Date', 'Close'])
+            carried = carried.reindex(first_tickers)
+            carried_close = pd.Series(carried['Close'].to_numpy(dtype=np.float64), index=previous.index[first_rows])
+            carried_date = pd.Series(pd.to_datetime(carried['Date']).to_numpy(), index=carried_close.index)
+
+            out_of_order = carried_date.notna() & (df.loc[first_rows, 'Date'] <= carried_date)
+            if out_of_order.any():
+                self.logger.warning(f"{int(out_of_order.sum())} tickers continue with earlier dates than the "
+                                    f"previous chunk - Daily_Return assumes date order within each ticker")
+
+            previous.loc[first_rows] = carried_close
+
+        returns = df['Close'] / previous - 1
+
+        last_rows = df.loc[~df['Ticker'].duplicated(keep='last'), ['Ticker', 'Date', 'Close']]
+        last_close.update(zip(last_rows['Ticker'].astype(str), zip(last_rows['Date'], last_rows['Close'])))
+
+        return returns
+
     def fetch_stock_data(self):
         """
         Main method to fetch and process S&P 500 stock data.
@@ -250,6 +726,85 @@ class KaggleApiClient:
             self.logger.error(f"Error fetching stock data: {str(e)}")
             raise
 
+    def iter_stock_data(self, chunk_rows=None, dataset_path=None):
+        """
+        Fetch and clean the stock data as a stream of memory-bounded chunks.
+
+        Each CSV chunk is cleaned on its own. The last close of every ticker
+        is carried to the next chunk, so Daily_Return is correct across chunk
+        boundaries as long as each ticker's rows are in date order in the file.
+        A complete read is stored in the parse cache, and later reads of an
+        unchanged file are served from the cached parts.
+
+        Args:
+            chunk_rows (int, optional): CSV rows per chunk (default: derived
+                from the memory budget, or etl.chunk_rows without one)
+            dataset_path (str, optional): Path to the dataset file
+
+        Yields:
+            DataFrame: Cleaned chunk of stock data
+        """
+        self._reset_memory_report()
+
+        if dataset_path is None:
+            dataset_path = self.download_dataset()
+
+        if dataset_path is None:
+            self.logger.error("No dataset path available")
+            return
+
+        if self.parse_cache:
+            cached = self.parse_cache.iter_chunks(dataset_path)
+            if cached is not None:
+                yield from cached
+                return
+
+        chunk_rows = chunk_rows or self._chunk_rows_for_budget(dataset_path)
+        self.logger.info(f"Streaming data from: {dataset_path} in chunks of {chunk_rows} rows")
+
+        writer = None
+        if self.parse_cache:
+            try:
+                writer = self.parse_cache.writer(dataset_path)
+            except Exception as e:
+                self.logger.warning(f"Parse cache disabled for this read: {str(e)}")
+
+        # Chunks only get the column projection: a declared dtype failing
+        # mid-file could not fall back once earlier chunks were yielded
+        mapping = self._detect_columns(dataset_path) if self.fast_parse else None
+        usecols = list(mapping) if mapping is not None else None
+        megabytes = os.path.getsize(dataset_path) / (1024 * 1024)
+        parse_seconds = 0.0
+
+        try:
+            last_close = {}
+            reader = pd.read_csv(dataset_path, chunksize=chunk_rows, usecols=usecols)
+            while True:
+                with span('kaggle.read_chunk', category='kaggle'):
+                    start = time.perf_counter()
+                    raw = next(reader, None)
+                    parse_seconds += time.perf_counter() - start
+                    chunk = None if raw is None else self._clean_dataframe(raw, last_close=last_close)
+                if chunk is None:
+                    break
+
+                if chunk.empty:
+                    continue
+                if writer is not None:
+                    writer.append(chunk)
+                yield chunk
+
+            self._report_parse('chunked', 'c', megabytes, parse_seconds)
+
+            if writer is not None:
+                writer.commit()
+                writer = None
+
+        finally:
+            # Reader stopped early or failed - drop the partial entry
+            if writer is not None:
+                writer.abort()
+
     def get_latest_data_by_ticker(self, df, top_n=100):
         """
         Get the most recent data for each ticker.
@@ -267,7 +822,7 @@ class KaggleApiClient:
                 return df
 
             # Get the most recent date for each ticker
-            latest_data = df.sort_values('Date').groupby('Ticker').tail(top_n)
+            latest_data = df.sort_values('Date').groupby('Ticker', observed=True).tail(top_n)
 
             self.logger.info(f"Filtered to {len(latest_data)} most recent records")
 
@@ -0,0 +1,186 @@
+"""
+Local columnar cache of parsed and cleaned Kaggle datasets
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+from utils.columnar import frame_size_bytes, read_frame, write_frame
+
+
+def file_sha256(path):
+    """
+    Compute the SHA-256 of a file without loading it into memory.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Cache of cleaned DataFrames keyed by source file content and cleaning version.
+
+    Each entry is a directory of typed columnar parts (Parquet, or .npy per
+    column without pyarrow) so it can be read whole or chunk by chunk. Entries
+    are written to a temporary directory and renamed when complete, touched on
+    every hit and evicted least recently used first once the cache exceeds
+    max_bytes. Content hashes are memoized by file size and mtime.
+    """
+
+    def __init__(self, cache_dir, version, max_bytes=1024 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache entries
+            version (str): Version of the cleaning code, part of every key
+            max_bytes (int): Size cap for all entries together
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir)
+        self.version = str(version)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._hash_index_path = self.cache_dir / "hash_index.json"
+
+    def _file_hash(self, source_path):
+        """Return the SHA-256 of a file, reusing the last hash if size and mtime are unchanged."""
+        stat = os.stat(source_path)
+        fingerprint = [stat.st_size, stat.st_mtime_ns]
+        source_key = str(Path(source_path).resolve())
+
+        try:
+            with open(self._hash_index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+        cached = index.get(source_key)
+        if cached and cached['fingerprint'] == fingerprint:
+            return cached['sha256']
+
+        sha256 = file_sha256(source_path)
+        index[source_key] = {'fingerprint': fingerprint, 'sha256': sha256}
+        tmp_path = self._hash_index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._hash_index_path)
+
+        return sha256
+
+    def key_for(self, source_path):
+        """
+        Build the cache key of a source file.
+
+        Args:
+            source_path (str): Path to the raw dataset file
+
+        Returns:
+            str: Key combining the content hash and cleaning version
+        """
+        return f"{self._file_hash(source_path)[:32]}-v{self.version}"
+
+    def _parts(self, key):
+        """Return the part files of a complete entry, or None if there is none."""
+        entry = self.cache_dir / key
+        if not (entry / "_COMPLETE").exists():
+            return None
+        return sorted(path for path in entry.iterdir() if path.name.startswith("part-"))
+
+    def iter_chunks(self, source_path):
+        """
+        Read a cached dataset part by part.
+
+        Args:
+            source_path (str): Path to the raw dataset file
+
+        Returns:
+            generator or None: Cleaned DataFrame parts, or None on a cache miss
+        """
+        key = self.key_for(source_path)
+        parts = self._parts(key)
+        if parts is None:
+            self.logger.info(f"Parse cache miss for {source_path}")
+            return None
+
+        os.utime(self.cache_dir / key)
+        self.logger.info(f"Parse cache hit for {source_path} ({len(parts)} parts)")
+        return (read_frame(part) for part in parts)
+
+    def writer(self, source_path):
+        """
+        Start writing a cache entry for a source file.
+
+        Args:
+            source_path (str): Path to the raw dataset file
+
+        Returns:
+            ParseCacheWriter: Accepts cleaned parts and commits the entry
+        """
+        return ParseCacheWriter(self, self.key_for(source_path))
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir():
+                continue
+            if ".tmp-" in entry.name:
+                # Leftover of an interrupted write
+                if time.time() - entry.stat().st_mtime > 3600:
+                    shutil.rmtree(entry, ignore_errors=True)
+                continue
+            size = sum(frame_size_bytes(part) for part in entry.iterdir())
+            entries.append((entry.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            self.logger.info(f"Evicted parse cache entry {entry.name} ({size / 1024 / 1024:.1f} MB)")
+
+
+class ParseCacheWriter:
+    """Writes the parts of one cache entry and publishes it atomically."""
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.tmp_dir = cache.cache_dir / f"{key}.tmp-{os.getpid()}-{time.monotonic_ns()}"
+        self.tmp_dir.mkdir(parents=True)
+        self.parts = 0
+
+    def append(self, df):
+        """Write one cleaned part."""
+        write_frame(self.tmp_dir / f"part-{self.parts:05d}", df)
+        self.parts += 1
+
+    def commit(self):
+        """Publish the entry and apply the size cap."""
+        (self.tmp_dir / "_COMPLETE").touch()
+        target = self.cache.cache_dir / self.key
+        if target.exists():
+            shutil.rmtree(target, ignore_errors=True)
+        os.replace(self.tmp_dir, target)
+        self.cache.logger.info(f"Stored parse cache entry {self.key} ({self.parts} parts)")
+        self.cache.evict()
+
+    def abort(self):
+        """Discard a partially written entry."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for the Kaggle to HANA load path
+"""
@@ -0,0 +1,168 @@
+"""
+Benchmark ETLPipeline.insert_data_batch against the previous per-row MERGE path.
+
+Usage:
+    python -m benchmarks.bench_insert_batch --rows 20000 --latency-ms 0.2 --workers 4
+
+Prints one JSON object per implementation with rows/second and round-trips.
+"""
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fake_hdbcli import FakeDatabase
+from db.hana_client import HanaConnectionPool
+from etl.pipeline import ETLPipeline
+
+
+def make_frame(rows, tickers=500, seed=42):
+    """Build a small synthetic cleaned stock frame."""
+    rng = np.random.default_rng(seed)
+    days = -(-rows // tickers)
+    dates = pd.bdate_range("2013-02-08", periods=days)
+    frame = pd.DataFrame({
+        'Ticker': np.repeat([f"T{i:03d}" for i in range(tickers)], days),
+        'Date': np.tile(dates, tickers),
+    }).iloc[:rows]
+    close = rng.uniform(10, 500, rows)
+    frame['Open'] = close * rng.uniform(0.98, 1.02, rows)
+    frame['High'] = np.maximum(frame['Open'], close) * 1.01
+    frame['Low'] = np.minimum(frame['Open'], close) * 0.99
+    frame['Close'] = close
+    frame['Volume'] = rng.integers(1_000, 10_000_000, rows).astype(np.float64)
+    frame['Daily_Range'] = frame['High'] - frame['Low']
+    frame['Daily_Return'] = rng.normal(0, 0.02, rows)
+    return frame.reset_index(drop=True)
+
+
+def legacy_insert_data_batch(pipeline, df_batch, schema_name, table_name):
+    """The per-row iterrows + MERGE FROM DUMMY implementation, kept for comparison."""
+    cursor = pipeline.hana_client.connection.cursor()
+    inserted = 0
+    failed = 0
+    timestamp = datetime.now()
+
+    for index, row in df_batch.iterrows():
+        try:
+            ticker = str(row.get('Ticker', ''))
+            date = row.get('Date')
+            open_price = float(row.get('Open', 0)) if pd.notna(row.get('Open')) else None
+            high_price = float(row.get('High', 0)) if pd.notna(row.get('High')) else None
+            low_price = float(row.get('Low', 0)) if pd.notna(row.get('Low')) else None
+            close_price = float(row.get('Close', 0)) if pd.notna(row.get('Close')) else None
+            volume = int(row.get('Volume', 0)) if pd.notna(row.get('Volume')) else None
+            daily_range = float(row.get('Daily_Range', 0)) if pd.notna(row.get('Daily_Range')) else None
+            daily_return = float(row.get('Daily_Return', 0)) if pd.notna(row.get('Daily_Return')) else None
+
+            if hasattr(date, 'date'):
+                date = date.date()
+
+            merge_sql = f"""
+            MERGE INTO "{schema_name}"."{table_name}" AS target
+            USING (SELECT ? AS TICKER, ? AS DATE FROM DUMMY) AS source
+            ON target."TICKER" = source.TICKER AND target."DATE" = source.DATE
+            WHEN MATCHED THEN
+                UPDATE SET
+                    "OPEN" = ?, "HIGH" = ?, "LOW" = ?, "CLOSE" = ?,
+                    "VOLUME" = ?, "DAILY_RANGE" = ?, "DAILY_RETURN" = ?,
+                    "TIMESTAMP" = ?
+            WHEN NOT MATCHED THEN
+                INSERT ("TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
+                        "VOLUME", "DAILY_RANGE", "DAILY_RETURN", "TIMESTAMP")
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+            cursor.execute(merge_sql, (
+                ticker, date,
+                open_price, high_price, low_price, close_price,
+                volume, daily_range, daily_return, timestamp,
+                ticker, date, open_price, high_price, low_price, close_price,
+                volume, daily_range, daily_return, timestamp
+            ))
+            if cursor.rowcount > 0:
+                inserted += 1
+        except Exception:
+            failed += 1
+
+    pipeline.hana_client.connection.commit()
+    cursor.close()
+    return (inserted, 0, failed)
+
+
+def load_sequential(insert):
+    """Wrap a per-batch insert callable into a sequential loader."""
+    def load(pipeline, df, schema_name, table_name):
+        totals = [0, 0, 0]
+        for start in range(0, len(df), pipeline.batch_size):
+            counts = insert(pipeline, df.iloc[start:start + pipeline.batch_size], schema_name, table_name)
+            totals = [total + count for total, count in zip(totals, counts)]
+        return totals
+    return load
+
+
+def load_parallel(pipeline, df, schema_name, table_name):
+    """Load with the concurrent pooled writers."""
+    results = pipeline.process_data_in_batches_parallel(df, schema_name, table_name, pipeline.workers)
+    return [results['inserted'], results['updated'], results['failed']]
+
+
+def run_benchmark(name, load, df, batch_size, latency_ms, workers=1):
+    """Load df with the given loader against a fresh fake database and return a result dict."""
+    database = FakeDatabase(latency_ms=latency_ms)
+    hana_client = SimpleNamespace(
+        connection=database.connect(),
+        pool=HanaConnectionPool(database.connect, max_size=workers)
+    )
+    pipeline = ETLPipeline(None, hana_client, {'etl': {'batch_size': batch_size, 'workers': workers}})
+
+    started = time.perf_counter()
+    totals = load(pipeline, df, "BENCH", "STOCK_PRICES")
+    elapsed = time.perf_counter() - started
+    hana_client.pool.close()
+
+    return {
+        'benchmark': 'insert_data_batch',
+        'implementation': name,
+        'rows': len(df),
+        'batch_size': batch_size,
+        'workers': workers,
+        'latency_ms': latency_ms,
+        'seconds': round(elapsed, 4),
+        'rows_per_second': round(len(df) / elapsed, 1) if elapsed else None,
+        'round_trips': database.round_trips,
+        'inserted': totals[0],
+        'updated': totals[1],
+        'failed': totals[2],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='simulated network latency per round-trip')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='concurrent writers for the pooled implementation')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    df = make_frame(args.rows)
+
+    implementations = [
+        ('legacy_rowwise', load_sequential(legacy_insert_data_batch), 1),
+        ('bulk_executemany', load_sequential(ETLPipeline.insert_data_batch), 1),
+        ('bulk_pooled_writers', load_parallel, args.workers),
+    ]
+    for name, load, workers in implementations:
+        print(json.dumps(run_benchmark(name, load, df, args.batch_size, args.latency_ms, workers)))
+
+
+if __name__ == '__main__':
+    main()
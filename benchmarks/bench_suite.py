@@ -0,0 +1,293 @@
+"""
+Benchmark the load path end to end on synthetic data at several sizes.
+
+Usage:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --sizes 100k,1M --latency-ms 0.2 --output bench_results.json
+
+Covers KaggleApiClient._clean_dataframe, DataQualityValidator,
+ETLPipeline.filter_incremental_data, ETLPipeline.insert_data_batch and
+HanaClient.insert_data, the writes against the fake hdbcli driver, and
+insert_data_batch into the local SQLite and Parquet sinks. Every
+benchmark runs in its own process on data from benchmarks.generator, so a
+size that exhausts memory fails alone and peak RSS belongs to one benchmark.
+Prints one JSON object per benchmark and size with rows/second, MB/second
+and memory; --output also writes them to one JSON document.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from api.kaggle_api import KaggleApiClient
+from benchmarks.bench_insert_batch import load_sequential
+from benchmarks.fake_hdbcli import FakeDatabase, installed
+from benchmarks.fake_kaggle import LocalKaggleApi
+from benchmarks.generator import generate_ohlcv
+from db.hana_client import HanaClient
+from db.sinks import ParquetSink, SQLiteSink
+from etl.pipeline import DataQualityValidator, ETLPipeline
+from etl.telemetry import frame_bytes, peak_rss_bytes
+
+DEFAULT_SIZES = "100k,1M,10M"
+
+# Share of each ticker's history already loaded in the incremental filter benchmark
+WATERMARK_QUANTILE = 0.8
+
+SCHEMA_NAME = "BENCH"
+TABLE_NAME = "STOCK_PRICES"
+
+
+def parse_size(text):
+    """Row count from 100000, 100k, 1M or 1.5m."""
+    text = text.strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def _kaggle_client(workdir):
+    """Offline KaggleApiClient whose parse cache and dataset state stay out of the way."""
+    config = {
+        'kaggle': {'username': '', 'key': '', 'dataset_name': 'bench/sp500'},
+        'paths': {'downloads_dir': str(workdir / 'downloads'), 'data_dir': str(workdir / 'data')},
+        'etl': {'parse_cache': False, 'skip_unchanged_dataset': False},
+    }
+    return KaggleApiClient(config, api=LocalKaggleApi(workdir))
+
+
+def _pipeline(hana_client, options):
+    return ETLPipeline(None, hana_client, {'etl': {'batch_size': options.batch_size, 'quarantine': False}})
+
+
+def _validated(raw, workdir):
+    """Raw frame through cleaning and validation, the input of the later stages."""
+    cleaned = _kaggle_client(workdir)._clean_dataframe(raw)
+    validated, _ = DataQualityValidator(logging.getLogger('benchmark')).validate_and_clean(cleaned)
+    return validated
+
+
+# Each setup prepares the input outside the timed section and returns
+# (input frame, callable returning the output row count, details for the result)
+
+def setup_clean_dataframe(raw, workdir, options):
+    client = _kaggle_client(workdir)
+    return raw, lambda: len(client._clean_dataframe(raw)), {}
+
+
+def setup_validator(raw, workdir, options):
+    cleaned = _kaggle_client(workdir)._clean_dataframe(raw)
+    validator = DataQualityValidator(logging.getLogger('benchmark'))
+    return cleaned, lambda: len(validator.validate_and_clean(cleaned)[0]), {}
+
+
+def setup_filter_incremental(raw, workdir, options):
+    df = _validated(raw, workdir)
+    watermarks = df.groupby('Ticker', observed=True)['Date'].quantile(WATERMARK_QUANTILE).to_dict()
+    pipeline = _pipeline(SimpleNamespace(connection=None), options)
+    return df, lambda: len(pipeline.filter_incremental_data(df, watermarks)), {'tickers': len(watermarks)}
+
+
+def setup_insert_data_batch(raw, workdir, options):
+    df = _validated(raw, workdir)
+    database = FakeDatabase(latency_ms=options.latency_ms, keep_values=False)
+    pipeline = _pipeline(SimpleNamespace(connection=database.connect()), options)
+    load = load_sequential(ETLPipeline.insert_data_batch)
+
+    def run():
+        inserted, updated, failed = load(pipeline, df, SCHEMA_NAME, TABLE_NAME)
+        return inserted + updated
+
+    return df, run, {'database': database}
+
+
+def setup_hana_insert_data(raw, workdir, options):
+    df = _validated(raw, workdir)
+    database = FakeDatabase(latency_ms=options.latency_ms, keep_values=False)
+    config = {'hana': {'address': 'localhost', 'port': 443, 'user': 'bench', 'password': '',
+                       'schema': SCHEMA_NAME}}
+    with installed(database):
+        client = HanaClient(config)
+        client.connect()
+
+    def run():
+        # One call per batch, the way the pipeline hands frames to the client
+        return sum(
+            client.insert_data(df.iloc[start:start + options.batch_size], SCHEMA_NAME, TABLE_NAME)
+            for start in range(0, len(df), options.batch_size)
+        )
+
+    return df, run, {'database': database}
+
+
+def _setup_sink_insert(sink_class):
+    def setup(raw, workdir, options):
+        df = _validated(raw, workdir)
+        sink = sink_class(workdir / 'sink')
+        sink.connect()
+        sink.create_schema_if_not_exists(SCHEMA_NAME)
+        sink.create_table(SCHEMA_NAME, TABLE_NAME)
+        pipeline = _pipeline(sink, options)
+        load = load_sequential(ETLPipeline.insert_data_batch)
+
+        def run():
+            inserted, updated, failed = load(pipeline, df, SCHEMA_NAME, TABLE_NAME)
+            return inserted + updated
+
+        return df, run, {'sink': sink}
+
+    return setup
+
+
+BENCHMARKS = {
+    'clean_dataframe': setup_clean_dataframe,
+    'data_quality_validator': setup_validator,
+    'filter_incremental_data': setup_filter_incremental,
+    'insert_data_batch': setup_insert_data_batch,
+    'hana_insert_data': setup_hana_insert_data,
+    'sqlite_insert_data_batch': _setup_sink_insert(SQLiteSink),
+    'parquet_insert_data_batch': _setup_sink_insert(ParquetSink),
+}
+
+WRITE_BENCHMARKS = ('insert_data_batch', 'hana_insert_data')
+SINK_BENCHMARKS = ('sqlite_insert_data_batch', 'parquet_insert_data_batch')
+
+
+def run_case(name, rows, options):
+    """Set up and time one benchmark at one size in this process and return its result dict."""
+    raw = generate_ohlcv(options.tickers, rows=rows, seed=options.seed, duplicate_fraction=options.dirty_fraction,
+                         missing_fraction=options.dirty_fraction, inverted_fraction=options.dirty_fraction)
+
+    with tempfile.TemporaryDirectory(prefix='bench-') as workdir:
+        df, run, details = BENCHMARKS[name](raw, Path(workdir), options)
+        del raw
+        input_bytes = frame_bytes(df)
+        rss_before = peak_rss_bytes()
+
+        if options.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        rows_out = run()
+        elapsed = time.perf_counter() - started
+        traced_peak = tracemalloc.get_traced_memory()[1] if options.trace_memory else None
+        if options.trace_memory:
+            tracemalloc.stop()
+        if 'sink' in details:
+            details['sink'].close()
+
+    result = {
+        'benchmark': name,
+        'rows': rows,
+        'rows_in': len(df),
+        'rows_out': int(rows_out),
+        'seconds': round(elapsed, 4),
+        'rows_per_second': round(len(df) / elapsed, 1) if elapsed else None,
+        'input_bytes': input_bytes,
+        'mb_per_second': round(input_bytes / 1024 / 1024 / elapsed, 2) if elapsed else None,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'peak_rss_before_bytes': rss_before,
+        'peak_traced_bytes': traced_peak,
+    }
+    if name in WRITE_BENCHMARKS:
+        result.update(batch_size=options.batch_size, latency_ms=options.latency_ms,
+                      round_trips=details['database'].round_trips)
+    elif name in SINK_BENCHMARKS:
+        result.update(batch_size=options.batch_size, sink=details['sink'].name)
+    elif 'tickers' in details:
+        result['tickers'] = details['tickers']
+    return result
+
+
+def run_isolated(name, rows, options):
+    """Run one benchmark at one size in a child process; failures become error results."""
+    command = [
+        sys.executable, '-m', 'benchmarks.bench_suite', '--case', name, '--sizes', str(rows),
+        '--tickers', str(options.tickers), '--seed', str(options.seed),
+        '--dirty-fraction', str(options.dirty_fraction), '--batch-size', str(options.batch_size),
+        '--latency-ms', str(options.latency_ms),
+    ]
+    if options.trace_memory:
+        command.append('--trace-memory')
+
+    try:
+        child = subprocess.run(command, capture_output=True, text=True, timeout=options.timeout,
+                               cwd=Path(__file__).resolve().parent.parent)
+    except subprocess.TimeoutExpired:
+        return {'benchmark': name, 'rows': rows, 'error': f"timed out after {options.timeout}s"}
+
+    if child.returncode != 0:
+        lines = child.stderr.strip().splitlines()
+        return {'benchmark': name, 'rows': rows, 'returncode': child.returncode,
+                'error': lines[-1] if lines else "no output (killed, possibly out of memory)"}
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def environment():
+    """Interpreter, library and machine details recorded with the results."""
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"comma-separated row counts, k and M suffixes allowed (default: {DEFAULT_SIZES})")
+    parser.add_argument('--benchmarks', default=','.join(BENCHMARKS),
+                        help="comma-separated subset of: " + ", ".join(BENCHMARKS))
+    parser.add_argument('--tickers', type=int, default=505)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--dirty-fraction', type=float, default=0.001)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='simulated network latency per round-trip of the fake driver')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='also report the peak traced by tracemalloc, which slows the timed section down')
+    parser.add_argument('--timeout', type=float, help='seconds allowed per benchmark and size')
+    parser.add_argument('--output', help='also write environment, options and results to this JSON file')
+    parser.add_argument('--case', choices=list(BENCHMARKS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+
+    if args.case:
+        print(json.dumps(run_case(args.case, sizes[0], args)))
+        return
+
+    names = [name.strip() for name in args.benchmarks.split(',') if name.strip()]
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = []
+    for rows in sizes:
+        for name in names:
+            result = run_isolated(name, rows, args)
+            print(json.dumps(result), flush=True)
+            results.append(result)
+
+    if args.output:
+        options = {key: value for key, value in vars(args).items() if key not in ('case', 'output')}
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'options': {**options, 'sizes': sizes},
+                       'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark DataQualityValidator.validate_and_clean against the previous two-method path.
+
+Usage:
+    python -m benchmarks.bench_validator --rows 600000
+
+Prints one JSON object per implementation with seconds and peak traced memory.
+"""
+
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_insert_batch import make_frame
+from etl.pipeline import DataQualityValidator
+
+
+def make_dirty_frame(rows, dirty_fraction=0.01, seed=7):
+    """Build a synthetic frame with duplicates, missing dates, NaN prices and High < Low rows."""
+    rng = np.random.default_rng(seed)
+    df = make_frame(rows)
+    dirty = max(1, int(rows * dirty_fraction))
+
+    df.loc[rng.choice(rows, dirty, replace=False), 'Open'] = np.nan
+    df.loc[rng.choice(rows, dirty, replace=False), 'Date'] = pd.NaT
+    swap = rng.choice(rows, dirty, replace=False)
+    df.loc[swap, ['High', 'Low']] = df.loc[swap, ['Low', 'High']].to_numpy()
+
+    duplicates = df.iloc[rng.choice(rows, dirty, replace=False)]
+    return pd.concat([df, duplicates], ignore_index=True)
+
+
+def legacy_validate_dataframe(df):
+    """The previous multi-scan validate_dataframe, kept for comparison."""
+    issues = {'duplicates': [], 'missing_values': {}, 'invalid_dates': [], 'invalid_numbers': [], 'outliers': []}
+
+    duplicates = df[df.duplicated(subset=['Ticker', 'Date'], keep=False)]
+    if len(duplicates) > 0:
+        issues['duplicates'] = duplicates[['Ticker', 'Date']].to_dict('records')
+
+    for col in df.columns:
+        missing_count = df[col].isna().sum()
+        if missing_count > 0:
+            issues['missing_values'][col] = int(missing_count)
+
+    invalid_dates = df[df['Date'].isna()]
+    if len(invalid_dates) > 0:
+        issues['invalid_dates'] = len(invalid_dates)
+
+    for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
+        invalid = df[df[col] < 0]
+        if len(invalid) > 0:
+            issues['invalid_numbers'].append({'column': col, 'count': len(invalid), 'reason': 'negative_values'})
+
+    outliers = df[df['High'] < df['Low']]
+    if len(outliers) > 0:
+        issues['outliers'] = len(outliers)
+
+    return issues
+
+
+def legacy_clean_dataframe(df):
+    """The previous multi-copy clean_dataframe, kept for comparison."""
+    df = df.drop_duplicates(subset=['Ticker', 'Date'], keep='last')
+    df = df[df['Date'].notna()]
+    for col in ['Open', 'High', 'Low', 'Close']:
+        df = df[df[col] > 0]
+    return df[df['High'] >= df['Low']]
+
+
+def legacy_path(df):
+    legacy_validate_dataframe(df)
+    return legacy_clean_dataframe(df)
+
+
+def fused_path(df):
+    logger = logging.getLogger('benchmark')
+    logger.setLevel(logging.ERROR)
+    validator = DataQualityValidator(logger)
+    cleaned, _ = validator.validate_and_clean(df)
+    return cleaned
+
+
+def measure(name, func, df):
+    """Run func once under tracemalloc and return a result dict."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    cleaned = func(df)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return cleaned, {
+        'benchmark': 'data_quality_validator',
+        'implementation': name,
+        'rows': len(df),
+        'rows_out': len(cleaned),
+        'seconds': round(elapsed, 4),
+        'rows_per_second': round(len(df) / elapsed, 1) if elapsed else None,
+        'peak_traced_mb': round(peak / 1024 / 1024, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=600000)
+    parser.add_argument('--dirty-fraction', type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    df = make_dirty_frame(args.rows, args.dirty_fraction)
+
+    legacy_cleaned, legacy_result = measure('legacy_two_method', legacy_path, df)
+    fused_cleaned, fused_result = measure('fused_single_pass', fused_path, df)
+
+    fused_result['same_rows_as_legacy'] = legacy_cleaned.index.equals(fused_cleaned.index)
+    print(json.dumps(legacy_result))
+    print(json.dumps(fused_result))
+
+
+if __name__ == '__main__':
+    main()
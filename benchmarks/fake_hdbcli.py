@@ -0,0 +1,304 @@
+"""
+In-memory stand-in for the hdbcli DB-API used by the offline benchmarks.
+
+Understands the handful of statements issued by HanaClient and ETLPipeline,
+keeps rows in a dict keyed by (TICKER, DATE) and sleeps a configurable
+latency per network round-trip so that round-trip counts show up in timings.
+Several connections can share one FakeDatabase, as pooled connections do.
+Bad rows and transient errors can be injected to exercise batch recovery.
+installed() lets HanaClient itself connect through this driver.
+"""
+
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+# Column positions of a stored row, in HANA_COLUMNS order
+ROW_COLUMNS = ["TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
+               "VOLUME", "DAILY_RANGE", "DAILY_RETURN", "TIMESTAMP"]
+
+QUOTED_NAME = re.compile(r'"([^"]+)"\."([^"]+)"')
+CATALOG_NAME = re.compile(r"(SCHEMA_NAME|TABLE_NAME) = '([^']*)'")
+
+PROJECTED_SELECT = re.compile(
+    r'^SELECT ((?:"\w+"(?:, )?)+) FROM "[^"]+"\."[^"]+"(?: WHERE (.*?))?( ORDER BY "TICKER", "DATE")?$'
+)
+
+
+class OperationalError(Exception):
+    """Connection-level error carrying an hdbcli error code."""
+
+    def __init__(self, errorcode, message):
+        super().__init__(message)
+        self.errorcode = errorcode
+
+
+class FakeDatabase:
+    """
+    Rows keyed by (ticker, date) shared by every connection to it.
+
+    reject_row is a predicate over bind rows; an executemany containing a
+    matching row fails as a whole, like a statement-level constraint error.
+    The next transient_failures executemany calls raise a lock wait timeout.
+    With keep_values=False only the keys are stored, which keeps runs of
+    millions of rows in memory; projected SELECTs of stored values are then
+    not available.
+
+    Stock rows of every table share one key space. Schemas and tables are
+    only tracked for the SYS.SCHEMAS and SYS.TABLES lookups; tables listed
+    in tables exist from the start.
+    """
+
+    def __init__(self, latency_ms=0.0, reject_row=None, transient_failures=0, keep_values=True, tables=()):
+        self.latency = latency_ms / 1000.0
+        self.keep_values = keep_values
+        self.rows = {}
+        self.dates_by_ticker = {}
+        self.ticker_stats = {}
+        self.tables = {(schema.upper(), table.upper()) for schema, table in tables}
+        self.schemas = {schema for schema, _ in self.tables}
+        self.round_trips = 0
+        self.lock = threading.Lock()
+        self.reject_row = reject_row
+        self.transient_failures = transient_failures
+
+    def connect(self):
+        return FakeConnection(database=self)
+
+    def store(self, key, params):
+        """Insert or replace a row, keeping the per-ticker date index current"""
+        if key not in self.rows:
+            self.dates_by_ticker.setdefault(key[0], set()).add(key[1])
+        self.rows[key] = params if self.keep_values else None
+
+    def summarize(self, tickers=None):
+        """(row count, min date, max date) per stored ticker, as the summary INSERT ... SELECT computes them"""
+        return {
+            ticker: (len(dates), min(dates), max(dates))
+            for ticker, dates in list(self.dates_by_ticker.items())
+            if dates and (tickers is None or ticker in tickers)
+        }
+
+    def existing_keys(self, tickers, min_date, max_date):
+        """Stored keys of the given tickers within a date span, from the index"""
+        return [
+            (ticker, date) for ticker in tickers
+            for date in list(self.dates_by_ticker.get(ticker, ()))
+            if min_date <= date <= max_date
+        ]
+
+    def round_trip(self):
+        with self.lock:
+            self.round_trips += 1
+        if self.latency:
+            # Sleeping releases the GIL like hdbcli does during network I/O
+            time.sleep(self.latency)
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize(sql):
+    """Statement with collapsed whitespace in upper case, parsed once per distinct SQL text"""
+    return " ".join(sql.split()).upper()
+
+
+@contextmanager
+def installed(database):
+    """
+    Let HanaClient connect to database, also where hdbcli is not installed.
+
+    Within the block db.hana_client opens its connections through this
+    driver, so HanaClient(config).connect() and create_pool() use database.
+    """
+    from db import hana_client
+
+    saved = hana_client.HDBCLI_AVAILABLE, getattr(hana_client, 'dbapi', None)
+    hana_client.HDBCLI_AVAILABLE = True
+    hana_client.dbapi = SimpleNamespace(connect=lambda **kwargs: database.connect())
+    try:
+        yield database
+    finally:
+        hana_client.HDBCLI_AVAILABLE, hana_client.dbapi = saved
+
+
+class FakeConnection:
+    """DB-API connection to a FakeDatabase."""
+
+    def __init__(self, latency_ms=0.0, database=None):
+        self.database = database or FakeDatabase(latency_ms)
+        self.closed = False
+
+    @property
+    def rows(self):
+        return self.database.rows
+
+    @property
+    def round_trips(self):
+        return self.database.round_trips
+
+    def _round_trip(self):
+        self.database.round_trip()
+
+    def isconnected(self):
+        return not self.closed
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self._round_trip()
+
+    def rollback(self):
+        self._round_trip()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    """DB-API cursor for FakeConnection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = -1
+        self.description = None
+        self._results = []
+
+    def _run(self, sql, params):
+        rows = self.connection.rows
+        statement = _normalize(sql)
+        params = tuple(params or ())
+        self._results = []
+        self.rowcount = 0
+
+        database = self.connection.database
+        if statement.startswith("CREATE SCHEMA"):
+            database.schemas.add(statement.split('"')[1])
+        elif statement.startswith(("CREATE TABLE", "CREATE COLUMN TABLE", "DROP TABLE")):
+            name = QUOTED_NAME.search(statement).groups()
+            if statement.startswith("DROP"):
+                database.tables.discard(name)
+            else:
+                database.tables.add(name)
+        elif statement.startswith("DELETE FROM") and '_STATS"' in statement:
+            stats = database.ticker_stats
+            for ticker in (params if params else list(stats)):
+                self.rowcount += stats.pop(ticker, None) is not None
+        elif statement.startswith("INSERT INTO") and '_STATS"' in statement and " SELECT " in statement:
+            summary = database.summarize(set(params) if params else None)
+            database.ticker_stats.update(summary)
+            self.rowcount = len(summary)
+        elif statement.startswith("MERGE INTO") and '_STATS" AS TARGET' in statement:
+            stats = self.connection.database.ticker_stats
+            ticker, count, min_date, max_date = params
+            if ticker in stats:
+                stored = stats[ticker]
+                count, min_date, max_date = stored[0] + count, min(stored[1], min_date), max(stored[2], max_date)
+            stats[ticker] = (count, min_date, max_date)
+            self.rowcount = 1
+        elif statement.startswith("MERGE INTO") or statement.startswith("INSERT INTO"):
+            key = (params[0], params[1])
+            if statement.startswith("INSERT INTO") and key in rows:
+                raise ValueError(f"unique constraint violated for {key}")
+            self.connection.database.store(key, params)
+            self.rowcount = 1
+        elif statement.startswith("UPDATE"):
+            key = (params[-2], params[-1])
+            if key in rows:
+                self.connection.database.store(key, key + tuple(params[:-2]))
+                self.rowcount = 1
+        elif PROJECTED_SELECT.match(statement) and "BETWEEN" not in statement:
+            self._results = self._projected_select(PROJECTED_SELECT.match(statement), params, rows)
+        elif statement.startswith('SELECT "TICKER", "DATE" FROM') and " IN (" in statement:
+            self._results = self.connection.database.existing_keys(set(params[:-2]), params[-2], params[-1])
+        elif re.match(r'SELECT COUNT\(\*\) FROM "[^"]+"\."[^"]+" WHERE "TICKER" = \? AND "DATE" = \?', statement):
+            self._results = [(1 if (params[0], params[1]) in rows else 0,)]
+        elif statement.startswith('SELECT "TICKER", MAX("DATE")') and 'GROUP BY "TICKER"' in statement:
+            latest = {}
+            for ticker, date in list(rows):
+                if ticker not in latest or date > latest[ticker]:
+                    latest[ticker] = date
+            self._results = list(latest.items())
+        elif statement.startswith('SELECT COALESCE(SUM("ROW_COUNT"), 0), COUNT(*)'):
+            stats = [value for value in self.connection.database.ticker_stats.values() if value[0] > 0]
+            self._results = [(sum(value[0] for value in stats), len(stats),
+                              min((value[1] for value in stats), default=None),
+                              max((value[2] for value in stats), default=None))]
+        elif statement.startswith('SELECT COUNT(*), COUNT(DISTINCT "TICKER"), MIN("DATE"), MAX("DATE")'):
+            keys = list(rows)
+            dates = [key[1] for key in keys]
+            self._results = [(len(keys), len({key[0] for key in keys}),
+                              min(dates, default=None), max(dates, default=None))]
+        elif statement.startswith('SELECT COUNT(*), MAX("DATE") FROM'):
+            keys = list(rows)
+            self._results = [(len(keys), max((key[1] for key in keys), default=None))]
+        elif statement.startswith("SELECT COUNT(*) FROM SYS.SCHEMAS"):
+            schema = dict(CATALOG_NAME.findall(statement))['SCHEMA_NAME']
+            self._results = [(int(schema in database.schemas),)]
+        elif statement.startswith("SELECT COUNT(*) FROM SYS.TABLES"):
+            names = dict(CATALOG_NAME.findall(statement))
+            self._results = [(int((names['SCHEMA_NAME'], names['TABLE_NAME']) in database.tables),)]
+        elif statement.startswith("SELECT"):
+            self._results = [(None,)]
+
+    @staticmethod
+    def _projected_select(match, params, rows):
+        """Rows of a build_select_sql statement: projection, IN list, date bounds, order"""
+        columns = [ROW_COLUMNS.index(col.strip('"')) for col in match.group(1).split(", ")]
+        where = match.group(2) or ""
+        params = list(params)
+
+        tickers = None
+        if '"TICKER" IN (' in where:
+            count = where.split('"TICKER" IN (')[1].split(")")[0].count("?")
+            tickers, params = set(params[:count]), params[count:]
+        start = params.pop(0) if '"DATE" >= ?' in where else None
+        end = params.pop(0) if '"DATE" <= ?' in where else None
+
+        selected = [
+            row for row in list(rows.values())
+            if (tickers is None or row[0] in tickers)
+            and (start is None or row[1] >= start) and (end is None or row[1] <= end)
+        ]
+        if match.group(3):
+            selected.sort(key=lambda row: (row[0], row[1]))
+        return [tuple(row[i] for i in columns) for row in selected]
+
+    def execute(self, sql, params=None):
+        self.connection._round_trip()
+        self._run(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        self.connection._round_trip()
+        database = self.connection.database
+        with database.lock:
+            if database.transient_failures > 0:
+                database.transient_failures -= 1
+                raise OperationalError(131, "transaction rolled back by lock wait timeout")
+        if database.reject_row is not None:
+            seq_of_params = list(seq_of_params)
+            for params in seq_of_params:
+                if database.reject_row(params):
+                    raise ValueError(f"invalid value in row {params[:2]}")
+        counts = []
+        for params in seq_of_params:
+            self._run(sql, params)
+            counts.append(self.rowcount)
+        self.rowcount = sum(counts)
+        return tuple(counts)
+
+    def fetchone(self):
+        return self._results[0] if self._results else None
+
+    def fetchmany(self, size=1):
+        results, self._results = self._results[:size], self._results[size:]
+        return results
+
+    def fetchall(self):
+        results, self._results = self._results, []
+        return results
+
+    def close(self):
+        pass
@@ -0,0 +1,43 @@
+"""
+Local stand-in for the Kaggle API used by offline runs and benchmarks.
+
+Serves the CSV files of a local directory as a versioned Kaggle dataset and
+implements the KaggleApi methods that KaggleApiClient calls.
+"""
+
+import shutil
+from pathlib import Path
+
+
+class LocalKaggleApi:
+    """Kaggle API stand-in backed by a directory of CSV files."""
+
+    def __init__(self, source_dir, version=1):
+        """
+        Args:
+            source_dir (str): Directory whose CSV files make up the dataset
+            version (int): Current dataset version number
+        """
+        self.source_dir = Path(source_dir)
+        self.version = version
+        self.downloads = 0
+
+    def publish(self, version=None):
+        """Simulate a new dataset version on Kaggle."""
+        self.version = version if version is not None else self.version + 1
+
+    def authenticate(self):
+        pass
+
+    def datasets_view(self, owner_slug, dataset_slug):
+        return {
+            'ref': f"{owner_slug}/{dataset_slug}",
+            'currentVersionNumber': self.version
+        }
+
+    def dataset_download_files(self, dataset, path=None, unzip=False, **kwargs):
+        self.downloads += 1
+        target = Path(path or '.')
+        target.mkdir(parents=True, exist_ok=True)
+        for source in sorted(self.source_dir.glob("*.csv")):
+            shutil.copy2(source, target / source.name)
@@ -0,0 +1,156 @@
+"""
+Deterministic synthetic S&P 500 data in the layout of the Kaggle all_stocks_5yr.csv.
+
+Prices follow a geometric random walk per ticker. A configurable share of
+rows is made dirty the way real extracts are: repeated (ticker, date) rows,
+missing prices or volumes and rows whose High is below their Low. The same
+arguments always produce the same frame.
+
+Usage:
+    python -m benchmarks.generator --tickers 505 --years 5 --output data/all_stocks_5yr.csv
+    python -m benchmarks.generator --rows 1000000 --output data/bench/all_stocks_1m.csv
+
+The CSV can be served to KaggleApiClient by benchmarks.fake_kaggle.LocalKaggleApi.
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Column names and order of the Kaggle file
+KAGGLE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'Name']
+
+TRADING_DAYS_PER_YEAR = 252
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def ticker_symbols(count):
+    """Deterministic, unique one- to four-letter symbols: A, B, ..., Z, AA, AB, ..."""
+    symbols = []
+    for number in range(count):
+        symbol = ""
+        number += 1
+        while number:
+            number, remainder = divmod(number - 1, 26)
+            symbol = chr(ord('A') + remainder) + symbol
+        symbols.append(symbol)
+    return symbols
+
+
+def generate_ohlcv(tickers=505, years=5.0, rows=None, start="2013-02-08", seed=42,
+                   duplicate_fraction=0.001, missing_fraction=0.001, inverted_fraction=0.001):
+    """
+    Build a raw stock frame as pd.read_csv returns the Kaggle file.
+
+    Args:
+        tickers (int): Number of tickers
+        years (float): Trading years per ticker, ignored when rows is given
+        rows (int, optional): Exact number of clean rows; the history per
+            ticker is made long enough and the last ticker is cut short
+        start (str): First trading day
+        seed (int): Random seed; equal arguments give equal frames
+        duplicate_fraction (float): Share of rows repeated right after themselves
+        missing_fraction (float): Share of rows with one missing OHLCV value
+        inverted_fraction (float): Share of rows with High and Low swapped
+
+    Returns:
+        DataFrame: date (str), open, high, low, close, volume (float64) and
+            Name columns, sorted by Name and date except for the injected rows
+    """
+    rng = np.random.default_rng(seed)
+    if rows is not None:
+        days = max(2, math.ceil(rows / tickers))
+    else:
+        days = max(2, round(years * TRADING_DAYS_PER_YEAR))
+        rows = tickers * days
+
+    dates = pd.bdate_range(start, periods=days).strftime('%Y-%m-%d').to_numpy(dtype=object)
+    first_close = rng.lognormal(mean=4.0, sigma=0.8, size=(tickers, 1))
+    log_returns = rng.normal(0.0003, 0.018, size=(tickers, days))
+    close = (first_close * np.exp(np.cumsum(log_returns, axis=1))).ravel()[:rows]
+
+    open_ = close * np.exp(rng.normal(0.0, 0.006, rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0.0, 0.008, rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0.0, 0.008, rows)))
+    volume = np.floor(rng.lognormal(mean=14.5, sigma=1.0, size=rows))
+
+    frame = pd.DataFrame({
+        'date': np.tile(dates, tickers)[:rows],
+        'open': np.round(open_, 4),
+        'high': np.round(high, 4),
+        'low': np.round(low, 4),
+        'close': np.round(close, 4),
+        'volume': volume,
+        'Name': np.repeat(np.array(ticker_symbols(tickers), dtype=object), days)[:rows],
+    }, columns=KAGGLE_COLUMNS)
+
+    return inject_dirt(frame, rng, duplicate_fraction, missing_fraction, inverted_fraction)
+
+
+def inject_dirt(frame, rng, duplicate_fraction=0.001, missing_fraction=0.001, inverted_fraction=0.001):
+    """
+    Make a share of the rows of a raw frame dirty.
+
+    Args:
+        frame (DataFrame): Raw frame in the Kaggle layout, modified in place
+        rng (numpy.random.Generator): Source of the dirty row positions
+
+    Returns:
+        DataFrame: The frame with repeated rows inserted and a fresh RangeIndex
+    """
+    rows = len(frame)
+
+    def positions(fraction):
+        return rng.choice(rows, min(rows, int(rows * fraction)), replace=False)
+
+    missing = positions(missing_fraction)
+    columns = rng.integers(0, len(PRICE_COLUMNS), len(missing))
+    for number, column in enumerate(PRICE_COLUMNS):
+        frame.loc[missing[columns == number], column] = np.nan
+
+    inverted = positions(inverted_fraction)
+    frame.loc[inverted, ['high', 'low']] = frame.loc[inverted, ['low', 'high']].to_numpy()
+
+    # Repeats follow their original, as in an extract re-publishing a day
+    order = np.sort(np.concatenate([np.arange(rows), positions(duplicate_fraction)]), kind='stable')
+    return frame.take(order).reset_index(drop=True)
+
+
+def dirt_counts(frame):
+    """Repeated keys, rows with missing values and rows with High < Low in a raw frame."""
+    return {
+        'rows': len(frame),
+        'duplicates': int(frame.duplicated(subset=['Name', 'date']).sum()),
+        'missing': int(frame[PRICE_COLUMNS].isna().any(axis=1).sum()),
+        'inverted': int((frame['high'] < frame['low']).sum()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tickers', type=int, default=505)
+    parser.add_argument('--years', type=float, default=5.0)
+    parser.add_argument('--rows', type=int, help='exact number of clean rows (overrides --years)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--dirty-fraction', type=float, default=0.001,
+                        help='share of rows made dirty per kind: repeated, missing value, High < Low')
+    parser.add_argument('--output', required=True, help='CSV file to write')
+    args = parser.parse_args(argv)
+
+    frame = generate_ohlcv(args.tickers, args.years, rows=args.rows, seed=args.seed,
+                           duplicate_fraction=args.dirty_fraction, missing_fraction=args.dirty_fraction,
+                           inverted_fraction=args.dirty_fraction)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    frame.to_csv(output, index=False)
+    print(json.dumps({'output': str(output), **dirt_counts(frame)}))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,22 @@
 SAP HANA database client for storing S&P 500 stock data
 """
 
+import copy
 import datetime
 import logging
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from utils.schema import concat_frames
+from utils.tracing import traced
 
 # Import SAP HANA Python client
 try:
@@ -14,6 +28,616 @@ except ImportError:
     logging.warning("hdbcli package not installed. SAP HANA integration will not work.")
     logging.warning("Install using: pip install hdbcli")
 
+# HANA column order used by every bulk statement, matching the DataFrame
+# columns produced by KaggleApiClient._clean_dataframe
+HANA_COLUMNS = [
+    "TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
+    "VOLUME", "DAILY_RANGE", "DAILY_RETURN", "TIMESTAMP"
+]
+FLOAT_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Daily_Range', 'Daily_Return']
+
+# Maximum number of bind parameters placed in a single IN (...) list
+IN_LIST_CHUNK = 1000
+
+# Suffix of the per-ticker summary table kept next to a stock table
+STATS_TABLE_SUFFIX = "_STATS"
+
+# DataFrame name and dtype of every column readable through iter_query
+QUERY_COLUMNS = {
+    "TICKER": ('Ticker', 'category'),
+    "DATE": ('Date', 'datetime64[ns]'),
+    "OPEN": ('Open', 'float64'),
+    "HIGH": ('High', 'float64'),
+    "LOW": ('Low', 'float64'),
+    "CLOSE": ('Close', 'float64'),
+    "VOLUME": ('Volume', 'float64'),
+    "DAILY_RANGE": ('Daily_Range', 'float64'),
+    "DAILY_RETURN": ('Daily_Return', 'float64'),
+    "TIMESTAMP": ('Timestamp', 'datetime64[ns]')
+}
+
+
+def _nullable_objects(values, as_int=False):
+    """
+    Convert a numeric array to Python objects with None for missing values.
+
+    Args:
+        values (ndarray): Numeric values (NaN marks a missing value)
+        as_int (bool): Convert present values to int instead of float
+
+    Returns:
+        ndarray: Object array suitable for DB-API binding
+    """
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+
+    if as_int:
+        result = np.where(missing, 0, values).astype(np.int64).astype(object)
+    else:
+        result = values.astype(object)
+
+    result[missing] = None
+    return result
+
+
+def dataframe_to_bind_rows(df, timestamp):
+    """
+    Convert a stock DataFrame to DB-API parameter rows in one vectorized pass.
+
+    Missing columns and NaN values are bound as NULL, dates are bound as
+    Python dates and every row is stamped with the same load timestamp.
+
+    Args:
+        df (DataFrame): Stock data with the cleaned column names
+        timestamp (datetime): Load timestamp for the TIMESTAMP column
+
+    Returns:
+        list: One tuple per row in HANA_COLUMNS order
+    """
+    n = len(df)
+    missing_column = np.full(n, None, dtype=object)
+
+    if 'Ticker' in df.columns:
+        tickers = df['Ticker'].astype(str).to_numpy(dtype=object)
+    else:
+        tickers = np.full(n, '', dtype=object)
+
+    if 'Date' in df.columns:
+        dates = pd.to_datetime(df['Date'], errors='coerce')
+        date_values = dates.dt.date.to_numpy(dtype=object)
+        date_values[dates.isna().to_numpy()] = None
+    else:
+        date_values = missing_column
+
+    def numeric(col, as_int=False):
+        if col not in df.columns:
+            return missing_column
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        return _nullable_objects(values, as_int=as_int)
+
+    return list(zip(
+        tickers, date_values,
+        numeric('Open'), numeric('High'), numeric('Low'), numeric('Close'),
+        numeric('Volume', as_int=True),
+        numeric('Daily_Range'), numeric('Daily_Return'),
+        repeat(timestamp, n)
+    ))
+
+
+def fetch_existing_keys(cursor, schema_name, table_name, tickers, min_date, max_date):
+    """
+    Load the (TICKER, DATE) keys already present for a set of tickers and a date span.
+
+    Runs one range query per IN_LIST_CHUNK tickers instead of one lookup per row.
+
+    Args:
+        cursor: Open DB-API cursor
+        schema_name (str): The schema name in SAP HANA
+        table_name (str): The table name
+        tickers (iterable): Tickers being written
+        min_date (date): First date being written
+        max_date (date): Last date being written
+
+    Returns:
+        set: Existing (ticker, date) tuples
+    """
+    tickers = list(tickers)
+    existing = set()
+
+    for start in range(0, len(tickers), IN_LIST_CHUNK):
+        chunk = tickers[start:start + IN_LIST_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(f"""
+        SELECT "TICKER", "DATE" FROM "{schema_name}"."{table_name}"
+        WHERE "TICKER" IN ({placeholders}) AND "DATE" BETWEEN ? AND ?
+        """, (*chunk, min_date, max_date))
+        existing.update((ticker, date) for ticker, date in cursor.fetchall())
+
+    return existing
+
+
+def _result_column(values, dtype):
+    """
+    Convert one fetched column (a tuple of driver values) to a typed array.
+
+    DECIMAL values arrive as decimal.Decimal and NULLs as None; numeric
+    columns become float64 with NaN, dates and timestamps datetime64[ns]
+    with NaT, and tickers an object array of strings.
+    """
+    if dtype == 'float64':
+        return np.array(values, dtype=np.float64)
+    if dtype == 'datetime64[ns]':
+        return pd.to_datetime(pd.Series(values, dtype=object)).to_numpy(dtype='datetime64[ns]')
+    return np.array(values, dtype=object)
+
+
+def build_select_sql(schema_name, table_name, columns, ticker_count=0,
+                     start_date=None, end_date=None, order=True):
+    """
+    Build a projected, filtered SELECT for iter_query.
+
+    Args:
+        schema_name (str): The schema name in SAP HANA
+        table_name (str): The table name
+        columns (list): HANA column names to select
+        ticker_count (int): Number of ticker placeholders in an IN list (0: all tickers)
+        start_date, end_date: Add a "DATE" >= ? / <= ? predicate when given
+        order (bool): Order by ticker and date
+
+    Returns:
+        str: SELECT statement with ? placeholders, tickers first
+    """
+    predicates = []
+    if ticker_count:
+        predicates.append(f'"TICKER" IN ({", ".join("?" * ticker_count)})')
+    if start_date is not None:
+        predicates.append('"DATE" >= ?')
+    if end_date is not None:
+        predicates.append('"DATE" <= ?')
+
+    select_list = ", ".join(f'"{col}"' for col in columns)
+    sql = f'SELECT {select_list} FROM "{schema_name}"."{table_name}"'
+    if predicates:
+        sql += " WHERE " + " AND ".join(predicates)
+    if order:
+        sql += ' ORDER BY "TICKER", "DATE"'
+    return sql
+
+
+def bulk_merge_sql(schema_name, table_name, source_table=None):
+    """
+    Build the MERGE statement used by the bulk load paths.
+
+    Args:
+        schema_name (str): The schema name in SAP HANA
+        table_name (str): The target table name
+        source_table (str, optional): Staging table in the same schema to merge
+            from in one set-based statement. When omitted the statement takes
+            one HANA_COLUMNS parameter row per execution.
+
+    Returns:
+        str: MERGE statement keyed on (TICKER, DATE)
+    """
+    if source_table:
+        using = f'"{schema_name}"."{source_table}"'
+    else:
+        using = "(SELECT " + ", ".join(f'? AS "{col}"' for col in HANA_COLUMNS) + " FROM DUMMY)"
+
+    update_columns = HANA_COLUMNS[2:]
+    update_set = ", ".join(f'"{col}" = source."{col}"' for col in update_columns)
+    insert_columns = ", ".join(f'"{col}"' for col in HANA_COLUMNS)
+    insert_values = ", ".join(f'source."{col}"' for col in HANA_COLUMNS)
+
+    return f"""
+    MERGE INTO "{schema_name}"."{table_name}" AS target
+    USING {using} AS source
+    ON target."TICKER" = source."TICKER" AND target."DATE" = source."DATE"
+    WHEN MATCHED THEN
+        UPDATE SET {update_set}
+    WHEN NOT MATCHED THEN
+        INSERT ({insert_columns})
+        VALUES ({insert_values})
+    """
+
+
+def stats_table_name(table_name):
+    """Name of the per-ticker summary table of a stock table."""
+    return f"{table_name}{STATS_TABLE_SUFFIX}"
+
+
+def stats_merge_sql(schema_name, table_name, source=None):
+    """
+    Build the MERGE that adds new rows and date bounds to the summary table.
+
+    Row counts are added to the stored ones and the date range is widened,
+    so a committed batch only touches the rows of its own tickers.
+
+    Args:
+        schema_name (str): The schema name in SAP HANA
+        table_name (str): The stock table name (not the summary table)
+        source (str, optional): Subquery with "TICKER", "ROW_COUNT",
+            "MIN_DATE" and "MAX_DATE" columns. When omitted the statement
+            takes one (ticker, new rows, min date, max date) parameter row
+            per execution.
+
+    Returns:
+        str: MERGE statement keyed on TICKER
+    """
+    if source is None:
+        source = '(SELECT ? AS "TICKER", ? AS "ROW_COUNT", ? AS "MIN_DATE", ? AS "MAX_DATE" FROM DUMMY)'
+
+    return f"""
+    MERGE INTO "{schema_name}"."{stats_table_name(table_name)}" AS target
+    USING {source} AS source
+    ON target."TICKER" = source."TICKER"
+    WHEN MATCHED THEN
+        UPDATE SET "ROW_COUNT" = target."ROW_COUNT" + source."ROW_COUNT",
+                   "MIN_DATE" = LEAST(target."MIN_DATE", source."MIN_DATE"),
+                   "MAX_DATE" = GREATEST(target."MAX_DATE", source."MAX_DATE"),
+                   "UPDATED_AT" = CURRENT_TIMESTAMP
+    WHEN NOT MATCHED THEN
+        INSERT ("TICKER", "ROW_COUNT", "MIN_DATE", "MAX_DATE", "UPDATED_AT")
+        VALUES (source."TICKER", source."ROW_COUNT", source."MIN_DATE", source."MAX_DATE", CURRENT_TIMESTAMP)
+    """
+
+
+def ticker_stats_rows(rows, existing=()):
+    """
+    Summarize bind rows per ticker for stats_merge_sql.
+
+    Args:
+        rows (list): Parameter tuples in HANA_COLUMNS order
+        existing (set): (TICKER, DATE) keys already in the table; they
+            widen nothing and are not counted as new rows
+
+    Returns:
+        list: (ticker, new rows, min date, max date) tuples
+    """
+    keys = pd.DataFrame([row[:2] for row in rows], columns=['TICKER', 'DATE'])
+    keys = keys.dropna().drop_duplicates()
+    if keys.empty:
+        return []
+
+    new = ~pd.MultiIndex.from_frame(keys).isin(list(existing)) if existing else np.ones(len(keys), dtype=bool)
+    summary = keys.assign(NEW=new).groupby('TICKER', sort=True).agg(
+        ROW_COUNT=('NEW', 'sum'), MIN_DATE=('DATE', 'min'), MAX_DATE=('DATE', 'max')
+    )
+    return [(ticker, int(count), min_date, max_date)
+            for ticker, count, min_date, max_date in summary.itertuples()]
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so equivalent statements share one cache key."""
+    return " ".join(sql.split())
+
+
+def _result_bytes(value):
+    """Approximate in-memory size of a cached read result."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_result_bytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _copy_result(value):
+    """Copy a result so callers cannot modify the cached object."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class QueryCache:
+    """
+    LRU cache of read results with a time-to-live, invalidated per table.
+
+    Entries are keyed on the target table, the whitespace-normalized SQL and
+    the bind parameters. The least recently used entries are evicted once
+    max_entries or max_bytes is exceeded, and entries older than ttl seconds
+    are treated as misses. Invalidating a table drops its entries and bumps
+    its generation, so a result read before the invalidation finished is not
+    stored afterwards. A ttl or max_bytes of 0 disables caching.
+    """
+
+    def __init__(self, ttl=300.0, max_bytes=64 * 1024 * 1024, max_entries=256, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid
+            max_bytes (int): Approximate memory budget for all entries
+            max_entries (int): Maximum number of entries
+            clock (callable): Monotonic time source
+        """
+        self.ttl = float(ttl)
+        self.max_bytes = int(max_bytes)
+        self.max_entries = max(1, int(max_entries))
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generations = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def target(schema_name, table_name):
+        """Cache target of a table, matching the run-state store's "SCHEMA.TABLE" targets."""
+        return f"{schema_name}.{table_name}"
+
+    def get_or_load(self, target, sql, params, load):
+        """
+        Return the cached result of a query, or load and cache it.
+
+        Args:
+            target (str): Table the query reads, see target()
+            sql (str): Statement (or other description) of the query
+            params (tuple): Hashable parameters of the query
+            load (callable): Runs the query; should raise rather than return
+                a placeholder on failure so errors are not cached
+
+        Returns:
+            A copy of the cached or freshly loaded result
+        """
+        if not self.enabled:
+            return load()
+
+        key = (target, normalize_sql(sql), tuple(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_result(entry[0])
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            generation = self._generation(target)
+
+        value = load()
+        self._store(key, target, generation, value)
+        return _copy_result(value)
+
+    def _store(self, key, target, generation, value):
+        """Add an entry unless its table was invalidated while it was loaded."""
+        size = _result_bytes(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if self._generation(target) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (_copy_result(value), self.clock() + self.ttl, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _generation(self, target):
+        """Invalidation count of a table (caller holds the lock)."""
+        return (self._epoch, self._generations.get(target, 0))
+
+    def _remove(self, key):
+        """Drop an entry (caller holds the lock)."""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate(self, target=None):
+        """
+        Drop the entries of one table, or of every table.
+
+        Args:
+            target (str, optional): Table to invalidate, see target() (default: all)
+
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            if target is None:
+                keys = list(self._entries)
+                self._epoch += 1
+            else:
+                keys = [key for key in self._entries if key[0] == target]
+                self._generations[target] = self._generations.get(target, 0) + 1
+
+            for key in keys:
+                self._remove(key)
+            self.invalidations += 1
+            return len(keys)
+
+    def stats(self):
+        """
+        Hit/miss counters and current size of the cache.
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, invalidations, entries and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
+
+
+class HanaConnectionPool:
+    """Bounded pool of SAP HANA connections with checkout/checkin and health checks."""
+
+    def __init__(self, connect, max_size=4, checkout_timeout=30.0, health_check_interval=30.0):
+        """
+        Initialize the pool. Connections are opened lazily up to max_size.
+
+        Args:
+            connect (callable): Returns a new DB-API connection
+            max_size (int): Maximum number of open connections
+            checkout_timeout (float): Seconds to wait for a free connection
+            health_check_interval (float): Idle seconds after which a connection
+                is pinged with SELECT 1 FROM DUMMY before being handed out
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_size = max(1, int(max_size))
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._closed = False
+
+    @property
+    def size(self):
+        """Number of connections currently open (idle or checked out)."""
+        return self._size
+
+    def _is_healthy(self, connection, idle_since):
+        """Check a connection before handing it out."""
+        try:
+            if hasattr(connection, 'isconnected') and not connection.isconnected():
+                return False
+
+            if time.monotonic() - idle_since >= self.health_check_interval:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("SELECT 1 FROM DUMMY")
+                    cursor.fetchone()
+                finally:
+                    cursor.close()
+
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Discarding unhealthy pooled connection: {str(e)}")
+            return False
+
+    def _discard(self, connection):
+        """Close a connection and release its slot."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._size -= 1
+
+    def checkout(self, timeout=None):
+        """
+        Take a healthy connection from the pool, opening one if below max_size.
+
+        Args:
+            timeout (float, optional): Seconds to wait (default: checkout_timeout)
+
+        Returns:
+            Connection: An open DB-API connection
+
+        Raises:
+            TimeoutError: If no connection became available in time
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+
+            try:
+                connection, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                connection = None
+
+            if connection is not None:
+                if self._is_healthy(connection, idle_since):
+                    return connection
+                self._discard(connection)
+                continue
+
+            with self._lock:
+                can_open = self._size < self.max_size
+                if can_open:
+                    self._size += 1
+
+            if can_open:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                    raise
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No pooled connection available within {timeout} seconds")
+
+            try:
+                # Wake up periodically in case a discarded slot can be reopened
+                connection, idle_since = self._idle.get(timeout=min(remaining, 0.5))
+            except queue.Empty:
+                continue
+
+            if self._is_healthy(connection, idle_since):
+                return connection
+            self._discard(connection)
+
+    def checkin(self, connection, discard=False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            connection: Connection obtained from checkout()
+            discard (bool): Close the connection instead of reusing it
+        """
+        if discard or self._closed:
+            self._discard(connection)
+        else:
+            self._idle.put((connection, time.monotonic()))
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Check out a connection for the duration of a with-block."""
+        connection = self.checkout(timeout)
+        try:
+            yield connection
+        except Exception:
+            # Roll back whatever the caller left open before reuse
+            try:
+                connection.rollback()
+            except Exception:
+                self.checkin(connection, discard=True)
+                raise
+            self.checkin(connection)
+            raise
+        else:
+            self.checkin(connection)
+
+    def close(self):
+        """Close all idle connections. Checked-out connections close on checkin."""
+        self._closed = True
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+
 class HanaClient:
     """Client for interacting with SAP HANA database."""
 
@@ -36,10 +660,25 @@ class HanaClient:
         self.user = config['hana']['user']
         self.password = config['hana']['password']
         self.schema = config['hana']['schema']
+        self.pool_size = int(config['hana'].get('pool_size', 4))
 
         # Connection will be set later
         self.connection = None
 
+        # Optional pool for concurrent writers, see create_pool()
+        self.pool = None
+
+        # Retries and bisects failed insert_data writes; imported here because
+        # the etl package imports this module through db.sinks
+        from etl.recovery import BatchRecovery
+        self.recovery = BatchRecovery.from_config(config, self.logger)
+
+        # Read results of get_table_stats, query_frame and query_data
+        self.query_cache = QueryCache(
+            ttl=float(config['hana'].get('query_cache_ttl', 300)),
+            max_bytes=int(float(config['hana'].get('query_cache_mb', 64)) * 1024 * 1024)
+        )
+
         # Define table schema for S&P 500 stock data
         self.table_schema = """
             CREATE TABLE "{schema}"."{table}" (
@@ -58,6 +697,44 @@ class HanaClient:
             )
         """
 
+        # Optional per-ticker summary maintained from every committed batch,
+        # see create_stats_table()
+        self.stats_table = bool(config['hana'].get('stats_table', False))
+        self.stats_table_schema = """
+            CREATE COLUMN TABLE "{schema}"."{table}" (
+                "TICKER" NVARCHAR(20) PRIMARY KEY,
+                "ROW_COUNT" BIGINT,
+                "MIN_DATE" DATE,
+                "MAX_DATE" DATE,
+                "UPDATED_AT" TIMESTAMP
+            )
+        """
+
+        # Per-run staging table used by the set-based load mode
+        self.staging_table_schema = """
+            CREATE COLUMN TABLE "{schema}"."{table}" (
+                "TICKER" NVARCHAR(20),
+                "DATE" DATE,
+                "OPEN" DECIMAL(18,6),
+                "HIGH" DECIMAL(18,6),
+                "LOW" DECIMAL(18,6),
+                "CLOSE" DECIMAL(18,6),
+                "VOLUME" BIGINT,
+                "DAILY_RANGE" DECIMAL(18,6),
+                "DAILY_RETURN" DECIMAL(18,6),
+                "TIMESTAMP" TIMESTAMP
+            )
+        """
+
+    def _open_connection(self):
+        """Open a new DB-API connection with the configured parameters."""
+        return dbapi.connect(
+            address=self.address,
+            port=int(self.port),
+            user=self.user,
+            password=self.password
+        )
+
     def connect(self):
         """
         Establish a connection to SAP HANA database.
@@ -66,12 +743,7 @@ class HanaClient:
             bool: True if connection successful, False otherwise
         """
         try:
-            self.connection = dbapi.connect(
-                address=self.address,
-                port=int(self.port),
-                user=self.user,
-                password=self.password
-            )
+            self.connection = self._open_connection()
 
             self.logger.info("Successfully connected to SAP HANA at %s:%s",
                          self.address, self.port)
@@ -81,8 +753,27 @@ class HanaClient:
             self.logger.error("Failed to connect to SAP HANA: %s", str(e))
             return False
 
+    def create_pool(self, max_size=None):
+        """
+        Create the connection pool used by concurrent batch writers.
+
+        Args:
+            max_size (int, optional): Maximum number of pooled connections
+                (default: hana.pool_size)
+
+        Returns:
+            HanaConnectionPool: The client's pool
+        """
+        if self.pool is None:
+            self.pool = HanaConnectionPool(self._open_connection, max_size=max_size or self.pool_size)
+            self.logger.info(f"Created SAP HANA connection pool (max {self.pool.max_size} connections)")
+        return self.pool
+
     def close(self):
-        """Close the connection to SAP HANA database."""
+        """Close the connection and any pooled connections to SAP HANA database."""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
         if self.connection:
             self.connection.close()
             self.logger.info("Closed connection to SAP HANA")
@@ -163,110 +854,227 @@ class HanaClient:
                 self.logger.info(f'Table "{schema_name}"."{table_name}" already exists in SAP HANA')
 
             cursor.close()
-            return True
 
         except Exception as e:
             self.logger.error(f"Error creating HANA table: {str(e)}")
             return False
 
+        if self.stats_table:
+            return self.create_stats_table(schema_name, table_name)
+        return True
+
+    def create_stats_table(self, schema_name, table_name):
+        """
+        Create the per-ticker summary table of a stock table if it doesn't exist.
+
+        A new summary table is filled from the stock table once; afterwards
+        every committed batch adds its new rows and dates to it, so
+        get_table_stats reads one row per ticker instead of scanning the
+        stock table. Rows deleted outside the pipeline are only reflected
+        after refresh_table_stats.
+
+        Args:
+            schema_name (str): The schema name in SAP HANA
+            table_name (str): The stock table name
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.connection:
+            self.logger.error("No connection to SAP HANA. Cannot create stats table.")
+            return False
+
+        summary_table = stats_table_name(table_name)
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(f"""
+            SELECT COUNT(*) FROM SYS.TABLES
+            WHERE SCHEMA_NAME = '{schema_name}' AND TABLE_NAME = '{summary_table}'
+            """)
+            table_exists = cursor.fetchone()[0] > 0
+
+            if not table_exists:
+                cursor.execute(self.stats_table_schema.format(schema=schema_name, table=summary_table))
+                self.logger.info(f'Successfully created stats table "{schema_name}"."{summary_table}"')
+
+            cursor.close()
+
+        except Exception as e:
+            self.logger.error(f"Error creating HANA stats table: {str(e)}")
+            return False
+
+        return table_exists or self.refresh_table_stats(schema_name, table_name)
+
+    def refresh_table_stats(self, schema_name, table_name, tickers=None):
+        """
+        Recompute summary rows from the stock table.
+
+        Args:
+            schema_name (str): The schema name in SAP HANA
+            table_name (str): The stock table name
+            tickers (iterable, optional): Only recompute these tickers (default: all)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.connection:
+            self.logger.error("No connection to SAP HANA. Cannot refresh stats table.")
+            return False
+
+        quoted_summary = f'"{schema_name}"."{stats_table_name(table_name)}"'
+        ticker_groups = [None]
+        if tickers is not None:
+            tickers = sorted(set(tickers))
+            ticker_groups = [tickers[i:i + IN_LIST_CHUNK] for i in range(0, len(tickers), IN_LIST_CHUNK)]
+
+        try:
+            cursor = self.connection.cursor()
+            for group in ticker_groups:
+                where = f'WHERE "TICKER" IN ({", ".join("?" * len(group))})' if group else ""
+                cursor.execute(f"DELETE FROM {quoted_summary} {where}", tuple(group or ()))
+                cursor.execute(f"""
+                INSERT INTO {quoted_summary} ("TICKER", "ROW_COUNT", "MIN_DATE", "MAX_DATE", "UPDATED_AT")
+                SELECT "TICKER", COUNT(*), MIN("DATE"), MAX("DATE"), CURRENT_TIMESTAMP
+                FROM "{schema_name}"."{table_name}" {where}
+                GROUP BY "TICKER"
+                """, tuple(group or ()))
+            self.connection.commit()
+            cursor.close()
+            self.invalidate_cache(schema_name, table_name)
+
+            self.logger.info(f"Refreshed {quoted_summary} for {len(tickers) if tickers is not None else 'all'} tickers")
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Error refreshing HANA stats table: {str(e)}")
+            return False
+
     def insert_data(self, df, schema_name, table_name):
         """
         Insert stock data from DataFrame to SAP HANA table.
 
+        The existing (TICKER, DATE) keys for the tickers and date span in the
+        frame are loaded with one range query, the frame is split into insert
+        and update partitions and each partition is sent with one executemany.
+        Both partitions are written in one transaction that is committed once.
+        A write that fails is retried or bisected by the client's BatchRecovery
+        until the bad rows are isolated; those rows are logged and skipped.
+
         Args:
             df (DataFrame): The pandas DataFrame containing stock data
             schema_name (str): The schema name in SAP HANA
             table_name (str): The table name to insert into
 
         Returns:
-            int: The number of rows inserted
+            int: The number of rows inserted plus the number of rows updated
         """
         if not self.connection:
             self.logger.error("No connection to SAP HANA. Cannot insert data.")
             return 0
 
+        if df.empty:
+            return 0
+
         try:
             cursor = self.connection.cursor()
-            rows_inserted = 0
-            rows_updated = 0
-            timestamp = datetime.datetime.now()
+            df = df.reset_index(drop=True)
+            rows = dataframe_to_bind_rows(df, datetime.datetime.now())
+            tickers = {row[0] for row in rows}
+
+            # Pre-fetch the keys that already exist for this frame
+            dates = [row[1] for row in rows if row[1] is not None]
+            existing = set()
+            if dates:
+                existing = fetch_existing_keys(cursor, schema_name, table_name, tickers, min(dates), max(dates))
+
+            insert_sql = f"""
+            INSERT INTO "{schema_name}"."{table_name}" (
+                "TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
+                "VOLUME", "DAILY_RANGE", "DAILY_RETURN", "TIMESTAMP"
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+            update_sql = f"""
+            UPDATE "{schema_name}"."{table_name}"
+            SET "OPEN" = ?, "HIGH" = ?, "LOW" = ?, "CLOSE" = ?,
+                "VOLUME" = ?, "DAILY_RANGE" = ?, "DAILY_RETURN" = ?,
+                "TIMESTAMP" = ?
+            WHERE "TICKER" = ? AND "DATE" = ?
+            """
 
-            # Process the DataFrame
-            for index, row in df.iterrows():
-                try:
-                    # Extract stock data
-                    ticker = str(row.get('Ticker', ''))
-                    date = row.get('Date')
-                    open_price = float(row.get('Open', 0)) if row.get('Open') is not None else None
-                    high_price = float(row.get('High', 0)) if row.get('High') is not None else None
-                    low_price = float(row.get('Low', 0)) if row.get('Low') is not None else None
-                    close_price = float(row.get('Close', 0)) if row.get('Close') is not None else None
-                    volume = int(row.get('Volume', 0)) if row.get('Volume') is not None else None
-                    daily_range = float(row.get('Daily_Range', 0)) if row.get('Daily_Range') is not None else None
-                    daily_return = float(row.get('Daily_Return', 0)) if row.get('Daily_Return') is not None else None
-
-                    # Convert pandas Timestamp to Python date
-                    if hasattr(date, 'date'):
-                        date = date.date()
-
-                    # Check if record already exists
-                    check_sql = f"""
-                    SELECT COUNT(*) FROM "{schema_name}"."{table_name}"
-                    WHERE "TICKER" = ? AND "DATE" = ?
-                    """
-                    cursor.execute(check_sql, (ticker, date))
-                    exists = cursor.fetchone()[0] > 0
-
-                    if exists:
-                        # Update existing record
-                        update_sql = f"""
-                        UPDATE "{schema_name}"."{table_name}"
-                        SET "OPEN" = ?, "HIGH" = ?, "LOW" = ?, "CLOSE" = ?,
-                            "VOLUME" = ?, "DAILY_RANGE" = ?, "DAILY_RETURN" = ?,
-                            "TIMESTAMP" = ?
-                        WHERE "TICKER" = ? AND "DATE" = ?
-                        """
-                        cursor.execute(update_sql, (
-                            open_price, high_price, low_price, close_price,
-                            volume, daily_range, daily_return, timestamp,
-                            ticker, date
-                        ))
-                        rows_updated += 1
-                    else:
-                        # Insert new record
-                        insert_sql = f"""
-                        INSERT INTO "{schema_name}"."{table_name}" (
-                            "TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
-                            "VOLUME", "DAILY_RANGE", "DAILY_RETURN", "TIMESTAMP"
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """
-                        cursor.execute(insert_sql, (
-                            ticker, date, open_price, high_price, low_price, close_price,
-                            volume, daily_range, daily_return, timestamp
-                        ))
-                        rows_inserted += 1
-
-                except Exception as row_error:
-                    self.logger.warning(f"Error processing row {index}: {str(row_error)}")
-                    continue
+            def write(part):
+                part_rows = [rows[position] for position in part.index]
+                keys = pd.MultiIndex.from_tuples([(row[0], row[1]) for row in part_rows])
 
-            self.connection.commit()
+                # Repeated keys in the frame update the row inserted by their first occurrence
+                update_mask = keys.isin(existing) | keys.duplicated(keep='first')
+                insert_rows = [row for row, update in zip(part_rows, update_mask) if not update]
+                update_rows = [row[2:] + row[:2] for row, update in zip(part_rows, update_mask) if update]
+
+                try:
+                    rows_inserted = self._execute_partition(cursor, insert_sql, insert_rows)
+                    rows_updated = self._execute_partition(cursor, update_sql, update_rows)
+                    self.connection.commit()
+                except Exception:
+                    self.connection.rollback()
+                    raise
+
+                # Later sub-batches of a bisected frame update the keys written here
+                existing.update(keys)
+                return rows_inserted, rows_updated
+
+            outcome = self.recovery.write(df, write)
             cursor.close()
+            if outcome.failed < outcome.size:
+                self.invalidate_cache(schema_name, table_name)
+                if self.stats_table:
+                    self.refresh_table_stats(schema_name, table_name, tickers=tickers)
 
-            self.logger.info(f'Successfully inserted {rows_inserted} rows and updated {rows_updated} rows in "{schema_name}"."{table_name}"')
-            return rows_inserted + rows_updated
+            for position, error in outcome.rejected:
+                row = df.iloc[position]
+                self.logger.warning(f"Error processing row ({row['Ticker']}, {row['Date']}): {error}")
+
+            self.logger.info(f'Successfully inserted {outcome.inserted} rows and updated {outcome.updated} rows in "{schema_name}"."{table_name}"')
+            return outcome.inserted + outcome.updated
 
         except Exception as e:
             self.logger.error(f"Error inserting data to HANA: {str(e)}")
             return 0
 
-    def get_table_stats(self, schema_name, table_name):
+    def _execute_partition(self, cursor, sql, rows):
+        """
+        Execute one statement for a partition of rows in a single round-trip.
+
+        Errors are raised to the caller, which rolls back the transaction.
+
+        Args:
+            cursor: Open DB-API cursor
+            sql (str): Parameterized statement
+            rows (list): Parameter tuples
+
+        Returns:
+            int: Number of rows written
+        """
+        if not rows:
+            return 0
+
+        cursor.executemany(sql, rows)
+        return len(rows)
+
+    @traced('hana.get_table_stats', category='hana')
+    def get_table_stats(self, schema_name, table_name, exact=False):
         """
         Get statistics about the data in the table.
 
+        Row count, ticker count and date range come from one aggregate
+        statement. With the summary table enabled they are read from its
+        one row per ticker instead of the stock table. Results are served
+        from the query cache until they expire or the table is written to.
+
         Args:
             schema_name (str): The schema name in SAP HANA
             table_name (str): The table name
+            exact (bool): Aggregate the stock table even if a summary table is kept
 
         Returns:
             dict: Statistics about the table
@@ -275,47 +1083,168 @@ class HanaClient:
             self.logger.error("No connection to SAP HANA.")
             return {}
 
-        try:
-            cursor = self.connection.cursor()
-
-            # Get total row count
-            cursor.execute(f"""
-            SELECT COUNT(*) FROM "{schema_name}"."{table_name}"
-            """)
-            total_rows = cursor.fetchone()[0]
-
-            # Get unique tickers count
-            cursor.execute(f"""
-            SELECT COUNT(DISTINCT "TICKER") FROM "{schema_name}"."{table_name}"
-            """)
-            unique_tickers = cursor.fetchone()[0]
-
-            # Get date range
-            cursor.execute(f"""
-            SELECT MIN("DATE"), MAX("DATE") FROM "{schema_name}"."{table_name}"
-            """)
-            date_range = cursor.fetchone()
-
-            cursor.close()
+        if self.stats_table and not exact:
+            query = f"""
+            SELECT COALESCE(SUM("ROW_COUNT"), 0), COUNT(*), MIN("MIN_DATE"), MAX("MAX_DATE")
+            FROM "{schema_name}"."{stats_table_name(table_name)}"
+            WHERE "ROW_COUNT" > 0
+            """
+        else:
+            query = f"""
+            SELECT COUNT(*), COUNT(DISTINCT "TICKER"), MIN("DATE"), MAX("DATE")
+            FROM "{schema_name}"."{table_name}"
+            """
 
-            stats = {
-                'total_rows': total_rows,
-                'unique_tickers': unique_tickers,
-                'min_date': str(date_range[0]) if date_range[0] else None,
-                'max_date': str(date_range[1]) if date_range[1] else None
+        def load():
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query)
+                total_rows, unique_tickers, min_date, max_date = cursor.fetchone()
+            finally:
+                cursor.close()
+
+            return {
+                'total_rows': int(total_rows),
+                'unique_tickers': int(unique_tickers),
+                'min_date': str(min_date) if min_date else None,
+                'max_date': str(max_date) if max_date else None
             }
 
+        try:
+            stats = self.query_cache.get_or_load(QueryCache.target(schema_name, table_name), query, (), load)
             self.logger.info(f"Table stats: {stats}")
             return stats
 
         except Exception as e:
+            if self.stats_table and not exact:
+                self.logger.warning(f"Could not read stats table, aggregating the table instead: {str(e)}")
+                return self.get_table_stats(schema_name, table_name, exact=True)
             self.logger.error(f"Error getting table stats: {str(e)}")
             return {}
 
+    def iter_query(self, schema_name, table_name, tickers=None, start_date=None, end_date=None,
+                   columns=None, chunk_size=50000, as_numpy=False, order=True):
+        """
+        Stream rows from the table as typed column chunks.
+
+        Ticker and date-range predicates and the column projection are part
+        of the SQL, and rows are paged with fetchmany, so at most chunk_size
+        rows are held as driver tuples at a time. Each page is transposed
+        column by column; no per-row dicts are built.
+
+        Args:
+            schema_name (str): The schema name in SAP HANA
+            table_name (str): The table name
+            tickers (iterable, optional): Only these tickers (queried
+                IN_LIST_CHUNK tickers per statement)
+            start_date, end_date (optional): Inclusive date range
+            columns (list, optional): HANA column names (default: all of QUERY_COLUMNS)
+            chunk_size (int): Rows per fetchmany page and yielded chunk
+            as_numpy (bool): Yield dicts of NumPy arrays instead of DataFrames
+            order (bool): Order by ticker and date
+
+        Yields:
+            DataFrame or dict: One chunk of rows with the QUERY_COLUMNS names and dtypes
+        """
+        if not self.connection:
+            self.logger.error("No connection to SAP HANA.")
+            return
+
+        columns = [col.upper() for col in (columns or QUERY_COLUMNS)]
+        unknown = [col for col in columns if col not in QUERY_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown}, expected some of {list(QUERY_COLUMNS)}")
+
+        # One statement per IN_LIST_CHUNK tickers; sorted so ordered results stay ordered overall
+        ticker_groups = [None]
+        if tickers is not None:
+            tickers = sorted(set(tickers))
+            if not tickers:
+                return
+            ticker_groups = [tickers[i:i + IN_LIST_CHUNK] for i in range(0, len(tickers), IN_LIST_CHUNK)]
+
+        dates = [value for value in (start_date, end_date) if value is not None]
+
+        cursor = self.connection.cursor()
+        try:
+            for group in ticker_groups:
+                sql = build_select_sql(schema_name, table_name, columns, len(group or ()),
+                                       start_date, end_date, order)
+                cursor.execute(sql, (*(group or ()), *dates))
+
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield self._result_chunk(rows, columns, as_numpy)
+
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _result_chunk(rows, columns, as_numpy):
+        """Transpose a fetchmany page into typed columns"""
+        arrays = {}
+        for col, values in zip(columns, zip(*rows)):
+            name, dtype = QUERY_COLUMNS[col]
+            arrays[name] = _result_column(values, dtype)
+
+        if as_numpy:
+            return arrays
+
+        df = pd.DataFrame(arrays)
+        if 'Ticker' in df.columns:
+            df['Ticker'] = df['Ticker'].astype('category')
+        return df
+
+    def query_frame(self, schema_name, table_name, tickers=None, start_date=None, end_date=None,
+                    columns=None, chunk_size=50000, order=True):
+        """
+        Gather iter_query chunks into one DataFrame.
+
+        Results are cached on the generated SELECT and its parameters until
+        they expire or the table is written to; iter_query itself always
+        reads from HANA.
+
+        Args:
+            schema_name (str): The schema name in SAP HANA
+            table_name (str): The table name
+            tickers, start_date, end_date, columns, chunk_size, order: As in iter_query
+
+        Returns:
+            DataFrame: All matching rows (empty if there are none)
+        """
+        columns = [col.upper() for col in (columns or QUERY_COLUMNS)]
+        if tickers is not None:
+            tickers = sorted(set(tickers))
+        dates = tuple(str(pd.Timestamp(value).date()) if value is not None else None
+                      for value in (start_date, end_date))
+
+        def load():
+            chunks = list(self.iter_query(schema_name, table_name, tickers=tickers, start_date=start_date,
+                                          end_date=end_date, columns=columns, chunk_size=chunk_size,
+                                          order=order))
+            if not chunks:
+                return pd.DataFrame(columns=[QUERY_COLUMNS[col][0] for col in columns])
+            return concat_frames(chunks)
+
+        if not self.connection:
+            return load()
+
+        sql = build_select_sql(schema_name, table_name, columns, len(tickers or ()), start_date, end_date, order)
+        return self.query_cache.get_or_load(
+            QueryCache.target(schema_name, table_name), sql,
+            (tuple(tickers) if tickers is not None else None, *dates), load
+        )
+
     def query_data(self, schema_name, table_name, limit=100):
         """
         Query data from the table.
 
+        For more than a preview use iter_query or query_frame, which filter
+        in SQL and return typed columns instead of one dict per row.
+        Results are cached like get_table_stats.
+
         Args:
             schema_name (str): The schema name in SAP HANA
             table_name (str): The table name
@@ -328,29 +1257,39 @@ class HanaClient:
             self.logger.error("No connection to SAP HANA.")
             return []
 
-        try:
-            cursor = self.connection.cursor()
-
-            query = f"""
-            SELECT "TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
-                   "VOLUME", "DAILY_RANGE", "DAILY_RETURN"
-            FROM "{schema_name}"."{table_name}"
-            ORDER BY "DATE" DESC, "TICKER"
-            LIMIT {limit}
-            """
-
-            cursor.execute(query)
-
-            columns = [desc[0] for desc in cursor.description]
-            results = []
-
-            for row in cursor.fetchall():
-                results.append(dict(zip(columns, row)))
+        query = f"""
+        SELECT "TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
+               "VOLUME", "DAILY_RANGE", "DAILY_RETURN"
+        FROM "{schema_name}"."{table_name}"
+        ORDER BY "DATE" DESC, "TICKER"
+        LIMIT {int(limit)}
+        """
 
-            cursor.close()
+        def load():
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query)
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
 
-            return results
+        try:
+            return self.query_cache.get_or_load(QueryCache.target(schema_name, table_name), query, (), load)
 
         except Exception as e:
             self.logger.error(f"Error querying data: {str(e)}")
             return []
+
+    def invalidate_cache(self, schema_name=None, table_name=None):
+        """
+        Drop cached read results after the table was written to.
+
+        Args:
+            schema_name (str, optional): The schema name in SAP HANA
+            table_name (str, optional): The table name (default: every table)
+        """
+        target = QueryCache.target(schema_name, table_name) if table_name else None
+        dropped = self.query_cache.invalidate(target)
+        if dropped:
+            self.logger.debug(f"Invalidated {dropped} cached results for {target or 'all tables'}")
@@ -0,0 +1,707 @@
+"""
+Load targets of the ETL pipeline behind one interface.
+
+HanaSink writes to SAP HANA through a HanaClient. SQLiteSink keeps one
+SQLite file per schema and ParquetSink one columnar file per ticker, so
+loads can be dry-run, replayed and compared without a HANA instance.
+"""
+
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from db.hana_client import (HANA_COLUMNS, bulk_merge_sql, dataframe_to_bind_rows, fetch_existing_keys,
+                            stats_merge_sql, ticker_stats_rows)
+from utils.columnar import PYARROW_AVAILABLE, is_columnar_file, read_frame, remove_frame, write_frame
+
+SINK_TYPES = ('hana', 'sqlite', 'parquet')
+
+# Stock frame column of every HANA column, in HANA_COLUMNS order
+FRAME_COLUMNS = dict(zip(HANA_COLUMNS, ['Ticker', 'Date', 'Open', 'High', 'Low', 'Close',
+                                        'Volume', 'Daily_Range', 'Daily_Return', 'Timestamp']))
+
+# Prefix of a Parquet partition directory, followed by the ticker
+PARTITION_PREFIX = "TICKER="
+
+
+class SerialWriterPool:
+    """
+    Writer pool of a sink with a single connection.
+
+    Concurrent writers take turns; the connection handed out is None, which
+    makes the sink write on its own connection.
+    """
+
+    max_size = 1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        with self._lock:
+            yield None
+
+    def close(self):
+        pass
+
+
+class Sink(ABC):
+    """
+    Interface of a load target.
+
+    upsert() writes and commits one batch keyed on (TICKER, DATE) or raises
+    after undoing it, so BatchRecovery can retry or bisect it. Reads return
+    plain values and raise on errors; the pipeline logs and falls back.
+    A sink missing one of the abstract methods fails when it is created.
+    """
+
+    name = "sink"
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._writer_pool = None
+
+    @property
+    def connected(self):
+        """Whether upsert() can write without a connection from writer_pool()"""
+        return True
+
+    def connect(self):
+        """Open the target, returning True on success"""
+        return True
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def create_schema_if_not_exists(self, schema_name):
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_table(self, schema_name, table_name):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_last_loaded_date(self, schema_name, table_name):
+        """Latest DATE in the table, or None when it is empty"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_ticker_watermarks(self, schema_name, table_name):
+        """Dictionary of ticker -> latest DATE"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def table_counts(self, schema_name, table_name):
+        """Tuple of (row count, latest DATE or None)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert(self, df, schema_name, table_name, connection=None):
+        """
+        Insert or update a batch and commit it.
+
+        Args:
+            df (DataFrame): Cleaned stock rows
+            schema_name (str): Target schema
+            table_name (str): Target table
+            connection (optional): Connection from writer_pool() to write on
+
+        Returns:
+            tuple: (inserted_count, updated_count)
+        """
+        raise NotImplementedError
+
+    def merge_staged(self, df, schema_name, table_name, batch_size):
+        """
+        Load a whole frame in one set-based step.
+
+        Sinks without a staging table upsert the frame in one commit.
+
+        Returns:
+            tuple: (staged_count, inserted_count, updated_count)
+        """
+        inserted, updated = self.upsert(df, schema_name, table_name)
+        return len(df), inserted, updated
+
+    @abstractmethod
+    def get_table_stats(self, schema_name, table_name):
+        """Dictionary with total_rows, unique_tickers, min_date and max_date, empty on error"""
+        raise NotImplementedError
+
+    def invalidate_cache(self, schema_name=None, table_name=None):
+        """Drop cached reads of a table after it was written to"""
+
+    def writer_pool(self):
+        """Pool handing out connections to concurrent batch writers"""
+        if self._writer_pool is None:
+            self._writer_pool = SerialWriterPool()
+        return self._writer_pool
+
+
+def _last_per_key(rows):
+    """Bind rows with one row per (TICKER, DATE) key, the last occurrence winning"""
+    return list({(row[0], row[1]): row for row in rows}.values())
+
+
+def _split_counts(batch_keys, existing):
+    """(inserted, updated) of a batch given the keys it already found in the table"""
+    updated = len(batch_keys & existing)
+    return len(batch_keys) - updated, updated
+
+
+class HanaSink(Sink):
+    """SAP HANA through a HanaClient, with array-bound MERGEs and pooled writers."""
+
+    name = "SAP HANA"
+
+    def __init__(self, client):
+        """
+        Args:
+            client: HanaClient, or any object with its connection, pool,
+                create_pool and table methods
+        """
+        super().__init__()
+        self.client = client
+
+        # Keep the client's per-ticker summary table current in the same transaction as each write
+        self.stats_table = bool(getattr(client, 'stats_table', False))
+
+    @property
+    def connected(self):
+        return bool(self.client.connection)
+
+    def connect(self):
+        return self.client.connect()
+
+    def close(self):
+        self.client.close()
+
+    def create_schema_if_not_exists(self, schema_name):
+        return self.client.create_schema_if_not_exists(schema_name)
+
+    def create_table(self, schema_name, table_name):
+        return self.client.create_table(schema_name, table_name)
+
+    def _fetch(self, query):
+        cursor = self.client.connection.cursor()
+        try:
+            cursor.execute(query)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def get_last_loaded_date(self, schema_name, table_name):
+        rows = self._fetch(f"""
+        SELECT MAX("DATE")
+        FROM "{schema_name}"."{table_name}"
+        """)
+        return rows[0][0] if rows else None
+
+    def get_ticker_watermarks(self, schema_name, table_name):
+        rows = self._fetch(f"""
+        SELECT "TICKER", MAX("DATE")
+        FROM "{schema_name}"."{table_name}"
+        GROUP BY "TICKER"
+        """)
+        return {ticker: last_date for ticker, last_date in rows if last_date is not None}
+
+    def table_counts(self, schema_name, table_name):
+        total_rows, max_date = self._fetch(f'SELECT COUNT(*), MAX("DATE") FROM "{schema_name}"."{table_name}"')[0]
+        return int(total_rows or 0), max_date
+
+    def upsert(self, df, schema_name, table_name, connection=None):
+        """
+        Write and commit a frame with a single array-bound MERGE.
+
+        The frame is converted to bind rows in one vectorized step and sent as
+        one executemany round-trip. A key repeated in the frame is sent once,
+        with the values of its last row, since MERGE rejects a source that
+        matches a target row twice. The existing (TICKER, DATE) keys are read
+        with one range query first and the inserted/updated split is taken
+        from them, not from the driver's row counts. With a summary table,
+        the new rows per ticker are merged into it before the same commit.
+        """
+        connection = connection or self.client.connection
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            rows = _last_per_key(dataframe_to_bind_rows(df, datetime.datetime.now()))
+
+            # Count keys that will be updated rather than inserted
+            batch_keys = {(row[0], row[1]) for row in rows}
+            dates = [key[1] for key in batch_keys if key[1] is not None]
+            existing = set()
+            if dates:
+                existing = fetch_existing_keys(
+                    cursor, schema_name, table_name,
+                    {key[0] for key in batch_keys}, min(dates), max(dates)
+                )
+
+            # Send the whole batch as one prepared statement
+            cursor.executemany(bulk_merge_sql(schema_name, table_name), rows)
+
+            if self.stats_table:
+                cursor.executemany(stats_merge_sql(schema_name, table_name), ticker_stats_rows(rows, existing))
+
+            connection.commit()
+            return _split_counts(batch_keys, existing)
+
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            raise
+
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+    def merge_staged(self, df, schema_name, table_name, batch_size):
+        """
+        Bulk-insert a frame into a per-run staging table created next to the
+        target, merge it with one MERGE ... USING statement and drop it.
+
+        The frame must not repeat a key, which MERGE rejects.
+        """
+        connection = self.client.connection
+        staging_table = f"{table_name}_STAGE_{datetime.datetime.now():%Y%m%d%H%M%S%f}"
+        quoted_staging = f'"{schema_name}"."{staging_table}"'
+        quoted_target = f'"{schema_name}"."{table_name}"'
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self.client.staging_table_schema.format(schema=schema_name, table=staging_table))
+            self.logger.info(f"Created staging table {quoted_staging}")
+
+            insert_sql = (
+                f"INSERT INTO {quoted_staging} ("
+                + ", ".join(f'"{col}"' for col in HANA_COLUMNS)
+                + ") VALUES (" + ", ".join("?" * len(HANA_COLUMNS)) + ")"
+            )
+            timestamp = datetime.datetime.now()
+            for i in range(0, len(df), batch_size):
+                cursor.executemany(insert_sql, dataframe_to_bind_rows(df.iloc[i:i + batch_size], timestamp))
+
+            # Staged rows and rows whose key already exists in one statement
+            cursor.execute(f"""
+            SELECT COUNT(*), COUNT(target."TICKER")
+            FROM {quoted_staging} AS source
+            LEFT JOIN {quoted_target} AS target
+            ON target."TICKER" = source."TICKER" AND target."DATE" = source."DATE"
+            """)
+            staged, matched = cursor.fetchone()
+
+            # New rows and date bounds per ticker, while the target still lacks the staged rows
+            if self.stats_table:
+                cursor.execute(stats_merge_sql(schema_name, table_name, source=f"""(
+                    SELECT source."TICKER", COUNT(*) - COUNT(target."TICKER") AS "ROW_COUNT",
+                           MIN(source."DATE") AS "MIN_DATE", MAX(source."DATE") AS "MAX_DATE"
+                    FROM {quoted_staging} AS source
+                    LEFT JOIN {quoted_target} AS target
+                    ON target."TICKER" = source."TICKER" AND target."DATE" = source."DATE"
+                    WHERE source."DATE" IS NOT NULL
+                    GROUP BY source."TICKER")"""))
+
+            cursor.execute(bulk_merge_sql(schema_name, table_name, source_table=staging_table))
+            merged = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else staged
+
+            connection.commit()
+
+            updated = min(matched, merged)
+            return staged, merged - updated, updated
+
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            raise
+
+        finally:
+            try:
+                cursor.execute(f"DROP TABLE {quoted_staging}")
+                connection.commit()
+            except Exception as drop_error:
+                self.logger.warning(f"Could not drop staging table {quoted_staging}: {str(drop_error)}")
+            cursor.close()
+
+    def get_table_stats(self, schema_name, table_name):
+        return self.client.get_table_stats(schema_name, table_name)
+
+    def invalidate_cache(self, schema_name=None, table_name=None):
+        invalidate = getattr(self.client, 'invalidate_cache', None)
+        if invalidate is not None:
+            invalidate(schema_name, table_name)
+
+    def writer_pool(self):
+        return self.client.pool or self.client.create_pool()
+
+
+class SQLiteSink(Sink):
+    """
+    SQLite files under a directory, one per schema, attached to one connection.
+
+    Dates and timestamps are stored as ISO text, which sorts like the dates.
+    Writers share the connection and take turns.
+    """
+
+    name = "SQLite"
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Directory holding one <schema>.db file per schema
+        """
+        super().__init__()
+        self.directory = Path(directory)
+        self.connection = None
+        self._lock = threading.RLock()
+
+        self.table_schema = """
+            CREATE TABLE IF NOT EXISTS "{schema}"."{table}" (
+                "TICKER" TEXT NOT NULL,
+                "DATE" TEXT NOT NULL,
+                "OPEN" REAL,
+                "HIGH" REAL,
+                "LOW" REAL,
+                "CLOSE" REAL,
+                "VOLUME" INTEGER,
+                "DAILY_RANGE" REAL,
+                "DAILY_RETURN" REAL,
+                "TIMESTAMP" TEXT,
+                PRIMARY KEY ("TICKER", "DATE")
+            ) WITHOUT ROWID
+        """
+
+    @property
+    def connected(self):
+        return self.connection is not None
+
+    def connect(self):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+            for path in sorted(self.directory.glob("*.db")):
+                self._attach(path.stem)
+            self.logger.info(f"Opened SQLite sink in {self.directory}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to open SQLite sink in {self.directory}: {str(e)}")
+            return False
+
+    def close(self):
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def _attach(self, schema_name):
+        attached = {row[1] for row in self.connection.execute("PRAGMA database_list")}
+        if schema_name not in attached:
+            self.connection.execute("ATTACH DATABASE ? AS " + f'"{schema_name}"',
+                                    (str(self.directory / f"{schema_name}.db"),))
+            self.connection.execute(f'PRAGMA "{schema_name}".journal_mode = WAL')
+            self.connection.execute(f'PRAGMA "{schema_name}".synchronous = NORMAL')
+
+    def create_schema_if_not_exists(self, schema_name):
+        try:
+            with self._lock:
+                self._attach(schema_name)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error creating SQLite schema {schema_name}: {str(e)}")
+            return False
+
+    def create_table(self, schema_name, table_name):
+        try:
+            with self._lock:
+                self._attach(schema_name)
+                self.connection.execute(self.table_schema.format(schema=schema_name, table=table_name))
+                self.connection.commit()
+            return True
+        except Exception as e:
+            self.logger.error(f"Error creating SQLite table {schema_name}.{table_name}: {str(e)}")
+            return False
+
+    def _fetch(self, query, params=()):
+        with self._lock:
+            return self.connection.execute(query, params).fetchall()
+
+    def get_last_loaded_date(self, schema_name, table_name):
+        value = self._fetch(f'SELECT MAX("DATE") FROM "{schema_name}"."{table_name}"')[0][0]
+        return datetime.date.fromisoformat(value) if value else None
+
+    def get_ticker_watermarks(self, schema_name, table_name):
+        rows = self._fetch(f'SELECT "TICKER", MAX("DATE") FROM "{schema_name}"."{table_name}" GROUP BY "TICKER"')
+        return {ticker: datetime.date.fromisoformat(last_date) for ticker, last_date in rows if last_date}
+
+    def table_counts(self, schema_name, table_name):
+        total_rows, max_date = self._fetch(f'SELECT COUNT(*), MAX("DATE") FROM "{schema_name}"."{table_name}"')[0]
+        return int(total_rows or 0), max_date
+
+    @staticmethod
+    def _bind_rows(df, timestamp):
+        """HANA bind rows with the date and timestamp as ISO text"""
+        stamp = timestamp.isoformat(sep=' ')
+        return [
+            (row[0], row[1].isoformat() if row[1] is not None else None) + row[2:9] + (stamp,)
+            for row in dataframe_to_bind_rows(df, timestamp)
+        ]
+
+    def upsert(self, df, schema_name, table_name, connection=None):
+        """Write and commit a frame with one executemany of INSERT ... ON CONFLICT DO UPDATE"""
+        rows = self._bind_rows(df, datetime.datetime.now())
+        batch_keys = {(row[0], row[1]) for row in rows}
+        dates = [key[1] for key in batch_keys if key[1] is not None]
+
+        update_set = ", ".join(f'"{col}" = excluded."{col}"' for col in HANA_COLUMNS[2:])
+        upsert_sql = (
+            f'INSERT INTO "{schema_name}"."{table_name}" ('
+            + ", ".join(f'"{col}"' for col in HANA_COLUMNS)
+            + ") VALUES (" + ", ".join("?" * len(HANA_COLUMNS)) + ") "
+            + f'ON CONFLICT ("TICKER", "DATE") DO UPDATE SET {update_set}'
+        )
+
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                existing = set()
+                if dates:
+                    existing = fetch_existing_keys(
+                        cursor, schema_name, table_name,
+                        {key[0] for key in batch_keys}, min(dates), max(dates)
+                    )
+                cursor.executemany(upsert_sql, rows)
+                self.connection.commit()
+                return _split_counts(batch_keys, existing)
+
+            except Exception:
+                self.connection.rollback()
+                raise
+
+            finally:
+                cursor.close()
+
+    def get_table_stats(self, schema_name, table_name):
+        try:
+            total_rows, unique_tickers, min_date, max_date = self._fetch(f"""
+            SELECT COUNT(*), COUNT(DISTINCT "TICKER"), MIN("DATE"), MAX("DATE")
+            FROM "{schema_name}"."{table_name}"
+            """)[0]
+        except Exception as e:
+            self.logger.error(f"Error getting table stats: {str(e)}")
+            return {}
+
+        stats = {
+            'total_rows': int(total_rows),
+            'unique_tickers': int(unique_tickers),
+            'min_date': min_date,
+            'max_date': max_date
+        }
+        self.logger.info(f"Table stats: {stats}")
+        return stats
+
+
+class ParquetSink(Sink):
+    """
+    One Parquet file per ticker under <directory>/<schema>/<table>/TICKER=<ticker>/.
+
+    Needs pyarrow; connect() raises ImportError without it rather than
+    writing another format under the Parquet name. Upserting a batch
+    rewrites the partitions of its tickers: the new file is written before
+    the old one is removed, and readers take the newest file of a
+    partition. Writers take turns.
+    """
+
+    name = "Parquet"
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Root directory of the schemas
+        """
+        super().__init__()
+        self.directory = Path(directory)
+        self._lock = threading.RLock()
+
+    def connect(self):
+        if not PYARROW_AVAILABLE:
+            self.logger.error("pyarrow package not installed. Cannot use the Parquet sink.")
+            raise ImportError("pyarrow package not installed (pip install pyarrow)")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.logger.info(f"Opened Parquet sink in {self.directory}")
+        return True
+
+    def _table_dir(self, schema_name, table_name):
+        return self.directory / schema_name / table_name
+
+    def create_schema_if_not_exists(self, schema_name):
+        (self.directory / schema_name).mkdir(parents=True, exist_ok=True)
+        return True
+
+    def create_table(self, schema_name, table_name):
+        self._table_dir(schema_name, table_name).mkdir(parents=True, exist_ok=True)
+        return True
+
+    @staticmethod
+    def _partition_file(partition):
+        """Newest columnar file of a partition directory, or None"""
+        files = sorted(path for path in partition.iterdir() if is_columnar_file(path))
+        return files[-1] if files else None
+
+    def _partitions(self, schema_name, table_name):
+        """ticker -> newest file of every partition of a table"""
+        table_dir = self._table_dir(schema_name, table_name)
+        if not table_dir.is_dir():
+            raise FileNotFoundError(f"Parquet table {table_dir} does not exist")
+
+        partitions = {}
+        for partition in sorted(table_dir.glob(f"{PARTITION_PREFIX}*")):
+            path = self._partition_file(partition)
+            if path is not None:
+                partitions[partition.name[len(PARTITION_PREFIX):]] = path
+        return partitions
+
+    def _dates(self, schema_name, table_name):
+        """ticker -> sorted datetime64 DATE values of every partition"""
+        with self._lock:
+            return {
+                ticker: np.sort(read_frame(path)['DATE'].to_numpy(dtype='datetime64[ns]'))
+                for ticker, path in self._partitions(schema_name, table_name).items()
+            }
+
+    def get_last_loaded_date(self, schema_name, table_name):
+        watermarks = self.get_ticker_watermarks(schema_name, table_name)
+        return max(watermarks.values()) if watermarks else None
+
+    def get_ticker_watermarks(self, schema_name, table_name):
+        return {
+            ticker: pd.Timestamp(dates[-1]).date()
+            for ticker, dates in self._dates(schema_name, table_name).items() if len(dates)
+        }
+
+    def table_counts(self, schema_name, table_name):
+        dates = self._dates(schema_name, table_name)
+        last_date = max((values[-1] for values in dates.values() if len(values)), default=None)
+        return sum(len(values) for values in dates.values()), pd.Timestamp(last_date).date() if last_date else None
+
+    @staticmethod
+    def _frame_rows(df, timestamp):
+        """A batch in the stored layout: HANA column names without TICKER, plus the ticker"""
+        stored = pd.DataFrame({
+            hana: (pd.to_numeric(df[column], errors='coerce').astype(np.float64)
+                   if column in df.columns else np.nan)
+            for hana, column in FRAME_COLUMNS.items() if hana not in ('TICKER', 'DATE', 'TIMESTAMP')
+        }, index=df.index)
+        stored.insert(0, 'DATE', pd.to_datetime(df['Date'], errors='coerce').astype('datetime64[ns]'))
+        stored['TIMESTAMP'] = pd.Timestamp(timestamp)
+        return stored, df['Ticker'].astype(str).to_numpy()
+
+    def upsert(self, df, schema_name, table_name, connection=None):
+        """Merge a batch into the partitions of its tickers, later rows winning on repeated dates"""
+        stored, tickers = self._frame_rows(df, datetime.datetime.now())
+        undated = int(stored['DATE'].isna().sum())
+        if undated:
+            raise ValueError(f"{undated} rows without a DATE")
+        inserted = updated = 0
+
+        with self._lock:
+            table_dir = self._table_dir(schema_name, table_name)
+            for ticker, rows in stored.groupby(tickers, sort=False):
+                rows = rows.drop_duplicates(subset=['DATE'], keep='last')
+                partition = table_dir / f"{PARTITION_PREFIX}{ticker}"
+                partition.mkdir(parents=True, exist_ok=True)
+                previous = self._partition_file(partition)
+
+                matched = 0
+                merged = rows
+                if previous is not None:
+                    current = read_frame(previous)
+                    matched = int(np.isin(rows['DATE'].to_numpy(), current['DATE'].to_numpy()).sum())
+                    merged = pd.concat([current, rows], ignore_index=True).drop_duplicates(subset=['DATE'],
+                                                                                          keep='last')
+
+                merged = merged.sort_values('DATE').reset_index(drop=True)
+                write_frame(partition / f"data-{time.time_ns():020d}", merged)
+                if previous is not None:
+                    remove_frame(previous)
+
+                inserted += len(rows) - matched
+                updated += matched
+
+        return inserted, updated
+
+    def get_table_stats(self, schema_name, table_name):
+        try:
+            dates = self._dates(schema_name, table_name)
+        except Exception as e:
+            self.logger.error(f"Error getting table stats: {str(e)}")
+            return {}
+
+        present = [values for values in dates.values() if len(values)]
+        stats = {
+            'total_rows': sum(len(values) for values in present),
+            'unique_tickers': len(present),
+            'min_date': str(pd.Timestamp(min(values[0] for values in present)).date()) if present else None,
+            'max_date': str(pd.Timestamp(max(values[-1] for values in present)).date()) if present else None
+        }
+        self.logger.info(f"Table stats: {stats}")
+        return stats
+
+    def read_table(self, schema_name, table_name):
+        """
+        Read a whole table back as one frame with the HANA column names.
+
+        Returns:
+            DataFrame: TICKER, DATE, ... TIMESTAMP, sorted by ticker and date
+        """
+        with self._lock:
+            frames = []
+            for ticker, path in self._partitions(schema_name, table_name).items():
+                frame = read_frame(path)
+                frame.insert(0, 'TICKER', ticker)
+                frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=HANA_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+
+def as_sink(target):
+    """Use a Sink as is and wrap a HanaClient (or a stand-in for one) in a HanaSink."""
+    return target if isinstance(target, Sink) else HanaSink(target)
+
+
+def create_sink(config):
+    """
+    Open the local sink selected by etl.sink.
+
+    Args:
+        config (dict): Configuration; etl.sink_dir (default: <data_dir>/<sink>)
+            holds the files
+
+    Returns:
+        Sink: SQLiteSink or ParquetSink, or None for 'hana', whose HanaClient
+            is created by the caller
+    """
+    sink_type = config.get('etl', {}).get('sink', 'hana')
+    if sink_type not in SINK_TYPES:
+        raise ValueError(f"Unknown sink '{sink_type}', expected one of {SINK_TYPES}")
+    if sink_type == 'hana':
+        return None
+
+    directory = config.get('etl', {}).get('sink_dir') or os.path.join(
+        config.get('paths', {}).get('data_dir', 'data'), sink_type)
+    return SQLiteSink(directory) if sink_type == 'sqlite' else ParquetSink(directory)
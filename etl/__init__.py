@@ -3,5 +3,7 @@ ETL Pipeline Package
 """
 
 from .pipeline import ETLPipeline, ETLMetrics, DataQualityValidator
+from .batching import AdaptiveBatchSizer
+from .recovery import BatchRecovery
 
-__all__ = ['ETLPipeline', 'ETLMetrics', 'DataQualityValidator']
+__all__ = ['ETLPipeline', 'ETLMetrics', 'DataQualityValidator', 'AdaptiveBatchSizer', 'BatchRecovery']
@@ -0,0 +1,109 @@
+"""
+Adaptive batch sizing for HANA writes
+"""
+
+import logging
+from typing import Optional
+
+
+class AdaptiveBatchSizer:
+    """
+    Feedback controller that sizes the next batch from measured commit latency
+
+    The per-row latency of committed batches is smoothed with an exponential
+    moving average and the next batch is sized so that it should take about
+    target_seconds. Growth is capped per step, failures halve the size, and a
+    backoff delay is only requested when a batch was much slower than target.
+    """
+
+    def __init__(self, initial_size: int = 1000, min_size: int = 100, max_size: int = 20000,
+                 target_seconds: float = 1.0, enabled: bool = True,
+                 max_growth: float = 2.0, smoothing: float = 0.3, slow_factor: float = 2.0,
+                 max_backoff_seconds: float = 5.0):
+        """
+        Initialize the controller
+
+        Args:
+            initial_size: Size of the first batch
+            min_size: Smallest batch the controller will choose
+            max_size: Largest batch the controller will choose
+            target_seconds: Desired write + commit latency per batch
+            enabled: When False the controller always returns initial_size
+            max_growth: Maximum growth factor between consecutive batches
+            smoothing: EWMA weight of the newest latency sample
+            slow_factor: Latency multiple of target that triggers a backoff delay
+            max_backoff_seconds: Upper bound for a backoff delay
+        """
+        self.logger = logging.getLogger(__name__)
+        self.min_size = max(1, int(min_size))
+        self.max_size = max(self.min_size, int(max_size))
+        self.target_seconds = target_seconds
+        self.enabled = enabled
+        self.max_growth = max_growth
+        self.smoothing = smoothing
+        self.slow_factor = slow_factor
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self.size = int(initial_size)
+        if enabled:
+            self.size = min(max(self.size, self.min_size), self.max_size)
+        self.seconds_per_row: Optional[float] = None
+        self._backoff = 0.0
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'AdaptiveBatchSizer':
+        """Build a controller from the 'etl' section of load_config()"""
+        etl = config.get('etl', {})
+        return cls(
+            initial_size=etl.get('batch_size', 1000),
+            min_size=etl.get('batch_min_size', 100),
+            max_size=etl.get('batch_max_size', 20000),
+            target_seconds=etl.get('batch_target_seconds', 1.0),
+            enabled=etl.get('adaptive_batching', True)
+        )
+
+    def next_size(self) -> int:
+        """Return the number of rows to put in the next batch"""
+        return self.size
+
+    def backoff_seconds(self) -> float:
+        """Return the delay to apply before the next batch (0 unless HANA was slow)"""
+        return self._backoff
+
+    def record(self, rows: int, seconds: float, failed: int = 0):
+        """
+        Feed back the outcome of a committed batch
+
+        Args:
+            rows: Rows in the batch
+            seconds: Measured write + commit latency
+            failed: Rows that failed in the batch
+        """
+        if not self.enabled or rows <= 0:
+            return
+
+        sample = seconds / rows
+        if self.seconds_per_row is None:
+            self.seconds_per_row = sample
+        else:
+            self.seconds_per_row = self.smoothing * sample + (1 - self.smoothing) * self.seconds_per_row
+
+        if seconds > self.target_seconds * self.slow_factor:
+            self._backoff = min(seconds - self.target_seconds, self.max_backoff_seconds)
+        else:
+            self._backoff = 0.0
+
+        if failed:
+            # Errors shrink the batch regardless of latency
+            proposed = self.size // 2
+        elif self.seconds_per_row > 0:
+            proposed = int(self.target_seconds / self.seconds_per_row)
+            proposed = min(proposed, int(self.size * self.max_growth))
+        else:
+            proposed = int(self.size * self.max_growth)
+
+        new_size = min(max(proposed, self.min_size), self.max_size)
+        if new_size != self.size:
+            self.logger.debug(f"Batch size {self.size} -> {new_size} "
+                              f"(last batch {rows} rows in {seconds:.3f}s, {failed} failed)")
+        self.size = new_size
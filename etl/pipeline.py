@@ -3,18 +3,149 @@ Advanced ETL Pipeline for Kaggle to SAP HANA
 Includes incremental loading, batch processing, monitoring, and data quality checks
 """
 
+import asyncio
+import itertools
 import logging
+import threading
 import time
 import json
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+import numpy as np
 import pandas as pd
 
+from db.sinks import as_sink
+from etl.batching import AdaptiveBatchSizer
+from etl.profiling import StageProfiler
+from etl.quarantine import (
+    REASON_DUPLICATE, REASON_HIGH_BELOW_LOW, REASON_INVALID_DATE, REASON_INVALID_PRICE,
+    REASON_WRITE_ERROR, REPLAYABLE_REASONS, new_quarantine, read_quarantine, strip_quarantine_columns
+)
+from etl.recovery import BatchOutcome, BatchRecovery
+from etl.state import RunStateStore, frame_fingerprint
+from etl.streaming import StreamingExecutor
+from etl.telemetry import frame_bytes, latency_summary, peak_rss_bytes, traced_peak_bytes
+from utils.schema import concat_frames
+from utils.tracing import span, traced
+
+LOAD_MODES = ('merge', 'staging')
+EXECUTION_MODES = ('batch', 'streaming')
+
+
+def _merge_intervals(intervals: List[tuple]) -> List[tuple]:
+    """Union of (start, end) intervals as sorted, disjoint intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlap_seconds(a: List[tuple], b: List[tuple]) -> float:
+    """Length of the intersection of two disjoint interval lists"""
+    return sum(max(0.0, min(a_end, b_end) - max(a_start, b_start))
+               for a_start, a_end in a for b_start, b_end in b)
+
+
+def watermark_bounds(df: pd.DataFrame, watermarks: Dict[str, datetime]) -> tuple:
+    """
+    Watermark of every row's ticker, and the rows after it
+
+    Returns:
+        tuple: (boolean mask of rows after their ticker's watermark or of a
+            ticker without one, per-ticker watermarks as datetime64 with NaT
+            for the frame's tickers without one)
+    """
+    # One lookup per distinct ticker, then broadcast through the codes;
+    # code -1 (missing ticker) picks the trailing NaT and keeps the row
+    codes, tickers = pd.factorize(df['Ticker'])
+    known = pd.Series(watermarks, dtype=object)
+    known.index = known.index.astype(str)
+    per_ticker = pd.to_datetime(known.reindex(np.asarray(tickers).astype(str))).to_numpy(dtype='datetime64[ns]')
+    bounds = np.append(per_ticker, np.datetime64('NaT', 'ns'))[codes]
+
+    dates = df['Date'].to_numpy(dtype='datetime64[ns]')
+    return np.isnat(bounds) | (dates > bounds), per_ticker
+
+
+def carry_last_keys(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Hold the rows at each ticker's last date of a chunk back to the next chunk
+
+    A (Ticker, Date) key repeated across a chunk boundary then reaches
+    validation within one chunk, which keeps its last row and counts the
+    other as a duplicate, as a batch run over the whole frame does. Like
+    the carried closes of the chunked reader, this assumes date order within
+    each ticker; at most one date per ticker is held back at a time.
+    """
+    held = None
+    for chunk in chunks:
+        if held is not None and len(held):
+            chunk = concat_frames([held, chunk])
+
+        last_dates = chunk.groupby('Ticker', observed=True)['Date'].transform('max')
+        at_last = (chunk['Date'] == last_dates).to_numpy()
+        held = chunk[at_last].copy()
+        if not at_last.all():
+            yield chunk[~at_last]
+
+    if held is not None and len(held):
+        yield held
+
+
+def stage_savings(timings: Dict[str, List[tuple]]) -> Dict[str, Dict[str, float]]:
+    """
+    Busy time per stage and the part of it saved by running concurrently
+
+    A stage saves the time it overlaps with stages that started before it,
+    plus the overlap between its own concurrent calls (parallel batches).
+    The savings add up to the total busy time minus the elapsed time.
+
+    Args:
+        timings: stage name -> (start, end) offsets of each call in seconds
+
+    Returns:
+        dict: stage name -> seconds busy, wall seconds, seconds saved,
+            first start and last end
+    """
+    stages = {}
+    covered = []
+    for name, intervals in sorted(timings.items(), key=lambda item: min(start for start, _ in item[1])):
+        own = _merge_intervals(intervals)
+        busy = sum(end - start for start, end in intervals)
+        wall = sum(end - start for start, end in own)
+        stages[name] = {
+            'calls': len(intervals),
+            'seconds': round(busy, 3),
+            'wall_seconds': round(wall, 3),
+            'saved_seconds': round(busy - wall + _overlap_seconds(own, covered), 3),
+            'started': round(own[0][0], 3),
+            'finished': round(own[-1][1], 3)
+        }
+        covered = _merge_intervals(covered + own)
+    return stages
+
 
 class ETLMetrics:
     """Track ETL process metrics and statistics"""
 
-    def __init__(self):
+    # Messages kept per list; later ones are only counted in the summaries
+    MAX_MESSAGES = 100
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Initialize empty metrics
+
+        Args:
+            trace_memory: Trace Python allocations with tracemalloc between
+                start() and stop() to report their peak (slows the run down)
+        """
         self.start_time = None
         self.end_time = None
         self.rows_fetched = 0
@@ -24,14 +155,90 @@ class ETLMetrics:
         self.rows_failed = 0
         self.errors = []
         self.warnings = []
+        self.error_counts = {}
+        self.warning_counts = {}
+        self.quarantine = {}
+        self.batches = []
+        self.stages = {}
+        self.memory = {}
+        self.parse = {}
+        self.run = {}
+        self.timings = {}
+        self.peak_memory = {}
+        self.skipped = False
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+        self._lock = threading.Lock()
 
     def start(self):
         """Start timing the ETL process"""
         self.start_time = datetime.now()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
 
     def stop(self):
-        """Stop timing the ETL process"""
+        """Stop timing the ETL process and record the peak memory"""
         self.end_time = datetime.now()
+        self.peak_memory = self._memory_peaks()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @staticmethod
+    def _memory_peaks() -> Dict[str, int]:
+        """Peak RSS of the process and, when tracing, peak traced Python memory"""
+        peaks = {'rss_bytes': peak_rss_bytes(), 'traced_bytes': traced_peak_bytes()}
+        return {name: value for name, value in peaks.items() if value is not None}
+
+    @contextmanager
+    def timed(self, stage: str):
+        """
+        Time a block as one call of a stage
+
+        The yielded dict takes the 'rows' and 'bytes' the block processed.
+        """
+        volume = {'rows': 0, 'bytes': 0}
+        started = time.perf_counter()
+        try:
+            yield volume
+        finally:
+            self.record_stage(stage, time.perf_counter() - started, volume['rows'], volume['bytes'])
+
+    def record_stage(self, stage: str, seconds: float, rows: int = 0, nbytes: int = 0):
+        """
+        Add one call of a stage to its busy time and volume
+
+        The peak memory of the process when the call ended is kept per stage,
+        so the stage that raised the high-water mark can be told apart.
+        """
+        peaks = self._memory_peaks()
+        with self._lock:
+            timing = self.timings.setdefault(stage, {'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0})
+            timing['calls'] += 1
+            timing['seconds'] += seconds
+            timing['rows'] += int(rows)
+            timing['bytes'] += int(nbytes)
+            for name, value in peaks.items():
+                timing[f"peak_{name}"] = max(timing.get(f"peak_{name}", 0), value)
+
+    def stage_timings(self) -> Dict[str, Dict[str, Any]]:
+        """Busy seconds, volume and throughput per stage, in the order the stages first ran"""
+        with self._lock:
+            timings = {stage: dict(timing) for stage, timing in self.timings.items()}
+
+        for timing in timings.values():
+            seconds = timing['seconds']
+            timing['seconds'] = round(seconds, 4)
+            timing['rows_per_second'] = round(timing['rows'] / seconds, 1) if seconds > 0 else None
+            timing['bytes_per_second'] = round(timing['bytes'] / seconds, 1) if seconds > 0 else None
+        return timings
+
+    def batch_latency(self) -> Dict[str, Any]:
+        """p50/p95/p99 and histogram of the batch write latencies"""
+        with self._lock:
+            seconds = [batch['seconds'] for batch in self.batches]
+        return latency_summary(seconds)
 
     def duration_seconds(self):
         """Calculate duration in seconds"""
@@ -39,19 +246,48 @@ class ETLMetrics:
             return (self.end_time - self.start_time).total_seconds()
         return 0
 
-    def add_error(self, error_msg: str):
-        """Add an error message"""
-        self.errors.append({
-            'timestamp': datetime.now().isoformat(),
-            'message': error_msg
-        })
-
-    def add_warning(self, warning_msg: str):
-        """Add a warning message"""
-        self.warnings.append({
-            'timestamp': datetime.now().isoformat(),
-            'message': warning_msg
-        })
+    def add_error(self, error_msg: str, code: str = 'ERROR'):
+        """Add an error message, counted under its code"""
+        with self._lock:
+            self.error_counts[code] = self.error_counts.get(code, 0) + 1
+            if len(self.errors) < self.MAX_MESSAGES:
+                self.errors.append({
+                    'timestamp': datetime.now().isoformat(),
+                    'code': code,
+                    'message': error_msg
+                })
+
+    def add_warning(self, warning_msg: str, code: str = 'WARNING'):
+        """Add a warning message, counted under its code"""
+        with self._lock:
+            self.warning_counts[code] = self.warning_counts.get(code, 0) + 1
+            if len(self.warnings) < self.MAX_MESSAGES:
+                self.warnings.append({
+                    'timestamp': datetime.now().isoformat(),
+                    'code': code,
+                    'message': warning_msg
+                })
+
+    def errors_count(self) -> int:
+        """Number of errors, including those beyond MAX_MESSAGES"""
+        return sum(self.error_counts.values())
+
+    def warnings_count(self) -> int:
+        """Number of warnings, including those beyond MAX_MESSAGES"""
+        return sum(self.warning_counts.values())
+
+    def record_batch(self, batch_num: int, rows: int, seconds: float,
+                     inserted: int, updated: int, failed: int):
+        """Record the chosen size and measured latency of a written batch"""
+        with self._lock:
+            self.batches.append({
+                'batch': batch_num,
+                'rows': rows,
+                'seconds': round(seconds, 4),
+                'inserted': inserted,
+                'updated': updated,
+                'failed': failed
+            })
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert metrics to dictionary"""
@@ -59,16 +295,28 @@ class ETLMetrics:
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'duration_seconds': self.duration_seconds(),
+            'skipped': self.skipped,
             'rows_fetched': self.rows_fetched,
             'rows_validated': self.rows_validated,
             'rows_inserted': self.rows_inserted,
             'rows_updated': self.rows_updated,
             'rows_failed': self.rows_failed,
             'success_rate': round((self.rows_inserted + self.rows_updated) / max(self.rows_fetched, 1) * 100, 2),
-            'errors_count': len(self.errors),
-            'warnings_count': len(self.warnings),
+            'errors_count': self.errors_count(),
+            'warnings_count': self.warnings_count(),
+            'error_summary': dict(self.error_counts),
+            'warning_summary': dict(self.warning_counts),
             'errors': self.errors,
-            'warnings': self.warnings
+            'warnings': self.warnings,
+            'quarantine': self.quarantine,
+            'batches': sorted(self.batches, key=lambda batch: batch['batch']),
+            'stages': self.stages,
+            'timings': self.stage_timings(),
+            'batch_latency': self.batch_latency(),
+            'peak_memory': self.peak_memory,
+            'memory': self.memory,
+            'parse': self.parse,
+            'run': self.run
         }
 
     def log_summary(self, logger: logging.Logger):
@@ -83,77 +331,202 @@ class ETLMetrics:
         logger.info(f"Rows Updated: {self.rows_updated}")
         logger.info(f"Rows Failed: {self.rows_failed}")
         logger.info(f"Success Rate: {(self.rows_inserted + self.rows_updated) / max(self.rows_fetched, 1) * 100:.2f}%")
-        logger.info(f"Errors: {len(self.errors)}")
-        logger.info(f"Warnings: {len(self.warnings)}")
+        logger.info(f"Errors: {self.errors_count()}")
+        logger.info(f"Warnings: {self.warnings_count()}")
+        for stage, timing in self.stage_timings().items():
+            throughput = f", {timing['rows_per_second']:.0f} rows/s" if timing['rows_per_second'] else ""
+            logger.info(f"Stage {stage}: {timing['seconds']:.2f}s in {timing['calls']} calls{throughput}")
+        latency = self.batch_latency()
+        if latency:
+            logger.info(f"Batch latency: p50 {latency['p50']:.3f}s, p95 {latency['p95']:.3f}s, "
+                        f"p99 {latency['p99']:.3f}s over {latency['count']} batches")
+        if 'rss_bytes' in self.peak_memory:
+            logger.info(f"Peak RSS: {self.peak_memory['rss_bytes'] / 1048576:.1f} MB")
         logger.info("=" * 80)
 
 
 class DataQualityValidator:
     """Validate data quality before insertion"""
 
-    def __init__(self, logger: logging.Logger):
+    PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+    NON_NEGATIVE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+    def __init__(self, logger: logging.Logger, sample_size: int = 20, quarantine=None):
+        """
+        Initialize the validator
+
+        Args:
+            logger: Logger for data quality warnings
+            sample_size: Maximum number of offending rows reported per rule
+            quarantine: Quarantine receiving the rows removed by cleaning
+        """
         self.logger = logger
+        self.sample_size = sample_size
+        self.quarantine = quarantine
 
-    def validate_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _evaluate(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
-        Validate DataFrame data quality
+        Compute every rule mask in one pass over the frame's NumPy arrays
 
         Returns:
-            dict: Validation results with issues found
+            dict: Boolean masks and counts used by validation and cleaning
         """
+        n = len(df)
+        has_keys = 'Ticker' in df.columns and 'Date' in df.columns
+        masks = {}
+
+        # One hash pass over the keys gives both duplicate masks
+        if has_keys and n:
+            codes = df.groupby(['Ticker', 'Date'], sort=False, dropna=False, observed=True).ngroup().to_numpy()
+            counts = np.bincount(codes)
+            last_position = np.full(len(counts), -1, dtype=np.int64)
+            np.maximum.at(last_position, codes, np.arange(n))
+            masks['duplicate'] = counts[codes] > 1
+            masks['superseded'] = last_position[codes] != np.arange(n)
+        else:
+            masks['duplicate'] = np.zeros(n, dtype=bool)
+            masks['superseded'] = np.zeros(n, dtype=bool)
+
+        missing = df.isna().to_numpy()
+        missing_counts = dict(zip(df.columns, missing.sum(axis=0).tolist()))
+
+        if 'Date' in df.columns:
+            masks['invalid_date'] = missing[:, df.columns.get_loc('Date')]
+        else:
+            masks['invalid_date'] = np.zeros(n, dtype=bool)
+
+        values = {
+            col: pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            for col in self.NON_NEGATIVE_COLUMNS if col in df.columns
+        }
+
+        negative_counts = {col: int((values[col] < 0).sum()) for col in values}
+
+        # Comparisons with NaN are False, so NaN prices fail the > 0 and >= checks
+        price_ok = np.ones(n, dtype=bool)
+        for col in self.PRICE_COLUMNS:
+            if col in values:
+                price_ok &= values[col] > 0
+
+        if 'High' in values and 'Low' in values:
+            masks['high_below_low'] = values['High'] < values['Low']
+            high_low_ok = values['High'] >= values['Low']
+        else:
+            masks['high_below_low'] = np.zeros(n, dtype=bool)
+            high_low_ok = np.ones(n, dtype=bool)
+
+        masks['invalid_price'] = ~price_ok
+        masks['high_low_invalid'] = ~high_low_ok
+        masks['keep'] = ~masks['superseded'] & ~masks['invalid_date'] & price_ok & high_low_ok
+
+        return {
+            'masks': masks,
+            'missing_counts': missing_counts,
+            'negative_counts': negative_counts
+        }
+
+    def _sample(self, df: pd.DataFrame, mask: np.ndarray) -> list:
+        """Return up to sample_size offending rows as JSON-friendly dicts"""
+        positions = np.flatnonzero(mask)[:self.sample_size]
+        columns = [col for col in ('Ticker', 'Date', 'Open', 'High', 'Low', 'Close') if col in df.columns]
+        return df.iloc[positions][columns].astype(str).to_dict('records')
+
+    def _report(self, df: pd.DataFrame, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the validation result and log the issues found"""
+        masks = evaluation['masks']
         issues = {
-            'duplicates': [],
+            'duplicates': int(masks['duplicate'].sum()),
             'missing_values': {},
-            'invalid_dates': [],
+            'invalid_dates': int(masks['invalid_date'].sum()),
             'invalid_numbers': [],
-            'outliers': []
+            'outliers': int(masks['high_below_low'].sum()),
+            'samples': {}
         }
 
-        # Check for duplicates
-        if 'Ticker' in df.columns and 'Date' in df.columns:
-            duplicates = df[df.duplicated(subset=['Ticker', 'Date'], keep=False)]
-            if len(duplicates) > 0:
-                issues['duplicates'] = duplicates[['Ticker', 'Date']].to_dict('records')
-                self.logger.warning(f"Found {len(duplicates)} duplicate records")
-
-        # Check for missing values
-        for col in df.columns:
-            missing_count = df[col].isna().sum()
+        if issues['duplicates']:
+            issues['samples']['duplicates'] = self._sample(df, masks['duplicate'])
+            self.logger.warning(f"Found {issues['duplicates']} duplicate records")
+
+        for col, missing_count in evaluation['missing_counts'].items():
             if missing_count > 0:
                 issues['missing_values'][col] = int(missing_count)
                 self.logger.warning(f"Column '{col}' has {missing_count} missing values")
 
-        # Validate dates
-        if 'Date' in df.columns:
-            invalid_dates = df[df['Date'].isna()]
-            if len(invalid_dates) > 0:
-                issues['invalid_dates'] = len(invalid_dates)
-                self.logger.warning(f"Found {len(invalid_dates)} invalid dates")
-
-        # Validate numeric columns
-        numeric_cols = ['Open', 'High', 'Low', 'Close', 'Volume', 'Daily_Range', 'Daily_Return']
-        for col in numeric_cols:
-            if col in df.columns:
-                # Check for negative values where they shouldn't be
-                if col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-                    invalid = df[df[col] < 0]
-                    if len(invalid) > 0:
-                        issues['invalid_numbers'].append({
-                            'column': col,
-                            'count': len(invalid),
-                            'reason': 'negative_values'
-                        })
-                        self.logger.warning(f"Column '{col}' has {len(invalid)} negative values")
-
-        # Check for price outliers (High < Low shouldn't happen)
-        if 'High' in df.columns and 'Low' in df.columns:
-            outliers = df[df['High'] < df['Low']]
-            if len(outliers) > 0:
-                issues['outliers'] = len(outliers)
-                self.logger.warning(f"Found {len(outliers)} records where High < Low")
+        if issues['invalid_dates']:
+            issues['samples']['invalid_dates'] = self._sample(df, masks['invalid_date'])
+            self.logger.warning(f"Found {issues['invalid_dates']} invalid dates")
+
+        for col, negative_count in evaluation['negative_counts'].items():
+            if negative_count > 0:
+                issues['invalid_numbers'].append({
+                    'column': col,
+                    'count': negative_count,
+                    'reason': 'negative_values'
+                })
+                self.logger.warning(f"Column '{col}' has {negative_count} negative values")
+
+        if issues['outliers']:
+            issues['samples']['outliers'] = self._sample(df, masks['high_below_low'])
+            self.logger.warning(f"Found {issues['outliers']} records where High < Low")
 
         return issues
 
+    def _apply(self, df: pd.DataFrame, evaluation: Dict[str, Any],
+               quarantine_after: Optional[Dict[str, datetime]] = None) -> pd.DataFrame:
+        """Return the rows that pass every rule"""
+        masks = evaluation['masks']
+        original_count = len(df)
+
+        duplicates_removed = int(masks['superseded'].sum())
+        if duplicates_removed > 0:
+            self.logger.info(f"Removed {duplicates_removed} duplicate records")
+
+        if masks['keep'].all():
+            return df
+
+        if self.quarantine is not None:
+            self._quarantine_removed(df, masks, quarantine_after)
+
+        df = df[masks['keep']]
+
+        total_removed = original_count - len(df)
+        self.logger.info(f"Cleaned data: removed {total_removed} invalid records ({original_count} -> {len(df)})")
+
+        return df
+
+    def _quarantine_removed(self, df: pd.DataFrame, masks: Dict[str, np.ndarray],
+                            quarantine_after: Optional[Dict[str, datetime]] = None):
+        """
+        Quarantine removed rows under the first rule each one failed
+
+        With watermarks, rows at or before their ticker's watermark were
+        already seen by an earlier run of the same source and are left out,
+        so re-reading an unchanged file does not quarantine them again.
+        """
+        remaining = ~masks['keep']
+        if quarantine_after and 'Ticker' in df.columns and 'Date' in df.columns:
+            remaining &= watermark_bounds(df, quarantine_after)[0]
+        for reason, mask in ((REASON_DUPLICATE, masks['superseded']),
+                             (REASON_INVALID_DATE, masks['invalid_date']),
+                             (REASON_INVALID_PRICE, masks['invalid_price']),
+                             (REASON_HIGH_BELOW_LOW, masks['high_low_invalid'])):
+            rows = remaining & mask
+            if rows.any():
+                self.quarantine.add(df[rows], reason)
+                remaining &= ~rows
+
+    @traced('validator.validate_dataframe', category='validate')
+    def validate_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Validate DataFrame data quality
+
+        Returns:
+            dict: Counts per rule, missing values per column and a capped
+                sample of offending rows under 'samples'
+        """
+        return self._report(df, self._evaluate(df))
+
+    @traced('validator.clean_dataframe', category='validate')
     def clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Clean DataFrame by removing invalid records
@@ -164,63 +537,104 @@ class DataQualityValidator:
         Returns:
             Cleaned DataFrame
         """
-        original_count = len(df)
-
-        # Remove duplicates
-        if 'Ticker' in df.columns and 'Date' in df.columns:
-            df = df.drop_duplicates(subset=['Ticker', 'Date'], keep='last')
-            removed = original_count - len(df)
-            if removed > 0:
-                self.logger.info(f"Removed {removed} duplicate records")
+        return self._apply(df, self._evaluate(df))
 
-        # Remove records with invalid dates
-        if 'Date' in df.columns:
-            df = df[df['Date'].notna()]
-
-        # Remove records with invalid prices (negative values)
-        price_cols = ['Open', 'High', 'Low', 'Close']
-        for col in price_cols:
-            if col in df.columns:
-                df = df[df[col] > 0]
+    @traced('validator.validate_and_clean', category='validate')
+    def validate_and_clean(self, df: pd.DataFrame, clean_only_on_issues: bool = True,
+                           quarantine_after: Optional[Dict[str, datetime]] = None) -> tuple:
+        """
+        Validate and clean a DataFrame from a single evaluation of the rules
 
-        # Remove records where High < Low
-        if 'High' in df.columns and 'Low' in df.columns:
-            df = df[df['High'] >= df['Low']]
+        Args:
+            df: Input DataFrame
+            clean_only_on_issues: Only drop rows when duplicates, invalid dates
+                or High < Low rows were found (the pipeline's historic trigger)
+            quarantine_after: Per-ticker watermarks; only removed rows after
+                them are quarantined (default: every removed row)
 
-        final_count = len(df)
-        total_removed = original_count - final_count
+        Returns:
+            Tuple of (cleaned DataFrame, validation issues)
+        """
+        evaluation = self._evaluate(df)
+        issues = self._report(df, evaluation)
 
-        if total_removed > 0:
-            self.logger.info(f"Cleaned data: removed {total_removed} invalid records ({original_count} -> {final_count})")
+        if clean_only_on_issues and not (issues['duplicates'] or issues['invalid_dates'] or issues['outliers']):
+            return df, issues
 
-        return df
+        self.logger.warning("Data quality issues detected - cleaning data...")
+        return self._apply(df, evaluation, quarantine_after), issues
 
 
 class ETLPipeline:
     """Advanced ETL Pipeline with incremental loading and batch processing"""
 
-    def __init__(self, kaggle_client, hana_client, config: Dict[str, Any]):
+    def __init__(self, kaggle_client, hana_client, config: Dict[str, Any],
+                 state_store: Optional[RunStateStore] = None, profiler: Optional[StageProfiler] = None):
         """
         Initialize ETL Pipeline
 
         Args:
             kaggle_client: KaggleApiClient instance
-            hana_client: HanaClient instance
+            hana_client: HanaClient instance, or any db.sinks.Sink to load
+                into instead (SQLiteSink, ParquetSink)
             config: Configuration dictionary
+            state_store: Run-state store (default: opened under paths.data_dir
+                unless etl.state_store is disabled)
+            profiler: Profiles every timed stage and batch write (default: off)
         """
         self.kaggle_client = kaggle_client
         self.hana_client = hana_client
+        self.sink = as_sink(hana_client)
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.metrics = ETLMetrics()
+        self.metrics = ETLMetrics(trace_memory=config.get('etl', {}).get('trace_memory', False))
         self.validator = DataQualityValidator(self.logger)
+        self.profiler = profiler
 
         # Get batch size from config or use default
         self.batch_size = config.get('etl', {}).get('batch_size', 1000)
 
+        # Sizes batches from measured commit latency within configured bounds
+        self.batch_sizer = AdaptiveBatchSizer.from_config(config)
+
+        # Retries transient write errors and bisects batches that hold bad rows
+        self.recovery = BatchRecovery.from_config(config, self.logger)
+
+        # 'merge' upserts batch by batch, 'staging' loads a staging table and merges once
+        self.load_mode = config.get('etl', {}).get('load_mode', 'merge')
+
+        # Number of concurrent batch writers, each on its own pooled connection
+        self.workers = max(1, int(config.get('etl', {}).get('workers', 1)))
+
+        # 'batch' runs each step over the whole frame, 'streaming' overlaps them chunk by chunk
+        self.execution_mode = config.get('etl', {}).get('execution_mode', 'batch')
+        self.queue_size = int(config.get('etl', {}).get('queue_size', 4))
+
+        # Concurrent blocking calls (download, HANA queries, batch writes) in run_async
+        self.async_concurrency = int(config.get('etl', {}).get('async_concurrency', 4))
+
+        # Batch numbers are unique across a run, also when batches come from several chunks
+        self._batch_numbers = itertools.count(1)
+
+        # Watermarks, batch checkpoints and run history kept between runs
+        self.state_store = state_store if state_store is not None else RunStateStore.from_config(config)
+        self._run_id = None
+        self._checkpointing = False
+        self._watermark_base = None
+        self._loaded_watermarks = {}
+        self._state_lock = threading.Lock()
+
+        # Rejected rows go to a columnar quarantine per run under data_dir
+        data_dir = config.get('paths', {}).get('data_dir')
+        self.quarantine_dir = None
+        if data_dir and config.get('etl', {}).get('quarantine', True):
+            self.quarantine_dir = Path(data_dir) / 'quarantine'
+        self.quarantine = None
+
+    @traced('sink.get_last_loaded_date', category='sink')
     def get_last_loaded_date(self, schema_name: str, table_name: str) -> Optional[datetime]:
         """
-        Get the last loaded date from HANA table for incremental loading
+        Get the last loaded date from the target table for incremental loading
 
         Args:
             schema_name: Schema name
@@ -230,36 +644,55 @@ class ETLPipeline:
             Last loaded date or None
         """
         try:
-            cursor = self.hana_client.connection.cursor()
+            last_date = self.sink.get_last_loaded_date(schema_name, table_name)
 
-            query = f"""
-            SELECT MAX("DATE")
-            FROM "{schema_name}"."{table_name}"
-            """
-
-            cursor.execute(query)
-            result = cursor.fetchone()
-            cursor.close()
-
-            if result and result[0]:
-                last_date = result[0]
-                self.logger.info(f"Last loaded date in HANA: {last_date}")
+            if last_date:
+                self.logger.info(f"Last loaded date in {self.sink.name}: {last_date}")
                 return last_date
             else:
-                self.logger.info("No existing data in HANA table - full load will be performed")
+                self.logger.info(f"No existing data in {self.sink.name} table - full load will be performed")
                 return None
 
         except Exception as e:
             self.logger.warning(f"Could not determine last loaded date: {str(e)}")
             return None
 
-    def filter_incremental_data(self, df: pd.DataFrame, last_date: Optional[datetime]) -> pd.DataFrame:
+    @traced('sink.get_ticker_watermarks', category='sink')
+    def get_ticker_watermarks(self, schema_name: str, table_name: str) -> Optional[Dict[str, datetime]]:
+        """
+        Get the last loaded date of every ticker in one GROUP BY query
+
+        Args:
+            schema_name: Schema name
+            table_name: Table name
+
+        Returns:
+            Dictionary of ticker -> last loaded date (empty for an empty
+            table), or None if the watermarks could not be read
+        """
+        try:
+            watermarks = self.sink.get_ticker_watermarks(schema_name, table_name)
+
+            if watermarks:
+                self.logger.info(f"Loaded watermarks for {len(watermarks)} tickers "
+                                 f"(latest {max(watermarks.values())})")
+            else:
+                self.logger.info(f"No existing data in {self.sink.name} table - full load will be performed")
+            return watermarks
+
+        except Exception as e:
+            self.logger.warning(f"Could not determine per-ticker watermarks: {str(e)}")
+            return None
+
+    def filter_incremental_data(self, df: pd.DataFrame,
+                                last_date: Union[Dict[str, datetime], datetime, None]) -> pd.DataFrame:
         """
-        Filter DataFrame to only include new records since last_date
+        Filter DataFrame to only include new records since the watermark
 
         Args:
             df: Full DataFrame
-            last_date: Last loaded date
+            last_date: Per-ticker watermarks from get_ticker_watermarks, or a
+                single last loaded date applied to every ticker
 
         Returns:
             Filtered DataFrame with only new records
@@ -272,6 +705,9 @@ class ETLPipeline:
             self.logger.warning("Date column not found - cannot perform incremental load")
             return df
 
+        if isinstance(last_date, dict):
+            return self._filter_by_watermarks(df, last_date)
+
         # Convert last_date to pandas Timestamp for comparison
         last_date_ts = pd.Timestamp(last_date)
 
@@ -282,94 +718,129 @@ class ETLPipeline:
 
         return new_data
 
-    def insert_data_batch(self, df_batch: pd.DataFrame, schema_name: str, table_name: str) -> tuple:
+    def _filter_by_watermarks(self, df: pd.DataFrame, watermarks: Dict[str, datetime]) -> pd.DataFrame:
+        """Keep rows after their ticker's watermark; tickers without one are loaded in full"""
+        if not watermarks or 'Ticker' not in df.columns:
+            if watermarks:
+                self.logger.warning("Ticker column not found - cannot apply per-ticker watermarks")
+            self.logger.info("Performing full data load")
+            return df
+
+        keep, per_ticker = watermark_bounds(df, watermarks)
+        new_data = df[keep]
+
+        self.logger.info(f"Incremental load: filtered {len(df)} -> {len(new_data)} new records "
+                         f"({int(np.isnat(per_ticker).sum())} of {len(per_ticker)} tickers without a watermark)")
+
+        return new_data
+
+    def insert_data_batch(self, df_batch: pd.DataFrame, schema_name: str, table_name: str,
+                          connection=None) -> tuple:
         """
-        Insert a batch of data into HANA
+        Insert a batch of data into the sink, for HANA with array-bound MERGE statements
+
+        The batch is written as one bulk upsert. Transient errors are retried
+        with backoff, and a batch failing on bad data is bisected into bulk
+        sub-batches until the offending rows are isolated, so the good rows
+        still land. The isolated rows are logged and counted as failed.
 
         Args:
             df_batch: Batch DataFrame
             schema_name: Schema name
             table_name: Table name
+            connection: Connection to write and commit on (default: the client's connection)
 
         Returns:
             Tuple of (inserted_count, updated_count, failed_count)
         """
-        if not self.hana_client.connection:
-            self.logger.error("No HANA connection available")
-            return (0, 0, len(df_batch))
-
-        try:
-            cursor = self.hana_client.connection.cursor()
-            inserted = 0
-            updated = 0
-            failed = 0
-            timestamp = datetime.now()
+        with span('insert_data_batch', category='hana', rows=len(df_batch)):
+            outcome = self._write_batch(df_batch, schema_name, table_name, connection=connection)
+        return (outcome.inserted, outcome.updated, outcome.failed)
+
+    def _write_batch(self, df_batch: pd.DataFrame, schema_name: str, table_name: str,
+                     connection=None) -> BatchOutcome:
+        """Write a batch through the recovery strategy and report the rows it rejected"""
+        if connection is None and not self.sink.connected:
+            message = f"No {self.sink.name} connection available"
+            self.logger.error(message)
+            outcome = BatchOutcome(len(df_batch))
+            outcome.rejected = [(position, message) for position in range(len(df_batch))]
+            return outcome
+
+        if df_batch.empty:
+            return BatchOutcome(0)
+
+        outcome = self.recovery.write(
+            df_batch, lambda part: self._upsert_batch(part, schema_name, table_name, connection)
+        )
+        if outcome.failed < outcome.size:
+            self._invalidate_reads(schema_name, table_name)
+
+        if outcome.rejected:
+            self._report_rejected(df_batch, outcome)
+        elif outcome.attempts > 1:
+            self.logger.info(f"Batch of {len(df_batch)} rows written after {outcome.retries} retries")
+
+        return outcome
+
+    @traced('sink.upsert', category='sink')
+    def _upsert_batch(self, df_batch: pd.DataFrame, schema_name: str, table_name: str, connection) -> tuple:
+        """
+        Write and commit a frame with one bulk upsert of the sink
 
-            for index, row in df_batch.iterrows():
-                try:
-                    # Extract data
-                    ticker = str(row.get('Ticker', ''))
-                    date = row.get('Date')
-                    open_price = float(row.get('Open', 0)) if pd.notna(row.get('Open')) else None
-                    high_price = float(row.get('High', 0)) if pd.notna(row.get('High')) else None
-                    low_price = float(row.get('Low', 0)) if pd.notna(row.get('Low')) else None
-                    close_price = float(row.get('Close', 0)) if pd.notna(row.get('Close')) else None
-                    volume = int(row.get('Volume', 0)) if pd.notna(row.get('Volume')) else None
-                    daily_range = float(row.get('Daily_Range', 0)) if pd.notna(row.get('Daily_Range')) else None
-                    daily_return = float(row.get('Daily_Return', 0)) if pd.notna(row.get('Daily_Return')) else None
-
-                    # Convert pandas Timestamp to Python date
-                    if hasattr(date, 'date'):
-                        date = date.date()
-
-                    # Use UPSERT (MERGE) for better performance
-                    merge_sql = f"""
-                    MERGE INTO "{schema_name}"."{table_name}" AS target
-                    USING (SELECT ? AS TICKER, ? AS DATE FROM DUMMY) AS source
-                    ON target."TICKER" = source.TICKER AND target."DATE" = source.DATE
-                    WHEN MATCHED THEN
-                        UPDATE SET
-                            "OPEN" = ?, "HIGH" = ?, "LOW" = ?, "CLOSE" = ?,
-                            "VOLUME" = ?, "DAILY_RANGE" = ?, "DAILY_RETURN" = ?,
-                            "TIMESTAMP" = ?
-                    WHEN NOT MATCHED THEN
-                        INSERT ("TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE",
-                                "VOLUME", "DAILY_RANGE", "DAILY_RETURN", "TIMESTAMP")
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """
-
-                    cursor.execute(merge_sql, (
-                        ticker, date,  # USING clause
-                        open_price, high_price, low_price, close_price,  # UPDATE clause
-                        volume, daily_range, daily_return, timestamp,
-                        ticker, date, open_price, high_price, low_price, close_price,  # INSERT clause
-                        volume, daily_range, daily_return, timestamp
-                    ))
-
-                    # Check if insert or update occurred
-                    if cursor.rowcount > 0:
-                        inserted += 1
-
-                except Exception as row_error:
-                    failed += 1
-                    error_msg = f"Row {index} [{ticker}|{date}]: {str(row_error)}"
-                    self.logger.error(error_msg)
-                    self.metrics.add_error(error_msg)
-
-            self.hana_client.connection.commit()
-            cursor.close()
-
-            return (inserted, updated, failed)
+        Returns:
+            Tuple of (inserted_count, updated_count)
 
-        except Exception as e:
-            self.logger.error(f"Batch insert error: {str(e)}")
-            self.metrics.add_error(f"Batch insert failed: {str(e)}")
-            return (0, 0, len(df_batch))
+        Raises:
+            Exception: Whatever the sink raised, after it undid the write
+        """
+        return self.sink.upsert(df_batch, schema_name, table_name, connection=connection)
+
+    def _invalidate_reads(self, schema_name: str, table_name: str):
+        """Drop the sink's cached reads of a table after committing rows to it"""
+        self.sink.invalidate_cache(schema_name, table_name)
+
+    def _report_rejected(self, df_batch: pd.DataFrame, outcome: BatchOutcome):
+        """Quarantine the rows a batch could not write and add one summary error to the metrics"""
+        positions = [position for position, _ in outcome.rejected]
+        rejected = df_batch.iloc[positions]
+        if self.quarantine is not None:
+            self.quarantine.add(rejected, REASON_WRITE_ERROR, [error for _, error in outcome.rejected])
+
+        shown = []
+        for position, error in outcome.rejected[:5]:
+            row = df_batch.iloc[position]
+            shown.append(f"({row.get('Ticker')}, {row.get('Date')}): {error}")
+        more = f" (+{outcome.failed - len(shown)} more)" if outcome.failed > len(shown) else ""
+        message = (f"Batch insert failed for {outcome.failed} of {outcome.size} rows after "
+                   f"{outcome.attempts} writes: {'; '.join(shown)}{more}")
+        self.logger.error(message)
+        self.metrics.add_error(message, code=REASON_WRITE_ERROR)
+
+    def _write_timed_batch(self, batch_num: int, df_batch: pd.DataFrame, schema_name: str, table_name: str,
+                           connection=None) -> tuple:
+        """Write one batch, record its latency in the metrics and return its counts"""
+        started = time.perf_counter()
+        with self._profile('load'), span('insert_data_batch', category='hana', batch=batch_num, rows=len(df_batch)):
+            outcome = self._write_batch(df_batch, schema_name, table_name, connection=connection)
+        seconds = time.perf_counter() - started
+
+        inserted, updated, failed = outcome.inserted, outcome.updated, outcome.failed
+        self.metrics.record_batch(batch_num, len(df_batch), seconds, inserted, updated, failed)
+        self.metrics.record_stage('load', seconds, len(df_batch), frame_bytes(df_batch))
+        if failed < len(df_batch):
+            committed = df_batch if failed == 0 else df_batch.iloc[outcome.committed_positions()]
+            self._record_committed_batch(batch_num, committed, inserted, updated)
+        return inserted, updated, failed, seconds
 
     def process_data_in_batches(self, df: pd.DataFrame, schema_name: str, table_name: str) -> Dict[str, int]:
         """
         Process DataFrame in batches for better performance
 
+        Batch sizes come from the adaptive batch sizer, which grows or shrinks
+        them from the measured latency of each committed batch. A delay is only
+        inserted when a batch was much slower than the target latency.
+
         Args:
             df: DataFrame to process
             schema_name: Schema name
@@ -378,31 +849,39 @@ class ETLPipeline:
         Returns:
             Dictionary with processing results
         """
+        if self.workers > 1:
+            return self.process_data_in_batches_parallel(df, schema_name, table_name, self.workers)
+
         total_rows = len(df)
         total_inserted = 0
         total_updated = 0
         total_failed = 0
 
-        self.logger.info(f"Processing {total_rows} rows in batches of {self.batch_size}")
+        self.logger.info(f"Processing {total_rows} rows in batches starting at {self.batch_sizer.next_size()}")
 
-        # Process in batches
-        for i in range(0, total_rows, self.batch_size):
-            batch_num = (i // self.batch_size) + 1
-            batch_df = df.iloc[i:i + self.batch_size]
+        offset = 0
+        while offset < total_rows:
+            batch_num = next(self._batch_numbers)
+            batch_df = df.iloc[offset:offset + self.batch_sizer.next_size()]
+            offset += len(batch_df)
 
             self.logger.info(f"Processing batch {batch_num} ({len(batch_df)} rows)...")
 
-            inserted, updated, failed = self.insert_data_batch(batch_df, schema_name, table_name)
+            inserted, updated, failed, seconds = self._write_timed_batch(batch_num, batch_df, schema_name, table_name)
+            self.batch_sizer.record(len(batch_df), seconds, failed)
 
             total_inserted += inserted
             total_updated += updated
             total_failed += failed
 
-            self.logger.info(f"Batch {batch_num} complete: {inserted} inserted, {updated} updated, {failed} failed")
+            self.logger.info(f"Batch {batch_num} complete in {seconds:.2f}s: "
+                             f"{inserted} inserted, {updated} updated, {failed} failed")
 
-            # Small delay between batches to avoid overwhelming the database
-            if i + self.batch_size < total_rows:
-                time.sleep(0.1)
+            # Back off only when HANA is actually slow
+            backoff = self.batch_sizer.backoff_seconds()
+            if backoff and offset < total_rows:
+                self.logger.info(f"Batch {batch_num} exceeded the latency target - backing off {backoff:.2f}s")
+                time.sleep(backoff)
 
         return {
             'inserted': total_inserted,
@@ -410,7 +889,122 @@ class ETLPipeline:
             'failed': total_failed
         }
 
-    def run(self, schema_name: str, table_name: str, incremental: bool = True) -> Dict[str, Any]:
+    def process_data_in_batches_parallel(self, df: pd.DataFrame, schema_name: str, table_name: str,
+                                         workers: int) -> Dict[str, int]:
+        """
+        Process DataFrame in batches written concurrently on pooled connections
+
+        Each worker checks a connection out of the sink's writer pool, writes
+        and commits its batch and returns the connection. hdbcli releases the
+        GIL during network I/O so threads overlap their round-trips; sinks
+        with a single connection let the workers take turns. At most
+        two batches per worker are in flight, and each new batch is sized from
+        the latencies of the batches completed so far.
+
+        Args:
+            df: DataFrame to process
+            schema_name: Schema name
+            table_name: Table name
+            workers: Number of concurrent writers
+
+        Returns:
+            Dictionary with processing results
+        """
+        pool = self.sink.writer_pool()
+        if pool.max_size < workers:
+            self.logger.warning(f"Connection pool holds {pool.max_size} connections for {workers} writers - "
+                                f"writers will wait for connections")
+
+        total_rows = len(df)
+        totals = {'inserted': 0, 'updated': 0, 'failed': 0}
+
+        self.logger.info(f"Processing {total_rows} rows in batches starting at {self.batch_sizer.next_size()} "
+                         f"on {workers} concurrent writers")
+
+        def write_batch(batch_num, batch_df):
+            with pool.connection() as connection:
+                return self._write_timed_batch(batch_num, batch_df, schema_name, table_name, connection=connection)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hana-writer') as executor:
+            in_flight = {}
+            offset = 0
+
+            while offset < total_rows or in_flight:
+                while offset < total_rows and len(in_flight) < workers * 2:
+                    batch_num = next(self._batch_numbers)
+                    batch_df = df.iloc[offset:offset + self.batch_sizer.next_size()]
+                    offset += len(batch_df)
+                    in_flight[executor.submit(write_batch, batch_num, batch_df)] = (batch_num, len(batch_df))
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    done_num, batch_rows = in_flight.pop(future)
+                    try:
+                        inserted, updated, failed, seconds = future.result()
+                        self.batch_sizer.record(batch_rows, seconds, failed)
+                    except Exception as e:
+                        inserted, updated, failed = 0, 0, batch_rows
+                        self.logger.error(f"Batch {done_num} writer failed: {str(e)}")
+                        self.metrics.add_error(f"Batch {done_num} writer failed: {str(e)}", code='WRITER_FAILED')
+
+                    totals['inserted'] += inserted
+                    totals['updated'] += updated
+                    totals['failed'] += failed
+
+                    self.logger.info(f"Batch {done_num} complete: {inserted} inserted, {updated} updated, {failed} failed")
+
+        return totals
+
+    @traced('sink.load_via_staging', category='sink')
+    def load_via_staging(self, df: pd.DataFrame, schema_name: str, table_name: str) -> Dict[str, int]:
+        """
+        Load DataFrame through a per-run staging table and one set-based MERGE
+
+        Rows are bulk-inserted into a staging table created next to the target,
+        merged into the target with a single MERGE ... USING statement and the
+        staging table is dropped afterwards. Counts come from SQL, not Python.
+        Sinks without staging tables upsert the whole frame in one commit.
+
+        Args:
+            df: DataFrame to load
+            schema_name: Schema name
+            table_name: Table name
+
+        Returns:
+            Dictionary with processing results
+        """
+        if not self.sink.connected:
+            self.logger.error(f"No {self.sink.name} connection available")
+            return {'inserted': 0, 'updated': 0, 'failed': len(df)}
+
+        # MERGE rejects a source with repeated keys, keep the last occurrence
+        if 'Ticker' in df.columns and 'Date' in df.columns:
+            deduplicated = df.drop_duplicates(subset=['Ticker', 'Date'], keep='last')
+            if len(deduplicated) < len(df):
+                self.logger.warning(f"Dropped {len(df) - len(deduplicated)} duplicate keys before staging")
+                self.metrics.add_warning(f"Staging load dropped {len(df) - len(deduplicated)} duplicate keys",
+                                         code=REASON_DUPLICATE)
+            df = deduplicated
+
+        try:
+            staged, inserted, updated = self.sink.merge_staged(df, schema_name, table_name, self.batch_size)
+        except Exception as e:
+            self.logger.error(f"Staging load error: {str(e)}")
+            self.metrics.add_error(f"Staging load failed: {str(e)}", code='STAGING_FAILED')
+            return {'inserted': 0, 'updated': 0, 'failed': len(df)}
+
+        self._invalidate_reads(schema_name, table_name)
+        results = {
+            'inserted': inserted,
+            'updated': updated,
+            'failed': len(df) - inserted - updated
+        }
+        self.logger.info(f"Staging load complete: {staged} staged, {results['inserted']} inserted, "
+                         f"{results['updated']} updated, {results['failed']} failed")
+        return results
+
+    def run(self, schema_name: str, table_name: str, incremental: bool = True,
+            load_mode: Optional[str] = None, mode: Optional[str] = None) -> Dict[str, Any]:
         """
         Run the complete ETL pipeline
 
@@ -418,77 +1012,733 @@ class ETLPipeline:
             schema_name: HANA schema name
             table_name: HANA table name
             incremental: Whether to perform incremental load (default: True)
+            load_mode: 'merge' for batched upserts or 'staging' for a staging
+                table plus one set-based MERGE (default: etl.load_mode)
+            mode: 'batch' or 'streaming' execution (default: etl.execution_mode,
+                or 'streaming' for merge loads with a memory budget)
+
+        Returns:
+            Dictionary with pipeline execution results
+        """
+        load_mode = load_mode or self.load_mode
+        if load_mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode '{load_mode}', expected one of {LOAD_MODES}")
+
+        if mode is None:
+            mode = self.execution_mode
+            # A batch run holds the whole cleaned frame, only a streamed run stays within the budget
+            if mode == 'batch' and load_mode == 'merge' and getattr(self.kaggle_client, 'memory_budget_mb', 0):
+                self.logger.info("Memory budget set - streaming the run instead of loading the whole frame")
+                mode = 'streaming'
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{mode}', expected one of {EXECUTION_MODES}")
+
+        if mode == 'streaming' and load_mode != 'merge':
+            raise ValueError("Streaming execution only supports the 'merge' load mode")
+
+        self._begin_run_state(schema_name, table_name, f"{mode}/{load_mode}")
+        self._open_quarantine()
+        try:
+            # Nothing to do if this dataset version was already loaded
+            if incremental and self.kaggle_client.is_dataset_loaded(self._load_target(schema_name, table_name)):
+                result = self._skip_run()
+            elif mode == 'streaming':
+                result = self.run_streaming(schema_name, table_name, incremental)
+            else:
+                result = self._run_batch(schema_name, table_name, incremental, load_mode)
+        except Exception:
+            self._abort_run()
+            raise
+
+        return self._complete_run(result)
+
+    async def run_async(self, schema_name: str, table_name: str, incremental: bool = True,
+                        load_mode: Optional[str] = None, concurrency: Optional[int] = None,
+                        ensure_table: bool = True) -> Dict[str, Any]:
+        """
+        Run the ETL pipeline with independent I/O overlapped on an executor
+
+        The Kaggle download and parse runs while the HANA schema and table are
+        ensured and the watermarks are read. Batches are written concurrently
+        on pooled connections. Every blocking call runs on a thread executor
+        under a semaphore of `concurrency` slots. Busy and saved time per stage
+        is stored under 'stages' in the metrics.
+
+        Args:
+            schema_name: HANA schema name
+            table_name: HANA table name
+            incremental: Whether to perform incremental load (default: True)
+            load_mode: 'merge' or 'staging' (default: etl.load_mode)
+            concurrency: Concurrent blocking calls (default: etl.async_concurrency)
+            ensure_table: Create the schema and table if they do not exist
 
         Returns:
             Dictionary with pipeline execution results
         """
+        load_mode = load_mode or self.load_mode
+        if load_mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode '{load_mode}', expected one of {LOAD_MODES}")
+        concurrency = max(2, int(concurrency or self.async_concurrency))
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='etl-async')
+        slots = asyncio.Semaphore(concurrency)
+        timings: Dict[str, List[tuple]] = {}
+        origin = time.perf_counter()
+
+        async def stage(name, func, *args):
+            async with slots:
+                started = time.perf_counter() - origin
+                try:
+                    return await loop.run_in_executor(executor, func, *args)
+                finally:
+                    timings.setdefault(name, []).append((started, time.perf_counter() - origin))
+
+        self._begin_run_state(schema_name, table_name, f"async/{load_mode}")
+        self._open_quarantine()
+        try:
+            if incremental and await stage('dataset_check', self.kaggle_client.is_dataset_loaded,
+                                            self._load_target(schema_name, table_name)):
+                result = self._skip_run()
+            else:
+                result = await self._run_async_steps(schema_name, table_name, incremental, load_mode,
+                                                     ensure_table, stage, timings, concurrency)
+        except Exception:
+            self._abort_run()
+            raise
+        finally:
+            executor.shutdown(wait=False)
+
+        return self._complete_run(result)
+
+    async def _run_async_steps(self, schema_name: str, table_name: str, incremental: bool, load_mode: str,
+                               ensure_table: bool, stage, timings: Dict[str, List[tuple]],
+                               concurrency: int) -> Dict[str, Any]:
+        """Pipeline steps of run_async, with the download overlapping the table preparation"""
         self.logger.info("=" * 80)
-        self.logger.info("STARTING ADVANCED ETL PIPELINE")
+        self.logger.info(f"STARTING ASYNC ETL PIPELINE (concurrency {concurrency})")
         self.logger.info("=" * 80)
 
         self.metrics.start()
 
         try:
-            # Step 1: Fetch data from Kaggle
-            self.logger.info("\n[STEP 1] Fetching data from Kaggle...")
-            df = self.kaggle_client.fetch_stock_data()
+            async def prepare_table():
+                if ensure_table:
+                    if not await stage('create_schema', self.sink.create_schema_if_not_exists, schema_name):
+                        raise Exception(f"Failed to create schema: {schema_name}")
+                    if not await stage('create_table', self.sink.create_table, schema_name, table_name):
+                        raise Exception(f"Failed to create table: {schema_name}.{table_name}")
+                if incremental:
+                    return await stage('watermarks', self._load_watermarks, schema_name, table_name)
+                return None
 
-            if df is None or df.empty:
-                raise Exception("Failed to fetch data from Kaggle or data is empty")
+            df = self._stored_frame(schema_name, table_name) if load_mode != 'staging' else None
+            if df is not None:
+                self.logger.info("\n[STEP 1-3] Resuming the interrupted run's validated rows...")
+                await prepare_table()
+            else:
+                self.logger.info("\n[STEP 1] Fetching data from Kaggle while preparing the HANA table...")
+                df, watermarks = await asyncio.gather(
+                    stage('download', self._extract), prepare_table()
+                )
+
+                if df is None or df.empty:
+                    raise Exception("Failed to fetch data from Kaggle or data is empty")
+
+                self.metrics.rows_fetched = len(df)
+                self.logger.info(f"Fetched {len(df)} rows from Kaggle")
+
+                self.logger.info("\n[STEP 2] Validating data quality...")
+                df = await stage('validate', self._validate_and_clean, df, watermarks)
+                self.metrics.rows_validated = len(df)
+
+                if incremental:
+                    self.logger.info("\n[STEP 3] Filtering by the per-ticker watermarks...")
+                    df = self.filter_incremental_data(df, watermarks)
+                    if df.empty:
+                        self.logger.info("No new data to load")
+                        self.kaggle_client.mark_dataset_loaded(self._load_target(schema_name, table_name))
+                        self.metrics.stages = stage_savings(timings)
+                        self.metrics.stop()
+                        return self.metrics.to_dict()
+                else:
+                    self.logger.info("\n[STEP 3] Performing full load (incremental disabled)")
+
+            if load_mode == 'staging':
+                self.logger.info(f"\n[STEP 4] Loading {len(df)} rows through a staging table...")
+                results = await stage('load', self._load_staged, df, schema_name, table_name)
+            else:
+                df, resumed = self._resume_from_checkpoints(df, schema_name, table_name)
+                self.logger.info(f"\n[STEP 4] Writing {len(df)} rows in concurrent batches...")
+                results = await self._write_batches_async(df, schema_name, table_name, stage, concurrency)
+                for key in results:
+                    results[key] += resumed[key]
 
-            self.metrics.rows_fetched = len(df)
-            self.logger.info(f"Fetched {len(df)} rows from Kaggle")
+            self.metrics.rows_inserted = results['inserted']
+            self.metrics.rows_updated = results['updated']
+            self.metrics.rows_failed = results['failed']
 
-            # Step 2: Data Quality Validation
-            self.logger.info("\n[STEP 2] Validating data quality...")
-            issues = self.validator.validate_dataframe(df)
+            self.metrics.stages = stage_savings(timings)
+            for name, timing in self.metrics.stages.items():
+                self.logger.info(f"Stage '{name}': {timing['seconds']:.2f}s busy in {timing['calls']} calls, "
+                                 f"{timing['saved_seconds']:.2f}s saved by overlap")
+            saved = sum(timing['saved_seconds'] for timing in self.metrics.stages.values())
+            self.logger.info(f"Concurrency saved {saved:.2f}s in total")
 
-            if issues['duplicates'] or issues['invalid_dates'] or issues['outliers']:
-                self.logger.warning("Data quality issues detected - cleaning data...")
-                df = self.validator.clean_dataframe(df)
+            return self._finish_run(schema_name, table_name, step=5)
 
-            self.metrics.rows_validated = len(df)
+        except Exception as e:
+            self.metrics.stop()
+            self.metrics.add_error(f"Pipeline failed: {str(e)}", code='PIPELINE_FAILED')
+            self.logger.error(f"ETL Pipeline failed: {str(e)}", exc_info=True)
+            raise
 
-            # Step 3: Incremental Loading (if enabled)
-            if incremental:
-                self.logger.info("\n[STEP 3] Checking for incremental load...")
-                last_date = self.get_last_loaded_date(schema_name, table_name)
-                df = self.filter_incremental_data(df, last_date)
-
-                if df.empty:
-                    self.logger.info("No new data to load")
-                    self.metrics.stop()
-                    return self.metrics.to_dict()
+    async def _write_batches_async(self, df: pd.DataFrame, schema_name: str, table_name: str,
+                                   stage, concurrency: int) -> Dict[str, int]:
+        """Write batches as executor tasks on pooled connections, at most `concurrency` in flight"""
+        pool = self.sink.writer_pool()
+        totals = {'inserted': 0, 'updated': 0, 'failed': 0}
+
+        def write_batch(batch_num, batch_df):
+            with pool.connection() as connection:
+                return self._write_timed_batch(batch_num, batch_df, schema_name, table_name, connection=connection)
+
+        in_flight = {}
+        offset = 0
+        while offset < len(df) or in_flight:
+            # Size each new batch from the latencies measured so far
+            while offset < len(df) and len(in_flight) < concurrency:
+                batch_num = next(self._batch_numbers)
+                batch_df = df.iloc[offset:offset + self.batch_sizer.next_size()]
+                offset += len(batch_df)
+                task = asyncio.ensure_future(stage('load', write_batch, batch_num, batch_df))
+                in_flight[task] = (batch_num, len(batch_df))
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                batch_num, batch_rows = in_flight.pop(task)
+                try:
+                    inserted, updated, failed, seconds = task.result()
+                    self.batch_sizer.record(batch_rows, seconds, failed)
+                except Exception as e:
+                    inserted, updated, failed = 0, 0, batch_rows
+                    self.logger.error(f"Batch {batch_num} writer failed: {str(e)}")
+                    self.metrics.add_error(f"Batch {batch_num} writer failed: {str(e)}", code='WRITER_FAILED')
+
+                totals['inserted'] += inserted
+                totals['updated'] += updated
+                totals['failed'] += failed
+
+        return totals
+
+    def _load_target(self, schema_name: str, table_name: str) -> str:
+        """Key under which the Kaggle client records the dataset versions loaded into a sink's table"""
+        return f"{self.sink.name}:{schema_name}.{table_name}"
+
+    def _skip_run(self) -> Dict[str, Any]:
+        """Metrics of a run skipped because the dataset was already loaded"""
+        self.logger.info("Kaggle dataset unchanged since the last successful load - skipping run")
+        self.metrics.start()
+        self.metrics.skipped = True
+        self.metrics.stop()
+        return self.metrics.to_dict()
+
+    def _abort_run(self):
+        """Close the quarantine and record a failed run"""
+        self._close_quarantine()
+        self._end_run_state('failed')
+
+    def _complete_run(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Close the quarantine and record the run's outcome"""
+        result['quarantine'] = self._close_quarantine()
+        if result['skipped']:
+            self._end_run_state('skipped', result)
+        else:
+            self._end_run_state('partial' if result['rows_failed'] else 'completed', result)
+        return result
+
+    def _run_batch(self, schema_name: str, table_name: str, incremental: bool, load_mode: str) -> Dict[str, Any]:
+        """Run the pipeline steps one after another over the whole frame"""
+        self.logger.info("=" * 80)
+        self.logger.info("STARTING ADVANCED ETL PIPELINE")
+        self.logger.info("=" * 80)
+
+        self.metrics.start()
+
+        try:
+            # An interrupted run left the validated frame it was loading
+            df = self._stored_frame(schema_name, table_name) if load_mode != 'staging' else None
+            if df is not None:
+                self.logger.info("\n[STEP 1-3] Resuming the interrupted run's validated rows...")
+                if incremental:
+                    self._load_watermarks(schema_name, table_name)
             else:
-                self.logger.info("\n[STEP 3] Performing full load (incremental disabled)")
+                # Step 1: Fetch data from Kaggle
+                self.logger.info("\n[STEP 1] Fetching data from Kaggle...")
+                df = self._extract()
+
+                if df is None or df.empty:
+                    raise Exception("Failed to fetch data from Kaggle or data is empty")
+
+                self.metrics.rows_fetched = len(df)
+                self.logger.info(f"Fetched {len(df)} rows from Kaggle")
+
+                # Step 2: Data Quality Validation, after reading the watermarks so
+                # that only rows newer than them are quarantined
+                watermarks = None
+                if incremental:
+                    self.logger.info("\n[STEP 2] Checking for incremental load and validating data quality...")
+                    watermarks = self._load_watermarks(schema_name, table_name)
+                else:
+                    self.logger.info("\n[STEP 2] Validating data quality...")
+                df = self._validate_and_clean(df, watermarks)
+
+                self.metrics.rows_validated = len(df)
+
+                # Step 3: Incremental Loading (if enabled)
+                if incremental:
+                    self.logger.info("\n[STEP 3] Filtering by the per-ticker watermarks...")
+                    df = self.filter_incremental_data(df, watermarks)
+
+                    if df.empty:
+                        self.logger.info("No new data to load")
+                        self.kaggle_client.mark_dataset_loaded(self._load_target(schema_name, table_name))
+                        self.metrics.stop()
+                        return self.metrics.to_dict()
+                else:
+                    self.logger.info("\n[STEP 3] Performing full load (incremental disabled)")
 
             # Step 4: Batch Processing
-            self.logger.info(f"\n[STEP 4] Processing {len(df)} rows in batches...")
-            results = self.process_data_in_batches(df, schema_name, table_name)
+            if load_mode == 'staging':
+                self.logger.info(f"\n[STEP 4] Loading {len(df)} rows through a staging table...")
+                results = self._load_staged(df, schema_name, table_name)
+            else:
+                df, resumed = self._resume_from_checkpoints(df, schema_name, table_name)
+                self.logger.info(f"\n[STEP 4] Processing {len(df)} rows in batches...")
+                results = self.process_data_in_batches(df, schema_name, table_name)
+                for key in results:
+                    results[key] += resumed[key]
 
             self.metrics.rows_inserted = results['inserted']
             self.metrics.rows_updated = results['updated']
             self.metrics.rows_failed = results['failed']
 
-            # Step 5: Final Statistics
-            self.logger.info("\n[STEP 5] Retrieving final statistics...")
-            stats = self.hana_client.get_table_stats(schema_name, table_name)
+            return self._finish_run(schema_name, table_name, step=5)
 
+        except Exception as e:
             self.metrics.stop()
-            self.metrics.log_summary(self.logger)
+            self.metrics.add_error(f"Pipeline failed: {str(e)}", code='PIPELINE_FAILED')
+            self.logger.error(f"ETL Pipeline failed: {str(e)}", exc_info=True)
+            raise
 
-            self.logger.info("\n" + "=" * 80)
-            self.logger.info("HANA TABLE STATISTICS")
-            self.logger.info("=" * 80)
-            self.logger.info(f"Total rows in table: {stats.get('total_rows', 'N/A')}")
-            self.logger.info(f"Unique tickers: {stats.get('unique_tickers', 'N/A')}")
-            self.logger.info(f"Date range: {stats.get('min_date', 'N/A')} to {stats.get('max_date', 'N/A')}")
-            self.logger.info("=" * 80)
+    def run_streaming(self, schema_name: str, table_name: str, incremental: bool = True) -> Dict[str, Any]:
+        """
+        Run the ETL pipeline with extract, transform and load overlapped
+
+        KaggleApiClient.iter_stock_data yields cleaned chunks, a transform
+        stage validates and filters each chunk and a load stage writes it in
+        batches. Rows at a chunk's last date per ticker are carried to the
+        next chunk, so keys repeated across chunks are deduplicated and the
+        loaded rows match a batch run. The stages run on their own threads
+        connected by bounded queues, so a slow loader applies backpressure
+        instead of letting parsed chunks pile up. Per-stage utilization is
+        stored in metrics; with a profiler, reading and cleaning each chunk
+        is profiled as a call of the extract stage.
 
-            return self.metrics.to_dict()
+        Args:
+            schema_name: HANA schema name
+            table_name: HANA table name
+            incremental: Whether to perform incremental load (default: True)
+
+        Returns:
+            Dictionary with pipeline execution results
+        """
+        self.logger.info("=" * 80)
+        self.logger.info("STARTING STREAMING ETL PIPELINE")
+        self.logger.info("=" * 80)
+
+        self.metrics.start()
+
+        try:
+            watermarks = None
+            if incremental:
+                self.logger.info("\n[STEP 1] Checking for incremental load...")
+                watermarks = self._load_watermarks(schema_name, table_name)
+
+            totals = {'inserted': 0, 'updated': 0, 'failed': 0}
+
+            # Each metric below is only touched by the stage thread that owns it
+            def transform(chunk: pd.DataFrame) -> pd.DataFrame:
+                self.metrics.rows_fetched += len(chunk)
+                chunk = self._validate_and_clean(chunk, watermarks)
+                self.metrics.rows_validated += len(chunk)
+                if incremental:
+                    chunk = self.filter_incremental_data(chunk, watermarks)
+                return chunk
+
+            def load(chunk: pd.DataFrame):
+                results = self.process_data_in_batches(chunk, schema_name, table_name)
+                for key in totals:
+                    totals[key] += results[key]
+
+            self.logger.info(f"\n[STEP 2] Streaming chunks through extract -> transform -> load "
+                             f"(queue size {self.queue_size})...")
+            chunks = self._profiled_chunks('extract', carry_last_keys(self.kaggle_client.iter_stock_data()))
+            executor = StreamingExecutor(queue_size=self.queue_size, logger=self.logger)
+            stage_stats = executor.run(
+                ('extract', chunks),
+                [('transform', transform), ('load', load)]
+            )
+
+            self.metrics.stages = {
+                name: stats.to_dict(executor.wall_seconds) for name, stats in stage_stats.items()
+            }
+            extract = stage_stats['extract']
+            self.metrics.record_stage('extract', extract.busy_seconds, extract.rows)
+            for name, stage in self.metrics.stages.items():
+                self.logger.info(f"Stage '{name}': {stage['items']} chunks, {stage['rows']} rows, "
+                                 f"{stage['utilization'] * 100:.1f}% busy")
+
+            if self.metrics.rows_fetched == 0:
+                raise Exception("Failed to fetch data from Kaggle or data is empty")
+
+            self.metrics.rows_inserted = totals['inserted']
+            self.metrics.rows_updated = totals['updated']
+            self.metrics.rows_failed = totals['failed']
+
+            return self._finish_run(schema_name, table_name, step=3)
 
         except Exception as e:
             self.metrics.stop()
-            self.metrics.add_error(f"Pipeline failed: {str(e)}")
+            self.metrics.add_error(f"Pipeline failed: {str(e)}", code='PIPELINE_FAILED')
             self.logger.error(f"ETL Pipeline failed: {str(e)}", exc_info=True)
             raise
+
+    @contextmanager
+    def _stage(self, stage: str):
+        """Time a block as a metrics stage, profiling it when a profiler is set"""
+        with self.metrics.timed(stage) as volume, self._profile(stage):
+            yield volume
+
+    def _profile(self, stage: str):
+        """Profile a block as one call of a stage, a no-op without a profiler"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(stage)
+
+    def _profiled_chunks(self, stage: str, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Profile producing each chunk of a stream as one call of a stage"""
+        chunks = iter(chunks)
+        while True:
+            with self._profile(stage):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def _extract(self) -> Optional[pd.DataFrame]:
+        """Fetch the cleaned Kaggle frame as the timed extract stage"""
+        with self._stage('extract') as volume:
+            df = self.kaggle_client.fetch_stock_data()
+            if df is not None:
+                volume.update(rows=len(df), bytes=frame_bytes(df))
+        return df
+
+    def _validate_and_clean(self, df: pd.DataFrame,
+                            watermarks: Optional[Dict[str, datetime]] = None) -> pd.DataFrame:
+        """Validate a frame and clean it if quality issues were found"""
+        with self._stage('validate') as volume:
+            volume.update(rows=len(df), bytes=frame_bytes(df))
+            df, _ = self.validator.validate_and_clean(df, quarantine_after=watermarks)
+        return df
+
+    def _load_staged(self, df: pd.DataFrame, schema_name: str, table_name: str) -> Dict[str, int]:
+        """Load a frame through a staging table as the timed load stage"""
+        with self._stage('load') as volume:
+            volume.update(rows=len(df), bytes=frame_bytes(df))
+            results = self.load_via_staging(df, schema_name, table_name)
+        if results['failed'] == 0:
+            self._track_loaded(df)
+        return results
+
+    def _begin_run_state(self, schema_name: str, table_name: str, mode: str):
+        """Record the run in the state store and reset the per-run watermark tracking"""
+        self._checkpointing = False
+        self._watermark_base = None
+        self._loaded_watermarks = {}
+        if self.state_store is None:
+            return
+
+        self._run_id = self.state_store.begin_run(f"{schema_name}.{table_name}", mode)
+        self.metrics.run = {'run_id': self._run_id, 'resumed_from': None, 'rows_resumed': 0}
+
+    def _end_run_state(self, status: str, result: Optional[Dict[str, Any]] = None):
+        """Record the outcome and metrics of the run in the state store"""
+        self._checkpointing = False
+        if self.state_store is None or self._run_id is None:
+            return
+
+        self.state_store.finish_run(self._run_id, status, result or self.metrics.to_dict())
+        self.logger.info(f"Run {self._run_id} recorded as '{status}' in {self.state_store.path}")
+        self._run_id = None
+
+    def _open_quarantine(self):
+        """Start the run's quarantine and route the validator's removed rows to it"""
+        self.quarantine = None
+        if self.quarantine_dir is not None:
+            self.quarantine = new_quarantine(self.quarantine_dir, self._run_id, self.logger)
+        self.validator.quarantine = self.quarantine
+
+    def _close_quarantine(self) -> Dict[str, Any]:
+        """Write the run's remaining quarantined rows and store the summary in the metrics"""
+        if self.quarantine is not None:
+            self.metrics.quarantine = self.quarantine.close()
+        self.quarantine = None
+        self.validator.quarantine = None
+        return self.metrics.quarantine
+
+    def replay_quarantine(self, path, schema_name: str, table_name: str,
+                          reasons: Optional[tuple] = REPLAYABLE_REASONS, validate: bool = True) -> Dict[str, Any]:
+        """
+        Bulk-reload quarantined rows after a fix, without re-running the extract
+
+        Rows that fail again are quarantined under the replay's own run.
+
+        Args:
+            path: A run's quarantine directory or one of its part files
+            schema_name: HANA schema name
+            table_name: HANA table name
+            reasons: Reason codes to replay (default: rows rejected by HANA;
+                None replays every row)
+            validate: Run the data quality rules over the rows again
+
+        Returns:
+            Dictionary with replay results
+        """
+        self.logger.info(f"Replaying quarantined rows from {path} (reasons: {reasons or 'all'})")
+        self._begin_run_state(schema_name, table_name, 'replay')
+        self._open_quarantine()
+        self.metrics.start()
+
+        try:
+            df = read_quarantine(path, reasons)
+            self.metrics.rows_fetched = len(df)
+
+            if not df.empty:
+                df = strip_quarantine_columns(df)
+                if validate:
+                    df = self._validate_and_clean(df)
+                self.metrics.rows_validated = len(df)
+
+                results = self.process_data_in_batches(df.reset_index(drop=True), schema_name, table_name)
+                self.metrics.rows_inserted = results['inserted']
+                self.metrics.rows_updated = results['updated']
+                self.metrics.rows_failed = results['failed']
+            else:
+                self.logger.info("No quarantined rows to replay")
+
+            self.metrics.stop()
+
+        except Exception as e:
+            self.metrics.stop()
+            self.metrics.add_error(f"Replay failed: {str(e)}", code='REPLAY_FAILED')
+            self.logger.error(f"Quarantine replay failed: {str(e)}", exc_info=True)
+            self._close_quarantine()
+            self._end_run_state('failed')
+            raise
+
+        self._close_quarantine()
+        self.metrics.log_summary(self.logger)
+        result = self.metrics.to_dict()
+        self._end_run_state('replay_partial' if self.metrics.rows_failed else 'replayed', result)
+        return result
+
+    @traced('sink.table_counts', category='sink')
+    def _table_counts(self, schema_name: str, table_name: str) -> Optional[tuple]:
+        """Row count and max date of the target in one aggregate query, or None on error"""
+        try:
+            total_rows, max_date = self.sink.table_counts(schema_name, table_name)
+            return int(total_rows or 0), str(max_date)[:10] if max_date else None
+        except Exception as e:
+            self.logger.warning(f"Could not read table counts: {str(e)}")
+            return None
+
+    def _load_watermarks(self, schema_name: str, table_name: str) -> Optional[Dict[str, Any]]:
+        """Read the per-ticker watermarks as the timed watermarks stage"""
+        with self._stage('watermarks') as volume:
+            watermarks = self._read_watermarks(schema_name, table_name)
+            volume['rows'] = len(watermarks or {})
+        return watermarks
+
+    def _read_watermarks(self, schema_name: str, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Per-ticker watermarks from the state store, confirmed by one aggregate query
+
+        Stored watermarks are used when the table's row count and max date
+        still match the values recorded with them. After an interrupted run
+        they are used as stored, so the resumed run filters the same rows the
+        interrupted one did. Otherwise they are read from HANA and stored.
+        """
+        if self.state_store is None:
+            watermarks = self.get_ticker_watermarks(schema_name, table_name)
+            self._watermark_base = watermarks
+            return watermarks
+
+        target = f"{schema_name}.{table_name}"
+        expected = self.state_store.target_stats(target)
+        watermarks = None
+
+        if expected is not None:
+            if self.state_store.has_incomplete_run(target, exclude=self._run_id):
+                self.logger.info("Using stored watermarks of the interrupted run to resume it")
+                watermarks = self.state_store.watermarks(target)
+            elif self._table_counts(schema_name, table_name) == tuple(expected):
+                watermarks = self.state_store.watermarks(target)
+                self.logger.info(f"Using {len(watermarks)} stored watermarks "
+                                 f"(confirmed: {expected[0]} rows up to {expected[1]})")
+
+        if watermarks is None:
+            watermarks = self.get_ticker_watermarks(schema_name, table_name)
+            counts = self._table_counts(schema_name, table_name)
+            if watermarks is not None and counts is not None:
+                self.state_store.save_watermarks(target, watermarks, *counts)
+
+        self._watermark_base = watermarks
+        return watermarks
+
+    def _stored_frame(self, schema_name: str, table_name: str) -> Optional[pd.DataFrame]:
+        """
+        Frame an interrupted run on the target was loading, or None
+
+        A resumed run loads it instead of fetching, validating and filtering
+        the dataset again; its fingerprint matches the interrupted run's
+        checkpoints, so loading continues at the first unfinished batch.
+        """
+        if self.state_store is None or self._run_id is None:
+            return None
+
+        interrupted = self.state_store.interrupted_run(f"{schema_name}.{table_name}", exclude=self._run_id)
+        if interrupted is None:
+            return None
+
+        df = self.state_store.load_frame(interrupted)
+        if df is not None:
+            self.logger.info(f"Resuming run {interrupted} with its {len(df)} stored rows, "
+                             f"skipping download and validation")
+        return df
+
+    def _resume_from_checkpoints(self, df: pd.DataFrame, schema_name: str,
+                                 table_name: str) -> tuple:
+        """
+        Give the frame positional row numbers and drop rows an interrupted run committed
+
+        Returns:
+            (frame still to load, counts committed by the interrupted run)
+        """
+        resumed = {'inserted': 0, 'updated': 0, 'failed': 0}
+        df = df.reset_index(drop=True)
+        if self.state_store is None or self._run_id is None:
+            return df, resumed
+
+        target = f"{schema_name}.{table_name}"
+        resumed_from = self.state_store.resume_run(self._run_id, target, frame_fingerprint(df), len(df))
+        self._checkpointing = True
+        if resumed_from is None:
+            self.state_store.save_frame(self._run_id, df)
+            return df, resumed
+
+        committed = self.state_store.committed_mask(self._run_id, len(df))
+        last_batch = self.state_store.last_batch(self._run_id)
+        self._batch_numbers = itertools.count(last_batch + 1)
+        self._track_loaded(df[committed])
+
+        resumed['inserted'], resumed['updated'] = self.state_store.committed_counts(self._run_id)
+
+        self.metrics.run.update({'resumed_from': resumed_from, 'rows_resumed': int(committed.sum())})
+        self.logger.info(f"Resuming run {resumed_from}: {int(committed.sum())} of {len(df)} rows were "
+                         f"committed in batches up to {last_batch}, continuing at batch {last_batch + 1}")
+        return df[~committed], resumed
+
+    def _track_loaded(self, df: pd.DataFrame):
+        """Raise the run's watermarks to the latest committed date per ticker"""
+        if self.state_store is None or df.empty or 'Ticker' not in df.columns:
+            return
+
+        latest = df.groupby('Ticker', observed=True)['Date'].max()
+        with self._state_lock:
+            for ticker, last_date in zip(latest.index.astype(str), latest.to_numpy()):
+                if ticker not in self._loaded_watermarks or last_date > self._loaded_watermarks[ticker]:
+                    self._loaded_watermarks[ticker] = last_date
+
+    def _record_committed_batch(self, batch_num: int, df_batch: pd.DataFrame, inserted: int, updated: int):
+        """Checkpoint a committed batch and track its watermarks"""
+        if self.state_store is None:
+            return
+
+        self._track_loaded(df_batch)
+        if self._checkpointing:
+            self.state_store.record_checkpoint(self._run_id, batch_num, df_batch.index, inserted, updated)
+
+    def _save_watermarks(self, schema_name: str, table_name: str, stats: Dict[str, Any]):
+        """Store the watermarks after a complete load, confirmed by the final table stats"""
+        if self.state_store is None:
+            return
+
+        target = f"{schema_name}.{table_name}"
+        if self._watermark_base is None or 'total_rows' not in stats:
+            # Without a confirmed starting point the next run reads them from HANA
+            self.state_store.forget_watermarks(target)
+            return
+
+        watermarks = {ticker: pd.Timestamp(last_date) for ticker, last_date in self._watermark_base.items()}
+        for ticker, last_date in self._loaded_watermarks.items():
+            last_date = pd.Timestamp(last_date)
+            if ticker not in watermarks or last_date > watermarks[ticker]:
+                watermarks[ticker] = last_date
+
+        self.state_store.save_watermarks(target, watermarks, stats['total_rows'], stats.get('max_date'))
+
+    def _record_load_reports(self):
+        """Copy the fetched frame's compact-dtype savings, parse throughput and download time into the metrics"""
+        report = dict(getattr(self.kaggle_client, 'memory_report', None) or {})
+        before = report.get('uncompacted_bytes', 0)
+        after = report.get('compact_bytes', 0)
+        if before:
+            report['saved_pct'] = round((1 - after / before) * 100, 1)
+            self.logger.info(f"Compact dtypes: {before / 1048576:.1f} MB -> {after / 1048576:.1f} MB "
+                             f"({report['saved_pct']}% saved)")
+        self.metrics.memory = report
+        self.metrics.parse = dict(getattr(self.kaggle_client, 'parse_report', None) or {})
+
+        # Parts of the extract stage measured by the client
+        download = getattr(self.kaggle_client, 'download_report', None) or {}
+        if download:
+            self.metrics.record_stage('download', download['seconds'], nbytes=download['bytes'])
+        if self.metrics.parse.get('seconds'):
+            self.metrics.record_stage('parse', self.metrics.parse['seconds'],
+                                      nbytes=int(self.metrics.parse['megabytes'] * 1048576))
+
+    def _finish_run(self, schema_name: str, table_name: str, step: int) -> Dict[str, Any]:
+        """Retrieve final table statistics, stop the metrics and log the summary"""
+        self.logger.info(f"\n[STEP {step}] Retrieving final statistics...")
+        with self._stage('table_stats'):
+            stats = self.sink.get_table_stats(schema_name, table_name)
+        self._record_load_reports()
+
+        # Only a complete load lets the next run skip this dataset version
+        if self.metrics.rows_failed == 0:
+            self.kaggle_client.mark_dataset_loaded(self._load_target(schema_name, table_name))
+            self._save_watermarks(schema_name, table_name, stats)
+
+        self.metrics.stop()
+        self.metrics.log_summary(self.logger)
+
+        self.logger.info("\n" + "=" * 80)
+        self.logger.info("HANA TABLE STATISTICS")
+        self.logger.info("=" * 80)
+        self.logger.info(f"Total rows in table: {stats.get('total_rows', 'N/A')}")
+        self.logger.info(f"Unique tickers: {stats.get('unique_tickers', 'N/A')}")
+        self.logger.info(f"Date range: {stats.get('min_date', 'N/A')} to {stats.get('max_date', 'N/A')}")
+        self.logger.info("=" * 80)
+
+        return self.metrics.to_dict()
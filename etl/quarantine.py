@@ -0,0 +1,147 @@
+"""
+Dead-letter quarantine for rows rejected by validation or by HANA
+Rejected rows are buffered and written in bulk to typed columnar files, one directory per run
+"""
+
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.columnar import is_columnar_file, read_frame, write_frame
+from utils.schema import apply_compact_dtypes, concat_frames
+
+# Reason codes stored with every quarantined row
+REASON_DUPLICATE = 'DUPLICATE'
+REASON_INVALID_DATE = 'INVALID_DATE'
+REASON_INVALID_PRICE = 'INVALID_PRICE'
+REASON_HIGH_BELOW_LOW = 'HIGH_BELOW_LOW'
+REASON_WRITE_ERROR = 'WRITE_ERROR'
+
+# Columns added to the stock columns of a quarantined row
+REASON_COLUMN = 'REASON'
+DETAIL_COLUMN = 'DETAIL'
+
+# Rows only rejected by HANA are worth replaying without a data fix
+REPLAYABLE_REASONS = (REASON_WRITE_ERROR,)
+
+
+class Quarantine:
+    """
+    Collect rejected rows of one run and write them as columnar parts
+
+    Rows are kept in memory until flush_rows are buffered or the run closes
+    the quarantine, then written as one part file with REASON and DETAIL
+    columns. Both are categoricals, so repeated codes and error messages cost
+    a few bytes per row. Safe to use from several writer threads.
+    """
+
+    def __init__(self, directory, label: str, logger: Optional[logging.Logger] = None,
+                 flush_rows: int = 100000):
+        self.path = Path(directory) / label
+        self.logger = logger or logging.getLogger(__name__)
+        self.flush_rows = flush_rows
+        self.counts: Dict[str, int] = {}
+        self.parts: List[Path] = []
+        self._buffer: List[pd.DataFrame] = []
+        self._buffered = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rows(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, df: pd.DataFrame, reason: str, detail: Union[str, Iterable[str], None] = None):
+        """
+        Quarantine rows with a reason code
+
+        Args:
+            df: Rejected rows
+            reason: One of the REASON_* codes
+            detail: Error message for all rows, or one message per row
+        """
+        if df.empty:
+            return
+
+        rejected = df.copy()
+        rejected[REASON_COLUMN] = pd.Categorical([reason] * len(rejected))
+        if detail is None or isinstance(detail, str):
+            rejected[DETAIL_COLUMN] = pd.Categorical([detail or ''] * len(rejected))
+        else:
+            rejected[DETAIL_COLUMN] = pd.Categorical(list(detail))
+
+        with self._lock:
+            self.counts[reason] = self.counts.get(reason, 0) + len(rejected)
+            self._buffer.append(rejected)
+            self._buffered += len(rejected)
+            if self._buffered >= self.flush_rows:
+                self._flush()
+
+    def _flush(self):
+        """Write the buffered rows as the next part (caller holds the lock)"""
+        if not self._buffer:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        frame = concat_frames(self._buffer)
+        self.parts.append(write_frame(self.path / f"part-{len(self.parts):05d}", frame))
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self) -> Dict[str, object]:
+        """
+        Write the remaining rows and summarize the quarantine
+
+        Returns:
+            dict: Directory, row count and rows per reason (empty without rejected rows)
+        """
+        with self._lock:
+            self._flush()
+
+        if not self.rows:
+            return {}
+
+        self.logger.warning(f"Quarantined {self.rows} rejected rows in {self.path}: {self.counts}")
+        return {'path': str(self.path), 'rows': self.rows, 'reasons': dict(self.counts)}
+
+
+def new_quarantine(directory, run_id: Optional[int] = None,
+                   logger: Optional[logging.Logger] = None) -> Quarantine:
+    """Open the quarantine of a run, labeled by its state-store run id or its start time"""
+    label = f"run-{run_id:06d}" if run_id is not None else f"run-{datetime.now():%Y%m%d%H%M%S%f}"
+    return Quarantine(directory, label, logger=logger)
+
+
+def read_quarantine(path, reasons: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Read quarantined rows back
+
+    Args:
+        path: A run's quarantine directory or a single part file
+        reasons: Only return rows with these reason codes (default: all)
+
+    Returns:
+        DataFrame: Stock columns plus REASON and DETAIL
+    """
+    path = Path(path)
+    parts = [path] if is_columnar_file(path) else sorted(
+        child for child in path.iterdir() if is_columnar_file(child)
+    )
+    if not parts:
+        return pd.DataFrame()
+
+    df = concat_frames([read_frame(part) for part in parts])
+    if reasons is not None:
+        df = df[np.isin(df[REASON_COLUMN].astype(str).to_numpy(), list(reasons))]
+    return df.reset_index(drop=True)
+
+
+def strip_quarantine_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop REASON and DETAIL and restore the compact stock dtypes"""
+    df = df.drop(columns=[REASON_COLUMN, DETAIL_COLUMN], errors='ignore')
+    df, _, _ = apply_compact_dtypes(df)
+    return df
@@ -0,0 +1,343 @@
+"""
+Embedded run-state store for the ETL pipeline
+Keeps per-ticker watermarks, batch checkpoints and run history in SQLite under data_dir,
+and the frame each checkpointed run loads as a columnar file next to it
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.columnar import is_columnar_file, read_frame, remove_frame, write_frame
+
+STATE_DB_FILE = "etl_state.sqlite"
+
+# Directory next to the store holding the frames of checkpointed runs
+RUN_FRAMES_DIR = "run_frames"
+
+# Runs that stopped before completing and may be resumed
+INCOMPLETE_STATUSES = ('running', 'failed', 'partial')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    target TEXT NOT NULL,
+    mode TEXT,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    fingerprint TEXT,
+    rows_total INTEGER,
+    resumed_from INTEGER,
+    metrics TEXT
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id INTEGER NOT NULL,
+    batch_num INTEGER NOT NULL,
+    start_row INTEGER NOT NULL,
+    end_row INTEGER NOT NULL,
+    inserted INTEGER NOT NULL,
+    updated INTEGER NOT NULL,
+    committed_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, batch_num, start_row)
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    target TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    last_date TEXT NOT NULL,
+    PRIMARY KEY (target, ticker)
+);
+CREATE TABLE IF NOT EXISTS targets (
+    target TEXT PRIMARY KEY,
+    total_rows INTEGER NOT NULL,
+    max_date TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def index_ranges(index) -> List[Tuple[int, int]]:
+    """
+    Compress integer row positions into half-open (start, end) ranges.
+
+    Args:
+        index: Sorted integer positions, e.g. a batch's DataFrame index
+
+    Returns:
+        list: (start, end) pairs covering exactly the given positions
+    """
+    positions = np.asarray(index, dtype=np.int64)
+    if not len(positions):
+        return []
+
+    breaks = np.flatnonzero(np.diff(positions) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(positions)]))
+    return [(int(positions[s]), int(positions[e - 1]) + 1) for s, e in zip(starts, ends)]
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a frame's values, independent of its index and categories"""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return f"{len(df)}:{hashlib.sha256(hashes.tobytes()).hexdigest()}"
+
+
+def _iso(value) -> Optional[str]:
+    """Date-like value -> 'YYYY-MM-DD'"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return str(pd.Timestamp(value).date())
+
+
+class RunStateStore:
+    """
+    SQLite store of watermarks, batch checkpoints and run history
+
+    A target is identified as "SCHEMA.TABLE". Watermarks are stored together
+    with the target's row count and maximum date at the time they were taken,
+    so a caller can confirm them against HANA with one aggregate query.
+    Checkpoints are half-open row ranges of the frame a run loads; that frame
+    is kept in RUN_FRAMES_DIR until a run on the target completes, so a resumed
+    run does not have to fetch and validate it again. Writes are committed
+    immediately and serialized, so writer threads may share a store.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['RunStateStore']:
+        """Open the store under paths.data_dir, or return None when it is disabled or has no location"""
+        data_dir = config.get('paths', {}).get('data_dir')
+        if not data_dir or not config.get('etl', {}).get('state_store', True):
+            return None
+        return cls(Path(data_dir) / STATE_DB_FILE)
+
+    def _execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            self._db.commit()
+            return cursor
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # Run history
+
+    def begin_run(self, target: str, mode: str) -> int:
+        """Record the start of a run and return its id"""
+        cursor = self._execute(
+            "INSERT INTO runs (target, mode, status, started_at) VALUES (?, ?, 'running', ?)",
+            (target, mode, datetime.now().isoformat())
+        )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int, status: str, metrics: Optional[Dict[str, Any]] = None):
+        """Record the outcome and metrics of a run; a completed run drops the target's stored frames"""
+        self._execute(
+            "UPDATE runs SET status = ?, finished_at = ?, metrics = ? WHERE run_id = ?",
+            (status, datetime.now().isoformat(), json.dumps(metrics, default=str) if metrics else None, run_id)
+        )
+        if status == 'completed':
+            rows = self._query("SELECT run_id FROM runs WHERE target = (SELECT target FROM runs WHERE run_id = ?) "
+                               "AND run_id <= ?", (run_id, run_id))
+            for (finished,) in rows:
+                self.discard_frame(finished)
+
+    def has_incomplete_run(self, target: str, exclude: Optional[int] = None) -> bool:
+        """Whether an earlier run on the target stopped after committing checkpoints"""
+        return self._interrupted_run(target, exclude=exclude) is not None
+
+    def interrupted_run(self, target: str, exclude: Optional[int] = None) -> Optional[int]:
+        """Id of the latest run on the target that stopped after committing checkpoints, or None"""
+        return self._interrupted_run(target, exclude=exclude)
+
+    def _interrupted_run(self, target: str, fingerprint: Optional[str] = None,
+                         exclude: Optional[int] = None) -> Optional[int]:
+        """Latest run since the last completed one that left checkpoints behind"""
+        rows = self._query(
+            f"""
+            SELECT r.run_id, r.fingerprint FROM runs r
+            WHERE r.target = ? AND r.run_id != ?
+              AND r.status IN ({', '.join('?' * len(INCOMPLETE_STATUSES))})
+              AND r.run_id > COALESCE((SELECT MAX(run_id) FROM runs
+                                       WHERE target = ? AND status = 'completed'), 0)
+              AND EXISTS (SELECT 1 FROM checkpoints c WHERE c.run_id = r.run_id)
+            ORDER BY r.run_id DESC LIMIT 1
+            """,
+            (target, exclude or -1, *INCOMPLETE_STATUSES, target)
+        )
+        if not rows:
+            return None
+        run_id, run_fingerprint = rows[0]
+        if fingerprint is not None and run_fingerprint != fingerprint:
+            return None
+        return run_id
+
+    def resume_run(self, run_id: int, target: str, fingerprint: str, rows_total: int) -> Optional[int]:
+        """
+        Attach the frame to load to a run and adopt an interrupted run's checkpoints.
+
+        The checkpoints and stored frame of the latest interrupted run on the
+        target are taken over by this run when it loaded a frame with the
+        same fingerprint, so a run that is interrupted again still knows
+        every committed range.
+
+        Returns:
+            int: Id of the run resumed from, or None for a fresh load
+        """
+        resumed_from = self._interrupted_run(target, fingerprint=fingerprint, exclude=run_id)
+
+        with self._lock:
+            self._db.execute(
+                "UPDATE runs SET fingerprint = ?, rows_total = ?, resumed_from = ? WHERE run_id = ?",
+                (fingerprint, rows_total, resumed_from, run_id)
+            )
+            if resumed_from is not None:
+                self._db.execute(
+                    """
+                    INSERT OR IGNORE INTO checkpoints
+                        (run_id, batch_num, start_row, end_row, inserted, updated, committed_at)
+                    SELECT ?, batch_num, start_row, end_row, inserted, updated, committed_at
+                    FROM checkpoints WHERE run_id = ?
+                    """,
+                    (run_id, resumed_from)
+                )
+            self._db.commit()
+
+        if resumed_from is not None:
+            stored = self._frame_file(resumed_from)
+            if stored is not None:
+                stored.rename(stored.with_name(stored.name.replace(f"run_{resumed_from}.", f"run_{run_id}.", 1)))
+
+        return resumed_from
+
+    def run_history(self, target: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent runs first, with their metrics decoded"""
+        columns = ['run_id', 'target', 'mode', 'status', 'started_at', 'finished_at',
+                   'fingerprint', 'rows_total', 'resumed_from', 'metrics']
+        where, params = ("WHERE target = ?", (target,)) if target else ("", ())
+        rows = self._query(
+            f"SELECT {', '.join(columns)} FROM runs {where} ORDER BY run_id DESC LIMIT ?", (*params, limit)
+        )
+        history = [dict(zip(columns, row)) for row in rows]
+        for run in history:
+            run['metrics'] = json.loads(run['metrics']) if run['metrics'] else None
+        return history
+
+    # Checkpoints
+
+    def record_checkpoint(self, run_id: int, batch_num: int, index, inserted: int, updated: int):
+        """Record the row positions of a committed batch"""
+        committed_at = datetime.now().isoformat()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, batch_num, start, end, inserted, updated, committed_at)
+                 for start, end in index_ranges(index)]
+            )
+            self._db.commit()
+
+    def committed_mask(self, run_id: int, rows_total: int) -> np.ndarray:
+        """Boolean mask over the run's frame of rows already committed"""
+        mask = np.zeros(rows_total, dtype=bool)
+        for start, end in self._query("SELECT start_row, end_row FROM checkpoints WHERE run_id = ?", (run_id,)):
+            mask[start:min(end, rows_total)] = True
+        return mask
+
+    def committed_counts(self, run_id: int) -> Tuple[int, int]:
+        """(inserted, updated) rows of the run's checkpointed batches"""
+        inserted, updated = self._query(
+            """
+            SELECT COALESCE(SUM(inserted), 0), COALESCE(SUM(updated), 0) FROM
+                (SELECT DISTINCT batch_num, inserted, updated FROM checkpoints WHERE run_id = ?)
+            """,
+            (run_id,)
+        )[0]
+        return int(inserted), int(updated)
+
+    def last_batch(self, run_id: int) -> int:
+        """Highest batch number checkpointed for the run (0 without checkpoints)"""
+        return self._query("SELECT COALESCE(MAX(batch_num), 0) FROM checkpoints WHERE run_id = ?", (run_id,))[0][0]
+
+    # Run frames
+
+    def _frame_file(self, run_id: int) -> Optional[Path]:
+        """Columnar file of the frame stored for a run, or None"""
+        directory = self.path.parent / RUN_FRAMES_DIR
+        if not directory.is_dir():
+            return None
+        return next((path for path in directory.glob(f"run_{run_id}.*") if is_columnar_file(path)), None)
+
+    def save_frame(self, run_id: int, df: pd.DataFrame):
+        """Store the frame a run loads, with the positional index its checkpoints refer to"""
+        directory = self.path.parent / RUN_FRAMES_DIR
+        directory.mkdir(exist_ok=True)
+        self.discard_frame(run_id)
+        write_frame(directory / f"run_{run_id}", df)
+
+    def load_frame(self, run_id: int) -> Optional[pd.DataFrame]:
+        """Frame stored for a run, or None when it was not stored or has been dropped"""
+        path = self._frame_file(run_id)
+        return read_frame(path) if path is not None else None
+
+    def discard_frame(self, run_id: int):
+        """Drop the frame stored for a run"""
+        path = self._frame_file(run_id)
+        if path is not None:
+            remove_frame(path)
+
+    # Watermarks
+
+    def watermarks(self, target: str) -> Dict[str, date]:
+        """Stored ticker -> last loaded date"""
+        rows = self._query("SELECT ticker, last_date FROM watermarks WHERE target = ?", (target,))
+        return {ticker: date.fromisoformat(last_date) for ticker, last_date in rows}
+
+    def target_stats(self, target: str) -> Optional[Tuple[int, Optional[str]]]:
+        """(row count, max date) of the target when the watermarks were stored, or None"""
+        rows = self._query("SELECT total_rows, max_date FROM targets WHERE target = ?", (target,))
+        return rows[0] if rows else None
+
+    def save_watermarks(self, target: str, watermarks: Dict[str, Any], total_rows: int, max_date):
+        """Replace the target's watermarks and the table stats they are confirmed by"""
+        with self._lock:
+            self._db.execute("DELETE FROM watermarks WHERE target = ?", (target,))
+            self._db.executemany(
+                "INSERT INTO watermarks VALUES (?, ?, ?)",
+                [(target, str(ticker), _iso(last_date)) for ticker, last_date in watermarks.items()
+                 if _iso(last_date) is not None]
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO targets VALUES (?, ?, ?, ?)",
+                (target, int(total_rows), _iso(max_date), datetime.now().isoformat())
+            )
+            self._db.commit()
+
+    def forget_watermarks(self, target: str):
+        """Drop the target's watermarks so the next run reads them from HANA"""
+        with self._lock:
+            self._db.execute("DELETE FROM watermarks WHERE target = ?", (target,))
+            self._db.execute("DELETE FROM targets WHERE target = ?", (target,))
+            self._db.commit()
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,198 @@
+"""
+Streaming execution for the ETL pipeline
+Runs extract, transform and load as threads connected by bounded queues
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Marks the end of a stream on a stage's input queue
+_END = object()
+
+
+class StageStats:
+    """Timing and throughput counters for one streaming stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.rows = 0
+        self.busy_seconds = 0.0
+        self.idle_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        """
+        Convert stats to dictionary
+
+        busy is time spent doing the stage's own work, idle is time waiting
+        for input from the upstream stage and blocked is time waiting for
+        room in the downstream queue (backpressure).
+        """
+        wall_seconds = max(wall_seconds, 1e-9)
+        return {
+            'items': self.items,
+            'rows': self.rows,
+            'busy_seconds': round(self.busy_seconds, 4),
+            'idle_seconds': round(self.idle_seconds, 4),
+            'blocked_seconds': round(self.blocked_seconds, 4),
+            'utilization': round(min(self.busy_seconds / wall_seconds, 1.0), 4)
+        }
+
+
+class StreamingExecutor:
+    """Run a source and a chain of stages concurrently over bounded queues"""
+
+    def __init__(self, queue_size: int = 4, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the executor
+
+        Args:
+            queue_size: Maximum number of chunks buffered between two stages
+            logger: Logger for progress and errors
+        """
+        self.queue_size = max(1, int(queue_size))
+        self.logger = logger or logging.getLogger(__name__)
+        self.wall_seconds = 0.0
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def _put(self, out_queue: queue.Queue, item, stats: StageStats) -> bool:
+        """Put an item downstream, waiting while the queue is full. Returns False on abort."""
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    out_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            stats.blocked_seconds += time.perf_counter() - started
+
+    def _get(self, in_queue: queue.Queue, stats: StageStats):
+        """Take the next item from upstream. Returns _END on end of stream or abort."""
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return in_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _END
+        finally:
+            stats.idle_seconds += time.perf_counter() - started
+
+    def _fail(self, stage_name: str, error: BaseException):
+        """Record the first error and stop every stage"""
+        if self._error is None:
+            self._error = error
+            self.logger.error(f"Streaming stage '{stage_name}' failed: {str(error)}")
+        self._stop.set()
+
+    def _run_source(self, source: Iterable, out_queue: queue.Queue, stats: StageStats):
+        """Pull chunks from the source iterator and feed them downstream"""
+        try:
+            iterator = iter(source)
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    stats.busy_seconds += time.perf_counter() - started
+
+                stats.items += 1
+                stats.rows += len(chunk)
+                if not self._put(out_queue, chunk, stats):
+                    return
+        except BaseException as e:
+            self._fail(stats.name, e)
+        finally:
+            self._put_end(out_queue)
+
+    def _run_stage(self, func: Callable, in_queue: queue.Queue, out_queue: Optional[queue.Queue],
+                   stats: StageStats):
+        """Apply func to each chunk from upstream and pass non-empty results on"""
+        try:
+            while True:
+                chunk = self._get(in_queue, stats)
+                if chunk is _END:
+                    break
+
+                started = time.perf_counter()
+                result = func(chunk)
+                stats.busy_seconds += time.perf_counter() - started
+                stats.items += 1
+                stats.rows += len(chunk)
+
+                if out_queue is not None and result is not None and len(result) > 0:
+                    if not self._put(out_queue, result, stats):
+                        return
+        except BaseException as e:
+            self._fail(stats.name, e)
+        finally:
+            if out_queue is not None:
+                self._put_end(out_queue)
+
+    def _put_end(self, out_queue: queue.Queue):
+        """Signal end of stream, dropping buffered chunks if the run was aborted"""
+        while True:
+            try:
+                out_queue.put(_END, timeout=0.1)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    try:
+                        out_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def run(self, source: Tuple[str, Iterable], stages: List[Tuple[str, Callable]]) -> Dict[str, StageStats]:
+        """
+        Run the source and stages until the source is exhausted
+
+        Args:
+            source: (name, iterable of DataFrame chunks)
+            stages: [(name, func)] applied in order; a func returns the chunk
+                for the next stage (None or empty drops it), the last stage's
+                return value is ignored
+
+        Returns:
+            Dictionary of stage name to StageStats
+
+        Raises:
+            The first exception raised by any stage
+        """
+        source_name, source_iter = source
+        stats = {source_name: StageStats(source_name)}
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in stages]
+
+        threads = [threading.Thread(
+            target=self._run_source, args=(source_iter, queues[0], stats[source_name]),
+            name=f"etl-{source_name}", daemon=True
+        )]
+        for index, (name, func) in enumerate(stages):
+            stats[name] = StageStats(name)
+            out_queue = queues[index + 1] if index + 1 < len(queues) else None
+            threads.append(threading.Thread(
+                target=self._run_stage, args=(func, queues[index], out_queue, stats[name]),
+                name=f"etl-{name}", daemon=True
+            ))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.wall_seconds = time.perf_counter() - started
+
+        if self._error is not None:
+            raise self._error
+
+        return stats
@@ -0,0 +1,197 @@
+"""
+Performance telemetry for ETL runs: latency histograms, peak memory and a
+Prometheus textfile export of the run metrics
+"""
+
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Upper bounds of the batch latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Latency quantiles reported per run
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+PROMETHEUS_PREFIX = "etl"
+
+
+def frame_bytes(df: Optional[pd.DataFrame]) -> int:
+    """In-memory size of a frame, including the values of object columns"""
+    if df is None:
+        return 0
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, or None where getrusage is unavailable"""
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+def traced_peak_bytes() -> Optional[int]:
+    """Peak of the memory traced by tracemalloc, or None when it is not tracing"""
+    if not tracemalloc.is_tracing():
+        return None
+    return tracemalloc.get_traced_memory()[1]
+
+
+def latency_summary(seconds: Iterable[float]) -> Dict[str, Any]:
+    """
+    Quantiles and cumulative histogram of a set of latencies
+
+    Args:
+        seconds: One latency per batch
+
+    Returns:
+        dict: count, sum, mean, max, p50/p95/p99 and the cumulative count
+            per LATENCY_BUCKETS upper bound (empty without latencies)
+    """
+    values = np.asarray(list(seconds), dtype=np.float64)
+    if not len(values):
+        return {}
+
+    summary = {
+        'count': int(len(values)),
+        'sum': round(float(values.sum()), 4),
+        'mean': round(float(values.mean()), 4),
+        'max': round(float(values.max()), 4)
+    }
+    for quantile, value in zip(LATENCY_QUANTILES, np.quantile(values, LATENCY_QUANTILES)):
+        summary[f"p{int(quantile * 100)}"] = round(float(value), 4)
+
+    counts = np.searchsorted(np.sort(values), LATENCY_BUCKETS, side='right')
+    summary['buckets'] = {str(bound): int(count) for bound, count in zip(LATENCY_BUCKETS, counts)}
+    return summary
+
+
+def _escape(value) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _value(value) -> str:
+    """Render a sample value; integral values keep every digit"""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    """Render a Prometheus label set"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class _TextfileWriter:
+    """Collect samples grouped by metric family, each family with one HELP and TYPE line"""
+
+    def __init__(self, labels: Dict[str, Any]):
+        self.labels = labels
+        self.lines = []
+
+    def family(self, name: str, kind: str, help_text: str, samples):
+        """Add a metric family; samples are (suffix, extra labels, value) tuples"""
+        samples = [(suffix, extra, value) for suffix, extra, value in samples if value is not None]
+        if not samples:
+            return
+        metric = f"{PROMETHEUS_PREFIX}_{name}"
+        self.lines.append(f"# HELP {metric} {help_text}")
+        self.lines.append(f"# TYPE {metric} {kind}")
+        for suffix, extra, value in samples:
+            self.lines.append(f"{metric}{suffix}{_labels({**self.labels, **extra})} {_value(value)}")
+
+    def gauge(self, name: str, help_text: str, value, **extra):
+        self.family(name, 'gauge', help_text, [('', extra, value)])
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def prometheus_text(metrics: Dict[str, Any], labels: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Render the metrics of a run in the Prometheus text exposition format
+
+    Args:
+        metrics: ETLMetrics.to_dict() of the run
+        labels: Labels added to every sample, e.g. the target table
+
+    Returns:
+        str: Text for a node exporter textfile collector
+    """
+    writer = _TextfileWriter(labels or {})
+
+    if metrics.get('end_time'):
+        writer.gauge('last_run_timestamp_seconds', "End of the last ETL run (Unix time)",
+                     pd.Timestamp(metrics['end_time']).timestamp())
+    writer.gauge('run_duration_seconds', "Duration of the last ETL run", metrics.get('duration_seconds'))
+    writer.gauge('run_skipped', "1 if the last run was skipped because the dataset was unchanged",
+                 int(bool(metrics.get('skipped'))))
+    writer.gauge('run_success_ratio', "Written rows over fetched rows of the last run",
+                 metrics.get('success_rate', 0) / 100)
+
+    writer.family('rows', 'gauge', "Rows per pipeline outcome in the last run", [
+        ('', {'outcome': outcome}, metrics.get(f"rows_{outcome}"))
+        for outcome in ('fetched', 'validated', 'inserted', 'updated', 'failed')
+    ])
+    writer.gauge('errors', "Errors recorded in the last run", metrics.get('errors_count'))
+    writer.gauge('warnings', "Warnings recorded in the last run", metrics.get('warnings_count'))
+
+    timings = metrics.get('timings') or {}
+    for field, name, help_text in (
+        ('seconds', 'stage_seconds', "Busy seconds per stage"),
+        ('calls', 'stage_calls', "Calls per stage"),
+        ('rows', 'stage_rows', "Rows processed per stage"),
+        ('bytes', 'stage_bytes', "Bytes processed per stage"),
+        ('rows_per_second', 'stage_rows_per_second', "Rows per busy second per stage"),
+        ('bytes_per_second', 'stage_bytes_per_second', "Bytes per busy second per stage")
+    ):
+        writer.family(name, 'gauge', help_text, [
+            ('', {'stage': stage}, timing.get(field)) for stage, timing in timings.items()
+        ])
+
+    latency = metrics.get('batch_latency') or {}
+    if latency:
+        buckets = [('_bucket', {'le': bound}, count) for bound, count in latency['buckets'].items()]
+        buckets.append(('_bucket', {'le': '+Inf'}, latency['count']))
+        writer.family('batch_latency_seconds', 'histogram', "Latency of committed batch writes",
+                      buckets + [('_sum', {}, latency['sum']), ('_count', {}, latency['count'])])
+        writer.family('batch_latency_quantile_seconds', 'gauge', "Batch write latency quantiles", [
+            ('', {'quantile': str(quantile)}, latency.get(f"p{int(quantile * 100)}"))
+            for quantile in LATENCY_QUANTILES
+        ])
+
+    peak = metrics.get('peak_memory') or {}
+    writer.gauge('peak_rss_bytes', "Peak resident set size of the ETL process", peak.get('rss_bytes'))
+    writer.gauge('peak_traced_bytes', "Peak Python memory traced by tracemalloc", peak.get('traced_bytes'))
+
+    return writer.text()
+
+
+def write_prometheus_textfile(metrics: Dict[str, Any], path, labels: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Write the metrics of a run as a .prom file, replacing the previous one atomically
+
+    The file is written next to its destination and renamed, so the node
+    exporter never scrapes a partly written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(prometheus_text(metrics, labels))
+    os.replace(temporary, path)
+    return path
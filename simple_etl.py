@@ -8,6 +8,8 @@ Features: Incremental loading, batch processing, data quality validation, monito
 
 import os
 import sys
+import argparse
+import asyncio
 import logging
 import json
 from datetime import datetime
@@ -18,16 +20,62 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from utils.config import setup_logging, load_config
 from api.kaggle_api import KaggleApiClient
 from db.hana_client import HanaClient
+from db.sinks import SINK_TYPES, create_sink
 from etl.pipeline import ETLPipeline
+from etl.profiling import TRANSFORM_STAGES, StageProfiler
+from etl.quarantine import REPLAYABLE_REASONS
+from etl.telemetry import write_prometheus_textfile
+from utils.tracing import span, start_tracing, stop_tracing
 
 # Set up logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-def main():
+# Run metrics for monitoring; --profile writes next to them by default
+METRICS_FILE = 'etl_metrics.json'
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Fetch S&P 500 data from Kaggle and push it to SAP HANA")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="bulk-reload the rows of a quarantine directory (data/quarantine/run-...) "
+                             "instead of running the pipeline")
+    parser.add_argument('--replay-all', action='store_true',
+                        help="with --replay, also replay rows removed by validation, not only rows HANA rejected")
+    parser.add_argument('--sink', choices=SINK_TYPES,
+                        help="load into SAP HANA or a local SQLite or Parquet sink under data/ (default: ETL_SINK)")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="overlap the Kaggle download with the HANA table setup and write batches concurrently")
+    parser.add_argument('--trace', metavar='PATH', nargs='?', const='etl_trace.json',
+                        help="record tracing spans and write them as Chrome trace JSON for Perfetto "
+                             "(default: etl_trace.json)")
+    parser.add_argument('--profile', metavar='DIR', nargs='?',
+                        const=os.path.dirname(os.path.abspath(METRICS_FILE)),
+                        help="profile each pipeline stage with cProfile and write <stage>.pstats files and a "
+                             f"hot-function summary to DIR (default: the directory of {METRICS_FILE})")
+    parser.add_argument('--profile-top', metavar='N', type=int, default=25,
+                        help="with --profile, number of functions listed per stage (default: 25)")
+    parser.add_argument('--profile-memory', metavar='STAGES', nargs='?', const=','.join(TRANSFORM_STAGES),
+                        help="with --profile, take tracemalloc snapshots around the given comma-separated "
+                             f"stages (default: {','.join(TRANSFORM_STAGES)})")
+    args = parser.parse_args(argv)
+    if args.profile_memory and not args.profile:
+        parser.error("--profile-memory requires --profile")
+    return args
+
+def main(argv=None):
     """
     Main ETL function - fetch from Kaggle and push to HANA using advanced pipeline.
     """
+    args = parse_args(argv)
+    if args.trace:
+        start_tracing()
+    profiler = None
+    if args.profile:
+        allocation_stages = [stage.strip() for stage in (args.profile_memory or '').split(',') if stage.strip()]
+        profiler = StageProfiler(args.profile, top_n=args.profile_top, allocation_stages=allocation_stages)
+    pipeline = None
+
     try:
         logger.info("="*80)
         logger.info("Starting Advanced Kaggle to HANA ETL Process")
@@ -36,52 +84,76 @@ def main():
         # Load configuration
         logger.info("Loading configuration...")
         config = load_config()
+        if args.sink:
+            config['etl']['sink'] = args.sink
 
-        # Initialize clients
-        logger.info("Initializing Kaggle and HANA clients...")
-        kaggle_client = KaggleApiClient(config)
-        hana_client = HanaClient(config)
+        # Initialize clients; a local sink replaces the HANA client for dry runs
+        logger.info("Initializing Kaggle and target clients...")
+        kaggle_client = None if args.replay else KaggleApiClient(config)
+        hana_client = create_sink(config) or HanaClient(config)
+        target = getattr(hana_client, 'name', 'SAP HANA')
 
-        # Connect to HANA
-        logger.info("Connecting to SAP HANA...")
+        # Connect to the target
+        logger.info(f"Connecting to {target}...")
         if not hana_client.connect():
-            logger.error("Failed to connect to SAP HANA")
+            logger.error(f"Failed to connect to {target}")
             return 1
 
-        logger.info("✅ Connected to SAP HANA")
+        logger.info(f"✅ Connected to {target}")
 
         # Get schema and table names
         schema_name = config['hana']['schema']
         table_name = config['hana']['table']
 
-        # Create schema if not exists
-        logger.info(f"Ensuring schema '{schema_name}' exists...")
-        if not hana_client.create_schema_if_not_exists(schema_name):
-            logger.error(f"Failed to create schema: {schema_name}")
-            hana_client.close()
-            return 1
-
-        # Create table if not exists
-        logger.info(f"Ensuring table '{schema_name}.{table_name}' exists...")
-        if not hana_client.create_table(schema_name, table_name):
-            logger.error(f"Failed to create table: {schema_name}.{table_name}")
-            hana_client.close()
-            return 1
+        # The async run ensures schema and table itself, overlapped with the download
+        if not (args.use_async and not args.replay):
+            # Create schema if not exists
+            logger.info(f"Ensuring schema '{schema_name}' exists...")
+            if not hana_client.create_schema_if_not_exists(schema_name):
+                logger.error(f"Failed to create schema: {schema_name}")
+                hana_client.close()
+                return 1
+
+            # Create table if not exists
+            logger.info(f"Ensuring table '{schema_name}.{table_name}' exists...")
+            if not hana_client.create_table(schema_name, table_name):
+                logger.error(f"Failed to create table: {schema_name}.{table_name}")
+                hana_client.close()
+                return 1
 
         # Initialize ETL Pipeline
         logger.info("Initializing advanced ETL pipeline...")
-        pipeline = ETLPipeline(kaggle_client, hana_client, config)
-
-        # Run the pipeline with incremental loading enabled
-        logger.info("Running ETL pipeline...")
-        metrics = pipeline.run(schema_name, table_name, incremental=True)
+        pipeline = ETLPipeline(kaggle_client, hana_client, config, profiler=profiler)
+
+        if args.replay:
+            # Reload quarantined rows only, the extract is not repeated
+            logger.info(f"Replaying quarantined rows from {args.replay}...")
+            reasons = None if args.replay_all else REPLAYABLE_REASONS
+            with span('replay_quarantine', path=args.replay):
+                metrics = pipeline.replay_quarantine(args.replay, schema_name, table_name, reasons=reasons)
+        elif args.use_async:
+            logger.info("Running ETL pipeline with overlapped I/O...")
+            with span('run_async', target=f"{schema_name}.{table_name}"):
+                metrics = asyncio.run(pipeline.run_async(schema_name, table_name, incremental=True))
+        else:
+            # Run the pipeline with incremental loading enabled
+            logger.info("Running ETL pipeline...")
+            with span('run', target=f"{schema_name}.{table_name}"):
+                metrics = pipeline.run(schema_name, table_name, incremental=True)
 
         # Save metrics to file for monitoring
-        metrics_file = 'etl_metrics.json'
-        with open(metrics_file, 'w') as f:
+        with open(METRICS_FILE, 'w') as f:
             json.dump(metrics, f, indent=2)
 
-        logger.info(f"\n✅ Metrics saved to {metrics_file}")
+        logger.info(f"\n✅ Metrics saved to {METRICS_FILE}")
+
+        # Same metrics for the node exporter's textfile collector
+        prometheus_file = config['etl'].get('prometheus_textfile')
+        if prometheus_file:
+            write_prometheus_textfile(metrics, prometheus_file, labels={'target': f"{schema_name}.{table_name}"})
+            logger.info(f"Prometheus metrics written to {prometheus_file}")
+        if pipeline.state_store is not None:
+            logger.info(f"Run history kept in {pipeline.state_store.path}")
 
         # Close connection
         hana_client.close()
@@ -93,6 +165,17 @@ def main():
         logger.error(f"\n❌ ETL Process failed: {str(e)}", exc_info=True)
         return 1
 
+    finally:
+        # Also written for failed runs, which are the ones worth inspecting
+        if args.trace:
+            tracer = stop_tracing(args.trace)
+            logger.info(f"Trace with {len(tracer.events)} spans written to {args.trace}")
+        if profiler is not None:
+            profiler.write()
+        # Failed runs are recorded in the state store too and must release it
+        if pipeline is not None and pipeline.state_store is not None:
+            pipeline.state_store.close()
+
 if __name__ == '__main__':
     exit_code = main()
     sys.exit(exit_code)
@@ -0,0 +1,64 @@
+"""
+Fixtures shared by the pipeline tests, which run offline against
+LocalKaggleApi, the fake hdbcli driver and the local sinks
+"""
+
+import pytest
+
+from api.kaggle_api import KaggleApiClient
+from benchmarks.fake_hdbcli import FakeDatabase, installed
+from db.hana_client import HanaClient
+from etl.pipeline import ETLPipeline
+
+SCHEMA = "TEST"
+TABLE = "STOCK_PRICES"
+
+
+def _connect(config, target):
+    """Connected HanaClient on a FakeDatabase, or the given local sink connected"""
+    if isinstance(target, FakeDatabase):
+        with installed(target):
+            client = HanaClient(config)
+            client.connect()
+    else:
+        client = target
+        client.connect()
+    return client
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Offline configuration with downloads and data under the test's directory"""
+    return {
+        'kaggle': {'username': '', 'key': '', 'dataset_name': 'test/sp500'},
+        'hana': {'address': 'localhost', 'port': 443, 'user': 'test', 'password': '', 'schema': SCHEMA},
+        'paths': {'downloads_dir': str(tmp_path / 'downloads'), 'data_dir': str(tmp_path / 'data')},
+        'etl': {'batch_size': 25},
+    }
+
+
+@pytest.fixture
+def run_pipeline():
+    """
+    One scheduled run: fresh clients and pipeline, as simple_etl.py creates them
+
+    The returned function takes the config, the Kaggle API stand-in and a
+    FakeDatabase or db.sinks.Sink to load into, plus the table name, an
+    optional StageProfiler and keyword arguments of ETLPipeline.run, and
+    returns the run's metrics.
+    """
+    def run(config, kaggle_api, target, table=TABLE, **options):
+        client = _connect(config, target)
+        client.create_schema_if_not_exists(SCHEMA)
+        client.create_table(SCHEMA, table)
+
+        pipeline = ETLPipeline(KaggleApiClient(config, api=kaggle_api), client, config,
+                               profiler=options.pop('profiler', None))
+        try:
+            return pipeline.run(SCHEMA, table, incremental=options.pop('incremental', True), **options)
+        finally:
+            pipeline.state_store.close()
+            if not isinstance(target, FakeDatabase):
+                client.close()
+
+    return run
@@ -0,0 +1,48 @@
+"""
+AdaptiveBatchSizer sizing, failure halving and backoff
+"""
+
+from etl.batching import AdaptiveBatchSizer
+
+
+def test_failed_rows_halve_the_batch_down_to_the_minimum():
+    sizer = AdaptiveBatchSizer(initial_size=1000, min_size=100, target_seconds=1.0)
+
+    # Fast enough to grow, but the failures shrink it instead
+    sizer.record(1000, 0.1, failed=3)
+    assert sizer.next_size() == 500
+
+    for _ in range(5):
+        sizer.record(sizer.next_size(), 0.1, failed=1)
+    assert sizer.next_size() == 100
+
+
+def test_growth_is_capped_per_batch():
+    sizer = AdaptiveBatchSizer(initial_size=1000, max_size=20000, target_seconds=1.0)
+
+    sizer.record(1000, 0.01)
+    assert sizer.next_size() == 2000
+
+
+def test_backoff_only_above_twice_the_target():
+    sizer = AdaptiveBatchSizer(initial_size=1000, target_seconds=1.0, slow_factor=2.0)
+
+    sizer.record(1000, 1.9)
+    assert sizer.backoff_seconds() == 0.0
+    sizer.record(sizer.next_size(), 2.0)
+    assert sizer.backoff_seconds() == 0.0
+
+    sizer.record(sizer.next_size(), 3.5)
+    assert sizer.backoff_seconds() == 2.5
+
+    # A batch back under the threshold clears the delay
+    sizer.record(sizer.next_size(), 0.5)
+    assert sizer.backoff_seconds() == 0.0
+
+
+def test_disabled_sizer_keeps_the_configured_size():
+    sizer = AdaptiveBatchSizer.from_config({'etl': {'batch_size': 25, 'adaptive_batching': False}})
+
+    sizer.record(25, 10.0, failed=25)
+    assert sizer.next_size() == 25
+    assert sizer.backoff_seconds() == 0.0
@@ -0,0 +1,42 @@
+"""
+Chunked, memory-bounded ingestion in KaggleApiClient compared with a whole-file read
+"""
+
+import pandas as pd
+import pytest
+
+from api.kaggle_api import KaggleApiClient
+from benchmarks.fake_kaggle import LocalKaggleApi
+from benchmarks.generator import generate_ohlcv
+from utils.schema import concat_frames
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / "all_stocks_5yr.csv"
+    generate_ohlcv(tickers=4, rows=400, duplicate_fraction=0, missing_fraction=0,
+                   inverted_fraction=0).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def client(config, tmp_path):
+    config['etl'].update(parse_cache=False)
+    return KaggleApiClient(config, api=LocalKaggleApi(tmp_path))
+
+
+def test_chunks_match_a_whole_file_read(client, dataset):
+    whole = client.load_and_clean_data(dataset)
+    chunks = list(client.iter_stock_data(chunk_rows=70, dataset_path=dataset))
+
+    assert len(chunks) > 4
+    chunked = concat_frames(chunks).sort_values(['Ticker', 'Date'], ignore_index=True)
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_carried_close_keeps_returns_across_chunk_boundaries(client, dataset):
+    # Every ticker loses only its first row, which has no previous close
+    chunks = list(client.iter_stock_data(chunk_rows=70, dataset_path=dataset))
+
+    assert sum(len(chunk) for chunk in chunks) == 400 - 4
+    assert not any(chunk['Daily_Return'].isna().any() for chunk in chunks)
@@ -0,0 +1,58 @@
+"""
+HanaConnectionPool checkout, exhaustion and return on error, on the fake hdbcli driver
+"""
+
+import pytest
+
+from benchmarks.fake_hdbcli import FakeDatabase, installed
+from db.hana_client import HanaClient
+
+SCHEMA = "TEST"
+
+
+@pytest.fixture
+def pool():
+    config = {'hana': {'address': 'localhost', 'port': 443, 'user': 'test', 'password': '', 'schema': SCHEMA,
+                       'pool_size': 2}}
+    with installed(FakeDatabase()):
+        client = HanaClient(config)
+        assert client.connect()
+        yield client.create_pool()
+    client.close()
+
+
+def test_exhausted_pool_times_out_until_a_connection_is_returned(pool):
+    first, second = pool.checkout(), pool.checkout()
+    assert first is not second
+    assert pool.size == 2
+
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.05)
+
+    pool.checkin(first)
+    assert pool.checkout(timeout=0.05) is first
+    assert pool.size == 2
+
+
+def test_connection_is_returned_when_the_block_raises(pool):
+    with pytest.raises(ValueError):
+        with pool.connection() as connection:
+            raise ValueError("write failed")
+
+    # Rolled back and back in the pool, not leaked
+    assert pool.size == 1
+    assert pool.checkout(timeout=0.05) is connection
+
+
+def test_connection_is_discarded_when_rollback_fails(pool):
+    def lost():
+        raise ConnectionError("connection lost")
+
+    with pytest.raises(ConnectionError):
+        with pool.connection() as connection:
+            connection.rollback = lost
+            raise ValueError("write failed")
+
+    assert connection.closed
+    assert pool.size == 0
+    assert pool.checkout(timeout=0.05) is not connection
@@ -0,0 +1,127 @@
+"""
+Skipping unchanged Kaggle datasets, run offline against LocalKaggleApi and
+the fake hdbcli driver
+"""
+
+import pytest
+
+from api.kaggle_api import KaggleApiClient
+from benchmarks.fake_hdbcli import FakeDatabase
+from benchmarks.fake_kaggle import LocalKaggleApi
+from benchmarks.generator import generate_ohlcv
+from db.sinks import SQLiteSink
+
+# 20 days per ticker; cleaning drops the first, which has no daily return
+ROWS_PER_TICKER = 19
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / "kaggle"
+    source.mkdir()
+    generate_ohlcv(tickers=3, rows=60, duplicate_fraction=0, missing_fraction=0,
+                   inverted_fraction=0).to_csv(source / "all_stocks_5yr.csv", index=False)
+    return source
+
+
+@pytest.fixture
+def kaggle_api(source_dir):
+    return LocalKaggleApi(source_dir)
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+
+def test_first_run_downloads_and_loads(run_pipeline, config, kaggle_api, database):
+    metrics = run_pipeline(config, kaggle_api, database)
+
+    assert kaggle_api.downloads == 1
+    assert not metrics['skipped']
+    assert metrics['rows_inserted'] == 3 * ROWS_PER_TICKER
+    assert len(database.rows) == 3 * ROWS_PER_TICKER
+
+
+def test_unchanged_dataset_skips_the_run(run_pipeline, config, kaggle_api, database):
+    run_pipeline(config, kaggle_api, database)
+    round_trips = database.round_trips
+
+    metrics = run_pipeline(config, kaggle_api, database)
+
+    assert metrics['skipped']
+    assert kaggle_api.downloads == 1
+    assert metrics['rows_inserted'] == 0
+    # Only the schema and table checks before the run reach the database
+    assert database.round_trips - round_trips <= 2
+
+
+def test_new_version_reloads(run_pipeline, config, kaggle_api, database, source_dir):
+    run_pipeline(config, kaggle_api, database)
+
+    # The new version adds one ticker
+    frame = generate_ohlcv(tickers=4, rows=80, duplicate_fraction=0, missing_fraction=0, inverted_fraction=0)
+    frame.to_csv(source_dir / "all_stocks_5yr.csv", index=False)
+    kaggle_api.publish()
+    metrics = run_pipeline(config, kaggle_api, database)
+
+    assert not metrics['skipped']
+    assert kaggle_api.downloads == 2
+    assert metrics['rows_inserted'] == ROWS_PER_TICKER
+    assert len(database.rows) == 4 * ROWS_PER_TICKER
+
+
+def test_failed_rows_leave_the_version_unloaded(run_pipeline, config, kaggle_api, database):
+    database.reject_row = lambda params: params[0] == 'B'
+    metrics = run_pipeline(config, kaggle_api, database)
+
+    assert metrics['rows_failed'] == ROWS_PER_TICKER
+    assert not KaggleApiClient(config, api=kaggle_api)._load_state().get('loaded')
+
+    # The rerun is not skipped and loads the rows that failed, without downloading again
+    database.reject_row = None
+    metrics = run_pipeline(config, kaggle_api, database)
+
+    assert not metrics['skipped']
+    assert kaggle_api.downloads == 1
+    assert metrics['rows_failed'] == 0
+    assert len(database.rows) == 3 * ROWS_PER_TICKER
+    assert run_pipeline(config, kaggle_api, database)['skipped']
+
+
+def test_other_table_is_not_skipped(run_pipeline, config, kaggle_api):
+    run_pipeline(config, kaggle_api, FakeDatabase())
+
+    # Same unchanged dataset, loaded into another table of a fresh database
+    database = FakeDatabase()
+    metrics = run_pipeline(config, kaggle_api, database, table="STOCK_PRICES_COPY")
+
+    assert not metrics['skipped']
+    assert kaggle_api.downloads == 1
+    assert len(database.rows) == 3 * ROWS_PER_TICKER
+
+
+def test_missing_version_is_reported(config, kaggle_api, caplog):
+    kaggle_api.datasets_view = lambda owner, slug: object()
+    client = KaggleApiClient(config, api=kaggle_api)
+
+    assert client._remote_version() is None
+    assert "No version found for dataset test/sp500" in caplog.text
+    assert not client.is_dataset_loaded("TEST.STOCK_PRICES")
+
+
+def test_local_sink_after_hana_load_is_not_skipped(run_pipeline, config, kaggle_api, database, tmp_path):
+    run_pipeline(config, kaggle_api, database)
+
+    # A dry run into SQLite on the unchanged dataset still writes every row
+    sink = SQLiteSink(tmp_path / 'sqlite')
+    metrics = run_pipeline(config, kaggle_api, sink)
+
+    assert not metrics['skipped']
+    assert metrics['rows_inserted'] == 3 * ROWS_PER_TICKER
+    assert kaggle_api.downloads == 1
+
+    sink.connect()
+    assert sink.table_counts("TEST", "STOCK_PRICES")[0] == 3 * ROWS_PER_TICKER
+    sink.close()
+    assert run_pipeline(config, kaggle_api, sink)['skipped']
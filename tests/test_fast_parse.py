@@ -0,0 +1,45 @@
+"""
+Fast-path CSV parsing in KaggleApiClient compared with the tolerant parser
+"""
+
+import pandas as pd
+import pytest
+
+from api.kaggle_api import KaggleApiClient
+from benchmarks.fake_kaggle import LocalKaggleApi
+from benchmarks.generator import generate_ohlcv
+
+
+@pytest.fixture
+def raw():
+    return generate_ohlcv(tickers=3, rows=300, duplicate_fraction=0.01, missing_fraction=0.01,
+                          inverted_fraction=0.01)
+
+
+def load(config, tmp_path, path, fast_parse):
+    config['etl'].update(parse_cache=False, fast_parse=fast_parse)
+    client = KaggleApiClient(config, api=LocalKaggleApi(tmp_path))
+    return client.load_and_clean_data(str(path)), client.parse_report
+
+
+def test_fast_path_matches_the_tolerant_parser(config, tmp_path, raw):
+    path = tmp_path / "all_stocks_5yr.csv"
+    raw.to_csv(path, index=False)
+
+    fast, report = load(config, tmp_path, path, fast_parse=True)
+    tolerant, _ = load(config, tmp_path, path, fast_parse=False)
+
+    assert report['path'] == 'fast'
+    pd.testing.assert_frame_equal(fast, tolerant)
+
+
+def test_value_outside_the_schema_falls_back_to_the_tolerant_parser(config, tmp_path, raw):
+    path = tmp_path / "all_stocks_5yr.csv"
+    raw = raw.astype({'date': object})
+    raw.loc[5, 'date'] = '02/15/2013'
+    raw.to_csv(path, index=False)
+
+    df, report = load(config, tmp_path, path, fast_parse=True)
+
+    assert report['path'] == 'tolerant'
+    assert len(df) > 0
@@ -0,0 +1,82 @@
+"""
+HanaClient.insert_data transactions and failed-row recovery, run against the fake hdbcli driver
+"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_hdbcli import FakeConnection, FakeCursor, FakeDatabase, installed
+from db.hana_client import HanaClient
+
+SCHEMA = "TEST"
+TABLE = "STOCK_PRICES"
+
+
+def stock_frame(ticker, dates, close=10.0):
+    return pd.DataFrame({
+        'Ticker': ticker,
+        'Date': pd.to_datetime(dates),
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': 1000.0,
+        'Daily_Range': 2.0,
+        'Daily_Return': 0.0,
+    })
+
+
+def connect(database):
+    config = {'hana': {'address': 'localhost', 'port': 443, 'user': 'test', 'password': '', 'schema': SCHEMA},
+              'etl': {'retry_base_delay': 0.0}}
+    with installed(database):
+        client = HanaClient(config)
+        assert client.connect()
+    assert client.create_schema_if_not_exists(SCHEMA)
+    assert client.create_table(SCHEMA, TABLE)
+    return client
+
+
+@pytest.fixture
+def commits(monkeypatch):
+    """Count the commits of every fake connection"""
+    counted = []
+    commit = FakeConnection.commit
+    monkeypatch.setattr(FakeConnection, 'commit', lambda self: (counted.append(1), commit(self)))
+    return counted
+
+
+def test_inserts_and_updates_commit_once(commits):
+    database = FakeDatabase()
+    client = connect(database)
+    client.insert_data(stock_frame('AAA', ['2020-01-02']), SCHEMA, TABLE)
+
+    commits.clear()
+    frame = stock_frame('AAA', ['2020-01-02', '2020-01-03', '2020-01-06'], close=11.0)
+    assert client.insert_data(frame, SCHEMA, TABLE) == 3
+
+    assert len(commits) == 1
+    assert len(database.rows) == 3
+    client.close()
+
+
+def test_bad_row_is_bisected_out(monkeypatch):
+    bad = pd.Timestamp('2020-01-07').date()
+    database = FakeDatabase(reject_row=lambda params: params[1] == bad)
+    client = connect(database)
+    client.insert_data(stock_frame('AAA', ['2020-01-02']), SCHEMA, TABLE)
+
+    executed = []
+    execute = FakeCursor.execute
+    monkeypatch.setattr(FakeCursor, 'execute', lambda self, sql, params=None: (
+        executed.append(sql), execute(self, sql, params)))
+
+    frame = stock_frame('AAA', pd.bdate_range('2020-01-02', periods=8), close=11.0)
+    assert client.insert_data(frame, SCHEMA, TABLE) == 7
+
+    assert sorted(date for _, date in database.rows) == [
+        date.date() for date in pd.bdate_range('2020-01-02', periods=8) if date.date() != bad
+    ]
+    # Rows are written in bulk sub-batches, never one statement per row
+    assert not [sql for sql in executed if 'INSERT' in sql or 'UPDATE' in sql]
+    client.close()
@@ -0,0 +1,84 @@
+"""
+Per-ticker summary table of HanaClient, run against the fake hdbcli driver
+"""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_hdbcli import FakeDatabase, installed
+from db.hana_client import HanaClient, stats_table_name
+
+SCHEMA = "TEST"
+TABLE = "STOCK_PRICES"
+
+
+def stock_frame(ticker, dates, close=10.0):
+    dates = pd.to_datetime(dates)
+    return pd.DataFrame({
+        'Ticker': ticker,
+        'Date': dates,
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': 1000.0,
+        'Daily_Range': 2.0,
+        'Daily_Return': 0.0,
+    })
+
+
+@pytest.fixture
+def client():
+    database = FakeDatabase()
+    config = {'hana': {'address': 'localhost', 'port': 443, 'user': 'test', 'password': '',
+                       'schema': SCHEMA, 'stats_table': True}}
+    with installed(database):
+        client = HanaClient(config)
+        assert client.connect()
+        assert client.create_schema_if_not_exists(SCHEMA)
+        yield client
+        client.close()
+
+
+def test_create_table_creates_stats_table(client):
+    assert client.create_table(SCHEMA, TABLE)
+
+    database = client.connection.database
+    assert (SCHEMA, stats_table_name(TABLE)) in database.tables
+    assert database.ticker_stats == {}
+
+    # A second run finds both tables and leaves them alone
+    assert client.create_table(SCHEMA, TABLE)
+
+
+def test_insert_data_refreshes_summary_rows(client):
+    assert client.create_table(SCHEMA, TABLE)
+
+    first = pd.concat([stock_frame('AAA', ['2020-01-02', '2020-01-03']), stock_frame('BBB', ['2020-01-02'])])
+    assert client.insert_data(first, SCHEMA, TABLE) == 3
+
+    # Updates one AAA row and adds a later one; BBB is not touched
+    second = stock_frame('AAA', ['2020-01-03', '2020-01-06'], close=11.0)
+    assert client.insert_data(second, SCHEMA, TABLE) == 2
+
+    assert client.connection.database.ticker_stats == {
+        'AAA': (3, datetime.date(2020, 1, 2), datetime.date(2020, 1, 6)),
+        'BBB': (1, datetime.date(2020, 1, 2), datetime.date(2020, 1, 2)),
+    }
+    assert client.get_table_stats(SCHEMA, TABLE) == {
+        'total_rows': 4, 'unique_tickers': 2, 'min_date': '2020-01-02', 'max_date': '2020-01-06'
+    }
+
+
+def test_create_stats_table_summarizes_loaded_rows(client):
+    client.stats_table = False
+    assert client.create_table(SCHEMA, TABLE)
+    client.insert_data(stock_frame('AAA', ['2020-01-02', '2020-01-03']), SCHEMA, TABLE)
+
+    client.stats_table = True
+    assert client.create_stats_table(SCHEMA, TABLE)
+    assert client.connection.database.ticker_stats == {
+        'AAA': (2, datetime.date(2020, 1, 2), datetime.date(2020, 1, 3)),
+    }
@@ -0,0 +1,47 @@
+"""
+Quarantine of rows removed by validation across runs over the same source
+"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_hdbcli import FakeDatabase
+from benchmarks.fake_kaggle import LocalKaggleApi
+from benchmarks.generator import generate_ohlcv
+from etl.quarantine import read_quarantine
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    source = tmp_path / "kaggle"
+    source.mkdir()
+    return source / "all_stocks_5yr.csv"
+
+
+@pytest.fixture
+def config(config):
+    # Every scheduled run re-reads the file
+    config['etl'].update(batch_size=100, skip_unchanged_dataset=False, parse_cache=False)
+    return config
+
+
+def test_rerun_does_not_quarantine_the_same_rows_again(run_pipeline, config, source_file):
+    frame = generate_ohlcv(tickers=3, rows=300, duplicate_fraction=0.02, missing_fraction=0,
+                           inverted_fraction=0.02)
+    frame.to_csv(source_file, index=False)
+    kaggle_api, database = LocalKaggleApi(source_file.parent), FakeDatabase()
+
+    first = run_pipeline(config, kaggle_api, database)['quarantine']
+    assert first['rows'] > 0
+    assert set(first['reasons']) == {'DUPLICATE', 'HIGH_BELOW_LOW'}
+
+    assert run_pipeline(config, kaggle_api, database)['quarantine'] == {}
+
+    # A new day with a repeated row: only that row is quarantined
+    last = frame.groupby('Name').tail(1).copy()
+    last['date'] = (pd.to_datetime(last['date']) + pd.offsets.BDay(1)).dt.strftime('%Y-%m-%d')
+    pd.concat([frame, last, last.iloc[:1]]).to_csv(source_file, index=False)
+
+    third = run_pipeline(config, kaggle_api, database)['quarantine']
+    assert third['reasons'] == {'DUPLICATE': 1}
+    assert len(read_quarantine(third['path'])) == 1
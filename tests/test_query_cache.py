@@ -0,0 +1,85 @@
+"""
+QueryCache hits and invalidation after writes, on the fake hdbcli driver
+"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_hdbcli import FakeDatabase, installed
+from db.hana_client import HanaClient, QueryCache
+from etl.pipeline import ETLPipeline
+
+SCHEMA = "TEST"
+TABLE = "STOCK_PRICES"
+
+
+def stock_frame(ticker, dates, close=10.0):
+    return pd.DataFrame({
+        'Ticker': ticker,
+        'Date': pd.to_datetime(dates),
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': 1000.0,
+        'Daily_Range': 2.0,
+        'Daily_Return': 0.0,
+    })
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def client(database):
+    config = {'hana': {'address': 'localhost', 'port': 443, 'user': 'test', 'password': '', 'schema': SCHEMA}}
+    with installed(database):
+        client = HanaClient(config)
+        assert client.connect()
+    assert client.create_schema_if_not_exists(SCHEMA)
+    assert client.create_table(SCHEMA, TABLE)
+    client.insert_data(stock_frame('AAA', ['2020-01-02', '2020-01-03']), SCHEMA, TABLE)
+    yield client
+    client.close()
+
+
+def test_repeated_read_is_served_from_the_cache(client, database):
+    stats = client.get_table_stats(SCHEMA, TABLE)
+    round_trips = database.round_trips
+
+    assert client.get_table_stats(SCHEMA, TABLE) == stats
+    assert database.round_trips == round_trips
+    assert client.query_cache.stats()['hits'] == 1
+
+
+def test_insert_data_invalidates_cached_reads(client):
+    assert client.get_table_stats(SCHEMA, TABLE)['total_rows'] == 2
+
+    client.insert_data(stock_frame('BBB', ['2020-01-06']), SCHEMA, TABLE)
+
+    assert client.get_table_stats(SCHEMA, TABLE) == {
+        'total_rows': 3, 'unique_tickers': 2, 'min_date': '2020-01-02', 'max_date': '2020-01-06'
+    }
+
+
+def test_pipeline_batch_write_invalidates_cached_reads(client):
+    pipeline = ETLPipeline(None, client, {'etl': {'state_store': False}})
+    assert client.get_table_stats(SCHEMA, TABLE)['total_rows'] == 2
+
+    assert pipeline.insert_data_batch(stock_frame('AAA', ['2020-01-03', '2020-01-06']), SCHEMA, TABLE) == (1, 1, 0)
+
+    assert client.get_table_stats(SCHEMA, TABLE)['total_rows'] == 3
+
+
+def test_result_loaded_across_an_invalidation_is_not_stored():
+    cache = QueryCache()
+    target = QueryCache.target(SCHEMA, TABLE)
+
+    def load_while_written():
+        cache.invalidate(target)
+        return {'total_rows': 2}
+
+    assert cache.get_or_load(target, "SELECT COUNT(*)", (), load_while_written) == {'total_rows': 2}
+    assert cache.get_or_load(target, "SELECT COUNT(*)", (), lambda: {'total_rows': 3}) == {'total_rows': 3}
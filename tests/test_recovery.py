@@ -0,0 +1,79 @@
+"""
+BatchRecovery retries and bisection, writing through HanaSink to the fake hdbcli driver
+"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_hdbcli import FakeDatabase, installed
+from db.hana_client import HanaClient
+from db.sinks import HanaSink
+from etl.recovery import BatchRecovery
+
+SCHEMA = "TEST"
+TABLE = "STOCK_PRICES"
+
+
+def stock_frame(ticker, dates, close=10.0):
+    return pd.DataFrame({
+        'Ticker': ticker,
+        'Date': pd.to_datetime(dates),
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': 1000.0,
+        'Daily_Range': 2.0,
+        'Daily_Return': 0.0,
+    })
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def sink(database):
+    config = {'hana': {'address': 'localhost', 'port': 443, 'user': 'test', 'password': '', 'schema': SCHEMA}}
+    with installed(database):
+        sink = HanaSink(HanaClient(config))
+        assert sink.connect()
+    assert sink.create_schema_if_not_exists(SCHEMA)
+    assert sink.create_table(SCHEMA, TABLE)
+    yield sink
+    sink.close()
+
+
+def test_bisection_isolates_a_single_bad_row(sink, database):
+    dates = pd.bdate_range('2020-01-01', periods=64)
+    bad = dates[37].date()
+    database.reject_row = lambda params: params[1] == bad
+
+    frame = stock_frame('AAA', dates)
+    outcome = BatchRecovery(sleep=lambda seconds: None).write(
+        frame, lambda part: sink.upsert(part, SCHEMA, TABLE)
+    )
+
+    assert [position for position, _ in outcome.rejected] == [37]
+    assert (outcome.inserted, outcome.updated) == (63, 0)
+    assert len(database.rows) == 63
+    # One failed bulk write per halving on the path to the bad row, plus its sibling
+    assert outcome.attempts <= 2 * math.log2(len(frame)) + 1
+
+
+def test_transient_error_is_retried_without_bisecting(sink, database):
+    database.transient_failures = 2
+    delays = []
+
+    frame = stock_frame('AAA', pd.bdate_range('2020-01-01', periods=8))
+    outcome = BatchRecovery(max_retries=3, sleep=delays.append).write(
+        frame, lambda part: sink.upsert(part, SCHEMA, TABLE)
+    )
+
+    assert outcome.failed == 0
+    assert (outcome.attempts, outcome.retries) == (3, 2)
+    assert len(delays) == 2
+    assert len(database.rows) == 8
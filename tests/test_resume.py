@@ -0,0 +1,93 @@
+"""
+Resuming an interrupted run from its checkpoints and stored frame, run
+offline against LocalKaggleApi and the fake hdbcli driver
+"""
+
+import pytest
+
+from api.kaggle_api import KaggleApiClient
+from benchmarks.fake_hdbcli import FakeDatabase
+from benchmarks.fake_kaggle import LocalKaggleApi
+from benchmarks.generator import generate_ohlcv
+from etl.pipeline import DataQualityValidator, ETLPipeline
+from etl.state import RUN_FRAMES_DIR
+
+# 20 days per ticker; cleaning drops the first, which has no daily return
+ROWS_PER_TICKER = 19
+
+
+@pytest.fixture
+def kaggle_api(tmp_path):
+    source = tmp_path / "kaggle"
+    source.mkdir()
+    generate_ohlcv(tickers=3, rows=60, duplicate_fraction=0, missing_fraction=0,
+                   inverted_fraction=0).to_csv(source / "all_stocks_5yr.csv", index=False)
+    return LocalKaggleApi(source)
+
+
+@pytest.fixture
+def config(config):
+    config['etl'].update(batch_size=10, adaptive_batching=False, parse_cache=False)
+    return config
+
+
+@pytest.fixture
+def extract_calls(monkeypatch):
+    """Count the fetches and validations of the Kaggle frame"""
+    calls = {'fetch': 0, 'validate': 0}
+    fetch, validate = KaggleApiClient.fetch_stock_data, DataQualityValidator.validate_and_clean
+
+    def counted_fetch(self, *args, **kwargs):
+        calls['fetch'] += 1
+        return fetch(self, *args, **kwargs)
+
+    def counted_validate(self, *args, **kwargs):
+        calls['validate'] += 1
+        return validate(self, *args, **kwargs)
+
+    monkeypatch.setattr(KaggleApiClient, 'fetch_stock_data', counted_fetch)
+    monkeypatch.setattr(DataQualityValidator, 'validate_and_clean', counted_validate)
+    return calls
+
+
+def test_resume_after_failed_batch_skips_extract(run_pipeline, config, kaggle_api, extract_calls, monkeypatch,
+                                                 tmp_path):
+    database = FakeDatabase()
+    write = ETLPipeline._write_timed_batch
+
+    def failing_write(self, batch_num, *args, **kwargs):
+        if batch_num == 3:
+            raise ConnectionError("connection lost")
+        return write(self, batch_num, *args, **kwargs)
+
+    monkeypatch.setattr(ETLPipeline, '_write_timed_batch', failing_write)
+    with pytest.raises(ConnectionError):
+        run_pipeline(config, kaggle_api, database)
+    assert len(database.rows) == 20
+    monkeypatch.setattr(ETLPipeline, '_write_timed_batch', write)
+
+    extract_calls.update(fetch=0, validate=0)
+    metrics = run_pipeline(config, kaggle_api, database)
+
+    assert extract_calls == {'fetch': 0, 'validate': 0}
+    assert metrics['run']['rows_resumed'] == 20
+    assert metrics['rows_failed'] == 0
+    assert metrics['rows_inserted'] == 3 * ROWS_PER_TICKER
+    assert len(database.rows) == 3 * ROWS_PER_TICKER
+    assert not any((tmp_path / 'data' / RUN_FRAMES_DIR).iterdir())
+
+
+def test_resume_after_rejected_rows_loads_only_them(run_pipeline, config, kaggle_api, extract_calls):
+    database = FakeDatabase(reject_row=lambda params: params[0] == 'B')
+    assert run_pipeline(config, kaggle_api, database)['rows_failed'] == ROWS_PER_TICKER
+
+    database.reject_row = None
+    database.round_trips = 0
+    extract_calls.update(fetch=0, validate=0)
+    metrics = run_pipeline(config, kaggle_api, database)
+
+    assert extract_calls == {'fetch': 0, 'validate': 0}
+    assert metrics['run']['rows_resumed'] == 2 * ROWS_PER_TICKER
+    assert metrics['rows_failed'] == 0
+    assert len(database.rows) == 3 * ROWS_PER_TICKER
+
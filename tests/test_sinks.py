@@ -0,0 +1,86 @@
+"""
+Local load sinks of db.sinks
+"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.fake_hdbcli import FakeCursor, FakeDatabase, installed
+from db import sinks
+from db.hana_client import HanaClient
+from db.sinks import HanaSink, ParquetSink, Sink, SQLiteSink
+
+SCHEMA = "TEST"
+TABLE = "STOCK_PRICES"
+
+
+def stock_frame(ticker, dates, close=10.0):
+    return pd.DataFrame({
+        'Ticker': ticker,
+        'Date': pd.to_datetime(dates),
+        'Open': close,
+        'High': close + 1,
+        'Low': close - 1,
+        'Close': close,
+        'Volume': 1000.0,
+        'Daily_Range': 2.0,
+        'Daily_Return': 0.0,
+    })
+
+
+def test_incomplete_sink_fails_when_created():
+    class WriteOnlySink(Sink):
+        def upsert(self, df, schema_name, table_name, connection=None):
+            return len(df), 0
+
+    with pytest.raises(TypeError, match="abstract"):
+        WriteOnlySink()
+
+
+def test_sqlite_upsert_counts_inserts_and_updates(tmp_path):
+    sink = SQLiteSink(tmp_path)
+    assert sink.connect()
+    assert sink.create_schema_if_not_exists(SCHEMA)
+    assert sink.create_table(SCHEMA, TABLE)
+
+    assert sink.upsert(stock_frame('AAA', ['2020-01-02', '2020-01-03']), SCHEMA, TABLE) == (2, 0)
+    assert sink.upsert(stock_frame('AAA', ['2020-01-03', '2020-01-06'], close=11.0), SCHEMA, TABLE) == (1, 1)
+
+    assert sink.table_counts(SCHEMA, TABLE)[0] == 3
+    assert sink.get_ticker_watermarks(SCHEMA, TABLE) == {'AAA': pd.Timestamp('2020-01-06').date()}
+    sink.close()
+
+
+@pytest.mark.parametrize('driver_counts', [True, False])
+def test_hana_upsert_counts_repeated_keys_once(monkeypatch, driver_counts):
+    if not driver_counts:
+        executemany = FakeCursor.executemany
+        monkeypatch.setattr(FakeCursor, 'executemany', lambda self, sql, rows: executemany(self, sql, rows) and None)
+
+    database = FakeDatabase()
+    config = {'hana': {'address': 'localhost', 'port': 443, 'user': 'test', 'password': '', 'schema': SCHEMA}}
+    with installed(database):
+        sink = HanaSink(HanaClient(config))
+        assert sink.connect()
+    assert sink.create_schema_if_not_exists(SCHEMA)
+    assert sink.create_table(SCHEMA, TABLE)
+    assert sink.upsert(stock_frame('AAA', ['2020-01-02']), SCHEMA, TABLE) == (1, 0)
+
+    # 2020-01-03 is repeated; its last row wins and it is counted as one insert
+    frame = pd.concat([
+        stock_frame('AAA', ['2020-01-02', '2020-01-03'], close=11.0),
+        stock_frame('AAA', ['2020-01-03'], close=12.0),
+    ])
+    assert sink.upsert(frame, SCHEMA, TABLE) == (1, 1)
+
+    assert len(database.rows) == 2
+    assert database.rows[('AAA', pd.Timestamp('2020-01-03').date())][5] == 12.0
+    sink.close()
+
+
+def test_parquet_sink_requires_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(sinks, 'PYARROW_AVAILABLE', False)
+
+    with pytest.raises(ImportError, match="pyarrow"):
+        ParquetSink(tmp_path).connect()
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,63 @@
+"""
+Streaming execution compared with batch execution on the same source
+"""
+
+import pytest
+
+from benchmarks.fake_kaggle import LocalKaggleApi
+from benchmarks.generator import generate_ohlcv
+from db.sinks import SQLiteSink
+from etl.profiling import StageProfiler
+
+SCHEMA = "TEST"
+TABLE = "STOCK_PRICES"
+
+
+@pytest.fixture
+def kaggle_api(tmp_path):
+    source = tmp_path / "kaggle"
+    source.mkdir()
+    frame = generate_ohlcv(tickers=5, rows=2000, duplicate_fraction=0.02, missing_fraction=0.01,
+                           inverted_fraction=0.01, seed=7)
+    # Repeat the rows at several chunk boundaries of 300 rows
+    frame = frame.iloc[sorted(list(range(len(frame))) + [299, 599, 899, 1199])].reset_index(drop=True)
+    frame.to_csv(source / "all_stocks_5yr.csv", index=False)
+    return LocalKaggleApi(source)
+
+
+@pytest.fixture
+def config(config):
+    config['etl'].update(batch_size=100, chunk_rows=300, parse_cache=False, skip_unchanged_dataset=False)
+    return config
+
+
+def table_rows(sink):
+    sink.connect()
+    try:
+        return sink._fetch(f'SELECT "TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME", '
+                           f'"DAILY_RANGE", "DAILY_RETURN" FROM "{SCHEMA}"."{TABLE}" ORDER BY 1, 2')
+    finally:
+        sink.close()
+
+
+def test_streaming_loads_the_same_rows_as_batch(run_pipeline, config, kaggle_api, tmp_path):
+    batch_sink, streaming_sink = SQLiteSink(tmp_path / "batch"), SQLiteSink(tmp_path / "streaming")
+    batch = run_pipeline(config, kaggle_api, batch_sink, mode='batch')
+    streaming = run_pipeline(config, kaggle_api, streaming_sink, mode='streaming')
+
+    assert len(streaming['stages']) >= 3
+    for key in ('rows_fetched', 'rows_validated', 'rows_inserted', 'rows_updated', 'rows_failed'):
+        assert streaming[key] == batch[key], key
+    assert streaming['quarantine']['reasons'] == batch['quarantine']['reasons']
+    assert table_rows(streaming_sink) == table_rows(batch_sink)
+
+
+def test_streaming_profiles_every_chunk_extract(run_pipeline, config, kaggle_api, tmp_path):
+    profiler = StageProfiler(tmp_path / "profile")
+    metrics = run_pipeline(config, kaggle_api, SQLiteSink(tmp_path / "sqlite"), mode='streaming', profiler=profiler)
+    summary = profiler.write()
+
+    extract = summary['extract']
+    # One call per chunk read, plus the call that finds the stream exhausted
+    assert extract['calls'] + extract['skipped_calls'] == metrics['stages']['extract']['items'] + 1
+    assert {'validate', 'load'} <= set(summary)
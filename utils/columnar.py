@@ -0,0 +1,138 @@
+"""
+Columnar file helpers for caching and spilling DataFrames
+Uses Parquet when pyarrow is installed and one .npy file per column otherwise;
+the fallback serves the internal quarantine and parse cache files, while
+db.sinks.ParquetSink requires pyarrow
+"""
+
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PARQUET_SUFFIX = ".parquet"
+NPY_SUFFIX = ".npy.d"
+
+_fallback_reported = False
+
+
+def write_frame(path, df):
+    """
+    Write a DataFrame to a typed columnar file.
+
+    Args:
+        path (str): Destination path without suffix
+        df (DataFrame): Frame to write
+
+    Returns:
+        Path: The file or directory that was written
+    """
+    if PYARROW_AVAILABLE:
+        target = Path(str(path) + PARQUET_SUFFIX)
+        df.to_parquet(target, index=False)
+        return target
+
+    global _fallback_reported
+    if not _fallback_reported:
+        logger.warning("pyarrow not installed - writing columnar files as .npy columns instead of Parquet")
+        _fallback_reported = True
+
+    target = Path(str(path) + NPY_SUFFIX)
+    target.mkdir(parents=True, exist_ok=True)
+    columns = []
+
+    for index, name in enumerate(df.columns):
+        series = df[name]
+        entry = {'name': name, 'file': f"c{index}"}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry['kind'] = 'category'
+            np.save(target / f"c{index}.codes.npy", series.cat.codes.to_numpy())
+            np.save(target / f"c{index}.categories.npy", series.cat.categories.to_numpy().astype(str))
+        elif series.dtype == object:
+            entry['kind'] = 'string'
+            mask = series.isna().to_numpy()
+            np.save(target / f"c{index}.npy", series.fillna('').to_numpy().astype(str))
+            if mask.any():
+                np.save(target / f"c{index}.mask.npy", mask)
+        else:
+            entry['kind'] = 'array'
+            np.save(target / f"c{index}.npy", series.to_numpy())
+
+        columns.append(entry)
+
+    with open(target / "columns.json", "w") as f:
+        json.dump({'rows': len(df), 'columns': columns}, f)
+
+    return target
+
+
+def read_frame(path):
+    """
+    Read a file written by write_frame.
+
+    Args:
+        path (Path): File or directory returned by write_frame
+
+    Returns:
+        DataFrame: The stored frame with its column dtypes
+    """
+    path = Path(path)
+
+    if path.name.endswith(PARQUET_SUFFIX):
+        return pd.read_parquet(path)
+
+    with open(path / "columns.json") as f:
+        meta = json.load(f)
+
+    data = {}
+    for entry in meta['columns']:
+        base = path / entry['file']
+        if entry['kind'] == 'category':
+            codes = np.load(str(base) + ".codes.npy", mmap_mode='r')
+            categories = np.load(str(base) + ".categories.npy")
+            data[entry['name']] = pd.Categorical.from_codes(np.asarray(codes), categories=categories)
+        elif entry['kind'] == 'string':
+            values = np.load(str(base) + ".npy").astype(object)
+            mask_path = Path(str(base) + ".mask.npy")
+            if mask_path.exists():
+                values[np.load(mask_path)] = None
+            data[entry['name']] = values
+        else:
+            data[entry['name']] = np.load(str(base) + ".npy", mmap_mode='r')
+
+    return pd.DataFrame(data, columns=[entry['name'] for entry in meta['columns']])
+
+
+def is_columnar_file(path):
+    """Return True if path was written by write_frame."""
+    name = Path(path).name
+    return name.endswith(PARQUET_SUFFIX) or name.endswith(NPY_SUFFIX)
+
+
+def remove_frame(path):
+    """Delete a file or directory written by write_frame."""
+    path = Path(path)
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    elif path.exists():
+        path.unlink()
+
+
+def frame_size_bytes(path):
+    """Return the on-disk size of a file or directory written by write_frame."""
+    path = Path(path)
+    if path.is_dir():
+        return sum(child.stat().st_size for child in path.rglob('*') if child.is_file())
+    return path.stat().st_size if path.exists() else 0
@@ -70,7 +70,11 @@ def load_config():
             'user': os.getenv('HANA_USER'),
             'password': os.getenv('HANA_PASSWORD'),
             'schema': os.getenv('HANA_SCHEMA', 'SP500_DATA'),
-            'table': os.getenv('HANA_TABLE', 'STOCK_PRICES')
+            'table': os.getenv('HANA_TABLE', 'STOCK_PRICES'),
+            'pool_size': int(os.getenv('HANA_POOL_SIZE', '4')),
+            'query_cache_ttl': float(os.getenv('HANA_QUERY_CACHE_TTL', '300')),
+            'query_cache_mb': float(os.getenv('HANA_QUERY_CACHE_MB', '64')),
+            'stats_table': os.getenv('HANA_STATS_TABLE', 'false').lower() == 'true'
         },
 
         # File paths
@@ -82,8 +86,33 @@ def load_config():
         # ETL Pipeline settings
         'etl': {
             'batch_size': int(os.getenv('ETL_BATCH_SIZE', '1000')),
+            'adaptive_batching': os.getenv('ETL_ADAPTIVE_BATCHING', 'true').lower() == 'true',
+            'batch_min_size': int(os.getenv('ETL_BATCH_MIN_SIZE', '100')),
+            'batch_max_size': int(os.getenv('ETL_BATCH_MAX_SIZE', '20000')),
+            'batch_target_seconds': float(os.getenv('ETL_BATCH_TARGET_SECONDS', '1.0')),
             'incremental': os.getenv('ETL_INCREMENTAL', 'true').lower() == 'true',
-            'enable_validation': os.getenv('ETL_ENABLE_VALIDATION', 'true').lower() == 'true'
+            'skip_unchanged_dataset': os.getenv('ETL_SKIP_UNCHANGED_DATASET', 'true').lower() == 'true',
+            'enable_validation': os.getenv('ETL_ENABLE_VALIDATION', 'true').lower() == 'true',
+            'load_mode': os.getenv('ETL_LOAD_MODE', 'merge').lower(),
+            'workers': int(os.getenv('ETL_WORKERS', '1')),
+            'execution_mode': os.getenv('ETL_EXECUTION_MODE', 'batch').lower(),
+            'chunk_rows': int(os.getenv('ETL_CHUNK_ROWS', '100000')),
+            'memory_budget_mb': float(os.getenv('ETL_MEMORY_BUDGET_MB', '0')),
+            'state_store': os.getenv('ETL_STATE_STORE', 'true').lower() == 'true',
+            'fast_parse': os.getenv('ETL_FAST_PARSE', 'true').lower() == 'true',
+            'parse_cache': os.getenv('ETL_PARSE_CACHE', 'true').lower() == 'true',
+            'parse_cache_max_mb': int(os.getenv('ETL_PARSE_CACHE_MAX_MB', '1024')),
+            'queue_size': int(os.getenv('ETL_QUEUE_SIZE', '4')),
+            'async_concurrency': int(os.getenv('ETL_ASYNC_CONCURRENCY', '4')),
+            'max_retries': int(os.getenv('ETL_MAX_RETRIES', '3')),
+            'retry_base_delay': float(os.getenv('ETL_RETRY_BASE_DELAY', '0.5')),
+            'retry_max_delay': float(os.getenv('ETL_RETRY_MAX_DELAY', '10')),
+            'quarantine': os.getenv('ETL_QUARANTINE', 'true').lower() == 'true',
+            'bisect_failed_batches': os.getenv('ETL_BISECT_FAILED_BATCHES', 'true').lower() == 'true',
+            'trace_memory': os.getenv('ETL_TRACE_MEMORY', 'false').lower() == 'true',
+            'prometheus_textfile': os.getenv('ETL_PROMETHEUS_TEXTFILE', ''),
+            'sink': os.getenv('ETL_SINK', 'hana').lower(),
+            'sink_dir': os.getenv('ETL_SINK_DIR', '')
         }
     }
 
@@ -0,0 +1,86 @@
+"""
+Compact in-memory schema for the stock DataFrame
+"""
+
+import numpy as np
+import pandas as pd
+
+# Declared dtypes of a cleaned stock frame. Prices stay float64 because the
+# HANA columns are DECIMAL(18,6) and float32 would lose digits; the savings
+# come from the categorical ticker and the narrow volume integer.
+STOCK_DTYPES = {
+    'Ticker': 'category',
+    'Date': 'datetime64[ns]',
+    'Open': 'float64',
+    'High': 'float64',
+    'Low': 'float64',
+    'Close': 'float64',
+    'Volume': 'uint32',
+    'Daily_Range': 'float64',
+    'Daily_Return': 'float64'
+}
+
+
+def _compact_volume(volume):
+    """Store Volume as uint32 when it is complete and fits, int64 or float64 otherwise."""
+    values = volume.to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(values).any() or not np.array_equal(values, np.floor(values)):
+        return volume.astype(np.float64)
+    if len(values) and (values.min() < 0 or values.max() > np.iinfo(np.uint32).max):
+        return volume.astype(np.int64)
+    return volume.astype(np.uint32)
+
+
+def apply_compact_dtypes(df):
+    """
+    Convert a cleaned stock frame to the declared compact dtypes.
+
+    Args:
+        df (DataFrame): Cleaned stock frame
+
+    Returns:
+        tuple: (compact DataFrame, bytes before, bytes after)
+    """
+    before = int(df.memory_usage(deep=True, index=False).sum())
+
+    for col, dtype in STOCK_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if col == 'Volume':
+            df[col] = _compact_volume(df[col])
+        elif col == 'Ticker':
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(str).astype('category')
+        elif df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+
+    after = int(df.memory_usage(deep=True, index=False).sum())
+    return df, before, after
+
+
+def concat_frames(frames):
+    """
+    Concatenate stock frames without losing the categorical ticker.
+
+    pd.concat turns categoricals with different categories into object
+    columns, so the chunks are first recoded onto the sorted union of their
+    categories.
+
+    Args:
+        frames (list): DataFrames with the same columns
+
+    Returns:
+        DataFrame: Concatenated frame with a fresh RangeIndex
+    """
+    categorical = [
+        col for col in frames[0].columns
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype)
+    ]
+
+    for col in categorical:
+        categories = sorted(set().union(*(frame[col].cat.categories for frame in frames)))
+        for frame in frames:
+            if list(frame[col].cat.categories) != categories:
+                frame[col] = frame[col].cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
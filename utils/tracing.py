@@ -0,0 +1,206 @@
+"""
+Lightweight tracing spans written in the Chrome trace event format
+The JSON output opens in Perfetto (ui.perfetto.dev) or chrome://tracing
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Active tracer; None while tracing is off, which every span checks first
+_tracer = None
+
+
+class Tracer:
+    """
+    Collect complete ("X") trace events from any thread.
+
+    Timestamps are microseconds since the tracer started. Each event carries
+    the OS thread id, and every thread that records a span is named in a
+    metadata event, so pooled writers and executor threads show up as their
+    own tracks.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.events = []
+        self._threads = {}
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def now(self):
+        """Microseconds since the tracer started"""
+        return (time.perf_counter_ns() - self._origin) / 1000.0
+
+    def add(self, name, category, start, end, args=None):
+        """
+        Record a finished span.
+
+        Args:
+            name (str): Span name
+            category (str): Category shown and filterable in the viewer
+            start (float): Start in microseconds, from now()
+            end (float): End in microseconds, from now()
+            args (dict, optional): Values shown with the span
+        """
+        thread = threading.current_thread()
+        tid = threading.get_native_id()
+        event = {
+            'name': name, 'cat': category, 'ph': 'X',
+            'ts': round(start, 3), 'dur': round(end - start, 3),
+            'pid': self.pid, 'tid': tid
+        }
+        if args:
+            event['args'] = {key: value if isinstance(value, (int, float, bool)) else str(value)
+                             for key, value in args.items()}
+
+        with self._lock:
+            self.events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = thread.name
+
+    def to_dict(self):
+        """Trace events plus process and thread name metadata"""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+                     'args': {'name': 'etl'}}]
+        metadata.extend(
+            {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+            for tid, name in threads.items()
+        )
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        """
+        Write the trace as Chrome trace JSON.
+
+        Args:
+            path (str): Destination file
+
+        Returns:
+            Path: The file that was written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+
+class _Span:
+    """Context manager recording one span on the active tracer"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.tracer.now()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.add(self.name, self.category, self.start, self.tracer.now(), self.args)
+        return False
+
+
+class _NullSpan:
+    """Shared no-op span used while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def start_tracing():
+    """
+    Start collecting spans, replacing any active tracer.
+
+    Returns:
+        Tracer: The active tracer
+    """
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing(path=None):
+    """
+    Stop collecting spans and optionally write them.
+
+    Args:
+        path (str, optional): File receiving the Chrome trace JSON
+
+    Returns:
+        Tracer: The tracer that was active, or None
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and path:
+        tracer.write(path)
+    return tracer
+
+
+def is_tracing():
+    """Whether spans are currently recorded"""
+    return _tracer is not None
+
+
+def span(name, category='etl', **args):
+    """
+    Trace a block as one span.
+
+    Args:
+        name (str): Span name
+        category (str): Span category
+        **args: Values shown with the span, e.g. rows or batch numbers
+
+    Returns:
+        A context manager; a shared no-op one while tracing is off
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def traced(name=None, category='etl'):
+    """
+    Decorator tracing every call of a function as a span.
+
+    Args:
+        name (str, optional): Span name (default: the function's qualified name)
+        category (str): Span category
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with _Span(tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator